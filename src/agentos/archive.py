@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import shutil
+from contextlib import ExitStack
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from agentos.evidence import EvidenceBundle
+from agentos.fsm import FSMViolationError, rebuild_task_state
+from agentos.packs import PackStore, pack_task_files
+from agentos.store_fs import FSStore
+from agentos.task import TaskState
+
+# The FSM rejects every event after these states, so their streams are final.
+TERMINAL_STATES: Tuple[str, ...] = (TaskState.EVALUATED.value, TaskState.FAILED.value)
+
+
+def _new_entries(ps: PackStore, entries: Iterable[Tuple[str, bytes]]) -> Iterator[Tuple[str, bytes]]:
+    """
+    Drop entries already packed with identical bytes (a re-run after an interrupted
+    archive); fail closed if a packed entry differs from the loose original.
+    """
+    for key, data in entries:
+        if ps.has(key):
+            if ps.get(key) != data:
+                raise RuntimeError(f"archive_conflict:{ps.dir}#{key}")
+            continue
+        yield key, data
+
+
+def archive_terminal_tasks(
+    store: FSStore,
+    *,
+    evidence_root: Optional[str] = None,
+    codec: str = "lzma",
+    batch: int = 256,
+    dry_run: bool = False,
+) -> Dict[str, Any]:
+    """
+    Move event streams and evidence of terminal (EVALUATED/FAILED) tasks into packs.
+
+    A task is archived only if its chain verifies and replay ends terminal. Per batch
+    of tasks, evidence packs are committed first, then event packs, and only then are
+    the loose directories removed, all while holding the batch's task locks. Entries
+    are streamed into each pack one file at a time, so memory does not grow with the
+    batch. Verification bundles (evidence/verify/...) are keyed by spec hash, not
+    task, and stay loose.
+    """
+    ev_root = Path(evidence_root) if evidence_root is not None else store.root / "evidence"
+    evidence = EvidenceBundle(root=str(ev_root))
+
+    candidates: List[str] = []
+    skipped: List[Dict[str, str]] = []
+    for task_id in store.loose_tasks():
+        try:
+            state = rebuild_task_state(store, task_id)["state"]
+        except (FSMViolationError, FileNotFoundError, ValueError) as e:
+            skipped.append({"task_id": task_id, "reason": f"replay_error:{e.__class__.__name__}"})
+            continue
+        if state not in TERMINAL_STATES:
+            continue
+        if not store.verify_chain(task_id):
+            skipped.append({"task_id": task_id, "reason": "chain_invalid"})
+            continue
+        candidates.append(task_id)
+
+    report: Dict[str, Any] = {
+        "ok": True,
+        "dry_run": bool(dry_run),
+        "codec": codec,
+        "task_ids": candidates,
+        "archived": 0,
+        "skipped": skipped,
+        "events_packed": 0,
+        "evidence_files_packed": 0,
+    }
+    if dry_run:
+        return report
+
+    def evidence_entries(task_ids: Sequence[str]) -> Iterator[Tuple[str, bytes]]:
+        for task_id in task_ids:
+            tdir = evidence.task_dir(task_id)
+            if tdir.is_dir():
+                for rel, data in pack_task_files(tdir):
+                    yield f"{task_id}/{rel}", data
+
+    def stream_entries(task_ids: Sequence[str]) -> Iterator[Tuple[str, bytes]]:
+        for task_id in task_ids:
+            yield task_id, store.export_stream(task_id)
+
+    def tally(entries: Iterable[Tuple[str, bytes]], field: str, stream: bool) -> Iterator[Tuple[str, bytes]]:
+        # Counts what reaches the pack, after _new_entries dropped already-packed entries.
+        for key, data in entries:
+            report[field] += data.count(b"\n") if stream else 1
+            yield key, data
+
+    event_packs = PackStore(store.root / "packs")
+    evidence_packs = PackStore(ev_root / "packs")
+    for i in range(0, len(candidates), max(1, batch)):
+        chunk = sorted(candidates[i:i + max(1, batch)])
+        with ExitStack() as locks:
+            for task_id in chunk:
+                locks.enter_context(store.lock_task(task_id))
+            evidence_packs.write_pack(
+                tally(_new_entries(evidence_packs, evidence_entries(chunk)), "evidence_files_packed", False), codec=codec
+            )
+            event_packs.write_pack(
+                tally(_new_entries(event_packs, stream_entries(chunk)), "events_packed", True), codec=codec
+            )
+            for task_id in chunk:
+                tdir = evidence.task_dir(task_id)
+                if tdir.is_dir():
+                    shutil.rmtree(tdir)
+                store.remove_loose_task(task_id)
+        report["archived"] += len(chunk)
+    event_packs.close()
+    evidence_packs.close()
+    return report
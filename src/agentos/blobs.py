@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import json
+import os
+import uuid
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Tuple, Union
+
+from agentos.canonical import canonical_json, sha256_hex
+from agentos.durability import Durability, DurabilityMode, resolve_durability
+
+# Canonical payloads larger than this (bytes) are stored as blobs and referenced by digest.
+PAYLOAD_INLINE_MAX = 4096
+
+
+class BlobStore:
+    """
+    Content-addressed, write-once blob store.
+
+    Layout:
+      <root>/<sha[:2]>/<sha256>   -> raw bytes whose sha256 is the file name
+
+    put() is idempotent (same bytes, same name) and the blob is durable before put()
+    returns, so an event that references it never commits ahead of its content.
+    get() re-hashes on every read (fail-closed).
+    """
+
+    def __init__(self, root: str, *, durability: Union[Durability, DurabilityMode, str, None] = None) -> None:
+        self.root = Path(root)
+        self.durability = resolve_durability(durability)
+
+    def path(self, sha256: str) -> Path:
+        return self.root / sha256[:2] / sha256
+
+    def has(self, sha256: str) -> bool:
+        return self.path(sha256).exists()
+
+    def put(self, data: bytes) -> str:
+        sha = sha256_hex(data)
+        p = self.path(sha)
+        if p.exists():
+            return sha
+        p.parent.mkdir(parents=True, exist_ok=True)
+        tmp = p.parent / f".{sha}.{uuid.uuid4().hex}.tmp"
+        tmp.write_bytes(data)
+        self.durability.commit(files=[tmp])
+        os.replace(tmp, p)
+        self.durability.commit(dirs=[p.parent, self.root])
+        return sha
+
+    def get(self, sha256: str) -> bytes:
+        p = self.path(sha256)
+        data = p.read_bytes()
+        if sha256_hex(data) != sha256:
+            raise RuntimeError(f"blob_corrupt:{p}")
+        return data
+
+
+class MemBlobStore:
+    """
+    BlobStore protocol (has/put/get) held in a dict, for in-memory event stores.
+    """
+
+    def __init__(self) -> None:
+        self._blobs: Dict[str, bytes] = {}
+
+    def has(self, sha256: str) -> bool:
+        return sha256 in self._blobs
+
+    def put(self, data: bytes) -> str:
+        sha = sha256_hex(data)
+        self._blobs.setdefault(sha, bytes(data))
+        return sha
+
+    def get(self, sha256: str) -> bytes:
+        try:
+            return self._blobs[sha256]
+        except KeyError:
+            raise FileNotFoundError(f"blob:{sha256}") from None
+
+    def items(self) -> List[Tuple[str, bytes]]:
+        return sorted(self._blobs.items())
+
+
+def blob_store_for(store: Any) -> Any:
+    """
+    The store's own blob store if it has one (store.blobs), else <store root>/blobs.
+    """
+    own = getattr(store, "blobs", None)
+    if own is not None:
+        return own
+    return BlobStore(str(Path(str(store.root)) / "blobs"), durability=getattr(store, "durability", None))
+
+
+def payload_fields(store: Any, payload: Mapping[str, Any], *, inline_max: int = PAYLOAD_INLINE_MAX) -> Dict[str, Any]:
+    """
+    Event body fields carrying payload: inline {"payload": ...} when small, otherwise
+    {"payload_ref": {"sha256", "size"}} with the canonical bytes stored as a blob.
+
+    The event hash covers payload_ref.sha256, so it still commits to the payload.
+    """
+    raw = canonical_json(dict(payload)).encode("utf-8")
+    if len(raw) <= inline_max:
+        return {"payload": dict(payload)}
+    return {"payload_ref": {"sha256": blob_store_for(store).put(raw), "size": len(raw)}}
+
+
+def resolve_payload(store: Any, body: Mapping[str, Any]) -> Optional[Any]:
+    """
+    The payload of an event body, loading it from the blob store if it was externalised.
+
+    Fail-closed: a reference whose blob is missing, corrupt or the wrong size raises.
+    """
+    if "payload" in body or "payload_ref" not in body:
+        return body.get("payload")
+    ref = body.get("payload_ref")
+    if not isinstance(ref, Mapping) or not isinstance(ref.get("sha256"), str):
+        raise TypeError("payload_ref must be an object with a sha256")
+    data = blob_store_for(store).get(str(ref["sha256"]))
+    if len(data) != ref.get("size"):
+        raise RuntimeError(f"blob_size_mismatch:{ref['sha256']}")
+    return json.loads(data.decode("utf-8"))
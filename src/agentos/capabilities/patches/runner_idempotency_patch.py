@@ -1,33 +1,36 @@
 from agentos.runner import TaskRunner, RunSummary
-from agentos.fsm import rebuild_task_state
 from agentos.task import TaskState
 from agentos.capabilities.idempotency import IdempotencyStore
-from agentos.canonical import sha256_hex
+import asyncio
 import json
+import sys
+from contextlib import contextmanager
 from pathlib import Path
 
-# Original TaskRunner execution function
+# Original TaskRunner execution functions
 orig_run_dispatched = TaskRunner.run_dispatched
+orig_run_dispatched_async = TaskRunner.run_dispatched_async
 
 
-def run_dispatched_with_idempotency(self, task_id: str) -> RunSummary:
-    snap = rebuild_task_state(self.store, task_id)
-    derived_state = TaskState(str(snap["state"]))
+@contextmanager
+def _idempotent_run(self, task_id: str):
+    """
+    Admission, in-flight lock and attempt record around one run (sync or async).
+
+    Yields the settle(res) callback the caller applies to the original runner's result.
+    """
+    # One event scan serves the key, the state checks and the original runner.
+    ctx = self.load_context(task_id)
+    derived_state = ctx.state
 
     if not hasattr(self, "_idempotency_store"):
         self._idempotency_store = IdempotencyStore()
 
     # Build an audit-authoritative key from VERIFIED inputs manifest + created payload.
     try:
-        created_payload = self._load_created_payload(task_id)
-        role, action = self._load_created_role_action(task_id)
-
-        verified_ims = self._load_verified_inputs_manifest_sha256(task_id)
-        created_payload = dict(created_payload)
-        created_payload["inputs_manifest_sha256"] = verified_ims
-
-        spec = self._build_spec(task_id=task_id, role=role, action=action, payload=created_payload)
-        key = sha256_hex(spec.to_canonical_json().encode("utf-8"))
+        spec = self._spec_for(ctx)
+        ctx = ctx.with_spec(spec)
+        key = str(ctx.spec_sha256)
     except Exception:
         # Preserve fail-closed semantics for tasks that were never VERIFIED / not well-formed.
         self.evidence.write_rejection(task_id, reason=f"invalid_state:{derived_state.value}")
@@ -70,21 +73,22 @@ def run_dispatched_with_idempotency(self, task_id: str) -> RunSummary:
     # Concurrency guard (in-flight mutex).
     self._idempotency_store.acquire_lock(task_id, key)
 
-    status = "unknown"
-    terminal_exec_id = spec.exec_id
-    terminal_manifest_sha256 = ""
+    outcome = {"status": "unknown", "exec_id": spec.exec_id, "manifest_sha256": ""}
+
+    def settle(res: RunSummary) -> RunSummary:
+        outcome["status"] = "complete" if bool(res.ok) else "failed"
+        outcome["exec_id"] = res.exec_id
+        outcome["manifest_sha256"] = res.evidence_manifest_sha256
+        return res
 
     try:
         # Thread idempotency key into evidence bundles (TaskRunner reads this).
         self._current_idempotency_key = key
+        # The original runner reuses this context if the stream has not moved since.
+        self._current_task_context = ctx
 
-        # Delegate to the original runner.
-        res = orig_run_dispatched(self, task_id)
-
-        status = "complete" if bool(res.ok) else "failed"
-        terminal_exec_id = res.exec_id
-        terminal_manifest_sha256 = res.evidence_manifest_sha256
-        return res
+        # The caller delegates to the original runner.
+        yield settle
 
     except Exception as e:
         # Ensure terminal evidence exists even when the original runner raises.
@@ -95,16 +99,17 @@ def run_dispatched_with_idempotency(self, task_id: str) -> RunSummary:
             idempotency_key=key,
             context={"exec_id": spec.exec_id},
         )
-        status = "error"
-        terminal_manifest_sha256 = str(rej.get("manifest_sha256") or "")
+        outcome["status"] = "error"
+        outcome["manifest_sha256"] = str(rej.get("manifest_sha256") or "")
         raise
 
     finally:
-        # Always clear per-run key and release lock.
-        try:
-            delattr(self, "_current_idempotency_key")
-        except Exception:
-            pass
+        # Always clear per-run key/context and release lock.
+        for attr in ("_current_idempotency_key", "_current_task_context"):
+            try:
+                delattr(self, attr)
+            except Exception:
+                pass
 
         # Record the attempt ONLY after terminal evidence exists (or after we forced a rejection).
         # This enforces Policy B without creating permanent "started" tombstones.
@@ -113,14 +118,35 @@ def run_dispatched_with_idempotency(self, task_id: str) -> RunSummary:
                 task_id,
                 key,
                 {
-                    "status": str(status),
-                    "exec_id": str(terminal_exec_id),
-                    "manifest_sha256": str(terminal_manifest_sha256),
+                    "status": str(outcome["status"]),
+                    "exec_id": str(outcome["exec_id"]),
+                    "manifest_sha256": str(outcome["manifest_sha256"]),
                 },
             )
         finally:
             self._idempotency_store.release_lock(task_id, key)
 
 
+def run_dispatched_with_idempotency(self, task_id: str) -> RunSummary:
+    with _idempotent_run(self, task_id) as settle:
+        return settle(orig_run_dispatched(self, task_id))
+
+
+async def run_dispatched_async_with_idempotency(self, task_id: str) -> RunSummary:
+    # Admission and the attempt record take file locks and write evidence, so both
+    # halves of the guard run off the event loop.
+    loop = asyncio.get_running_loop()
+    guard = _idempotent_run(self, task_id)
+    settle = await loop.run_in_executor(None, guard.__enter__)
+    try:
+        res = settle(await orig_run_dispatched_async(self, task_id))
+    except BaseException:
+        await loop.run_in_executor(None, guard.__exit__, *sys.exc_info())
+        raise
+    await loop.run_in_executor(None, guard.__exit__, None, None, None)
+    return res
+
+
 # Patch TaskRunner
 TaskRunner.run_dispatched = run_dispatched_with_idempotency
+TaskRunner.run_dispatched_async = run_dispatched_async_with_idempotency
@@ -0,0 +1,217 @@
+from __future__ import annotations
+
+import json
+import os
+import re
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence, Set, Union
+
+from agentos.canonical import canonical_json
+from agentos.durability import Durability, DurabilityMode, resolve_durability
+from agentos.store_fs import exclusive_file_lock
+
+_RECORD_KEYS = ("task_id", "seq", "type", "sha256", "ts_utc")
+_CONSUMER_RE = re.compile(r"[A-Za-z0-9_][A-Za-z0-9_.-]*")
+
+
+class ChangeFeed:
+    """
+    Store-wide change feed: a global append-order journal of committed events.
+
+    Layout:
+      store/feed/journal.log            -> one canonical JSON record per line
+                                           (task_id, seq, type, sha256, ts_utc)
+      store/feed/cursors/<consumer>     -> persisted resume offset for a consumer
+
+    A record's offset is its byte position in journal.log, so offsets increase
+    monotonically and resuming is a seek. Each record read carries "offset" and
+    "next_offset"; consumers persist next_offset to resume after that record.
+
+    Records are published after the task's HEAD commit, so the feed never names an
+    uncommitted event. A crash between the two can drop records; reconcile(store)
+    republishes committed events missing from the journal.
+    """
+
+    def __init__(
+        self,
+        root: str = "store",
+        *,
+        durability: Union[Durability, DurabilityMode, str, None] = None,
+    ) -> None:
+        self.root = Path(root)
+        self.dir = self.root / "feed"
+        self.journal_path = self.dir / "journal.log"
+        self.durability = resolve_durability(durability)
+
+    def _ensure_dir(self) -> None:
+        self.dir.mkdir(parents=True, exist_ok=True)
+
+    def publish(self, events: Sequence[Mapping[str, Any]]) -> None:
+        """
+        Append records for committed events as one write under the journal lock.
+        """
+        if not events:
+            return
+        self._ensure_dir()
+        data = "".join(canonical_json({k: ev.get(k) for k in _RECORD_KEYS}) + "\n" for ev in events).encode("utf-8")
+        with exclusive_file_lock(self.dir / "LOCK"):
+            fd = os.open(str(self.journal_path), os.O_CREAT | os.O_RDWR | os.O_APPEND, 0o644)
+            try:
+                self._drop_torn_tail(fd)
+                os.write(fd, data)
+            finally:
+                os.close(fd)
+            self.durability.commit(files=[self.journal_path], dirs=[self.dir])
+
+    def _drop_torn_tail(self, fd: int) -> None:
+        # A partial last line is an interrupted publish; it was never readable.
+        size = os.fstat(fd).st_size
+        if size == 0:
+            return
+        if os.pread(fd, 1, size - 1) == b"\n":
+            return
+        pos = size
+        while pos > 0:
+            step = min(4096, pos)
+            chunk = os.pread(fd, step, pos - step)
+            nl = chunk.rfind(b"\n")
+            if nl >= 0:
+                os.ftruncate(fd, pos - step + nl + 1)
+                return
+            pos -= step
+        os.ftruncate(fd, 0)
+
+    def end_offset(self) -> int:
+        try:
+            return self.journal_path.stat().st_size
+        except FileNotFoundError:
+            return 0
+
+    def read(self, from_offset: int = 0, *, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Return complete records starting at from_offset (a record boundary).
+        """
+        if from_offset < 0:
+            raise ValueError("from_offset must be >= 0")
+        out: List[Dict[str, Any]] = []
+        try:
+            fh = open(self.journal_path, "rb")
+        except FileNotFoundError:
+            return out
+        with fh:
+            fh.seek(from_offset)
+            offset = from_offset
+            for line in fh:
+                if not line.endswith(b"\n"):
+                    break
+                rec = json.loads(line.decode("utf-8"))
+                rec["offset"] = offset
+                offset += len(line)
+                rec["next_offset"] = offset
+                out.append(rec)
+                if limit is not None and len(out) >= limit:
+                    break
+        return out
+
+    def poll(
+        self,
+        from_offset: int = 0,
+        *,
+        timeout_s: float = 0.0,
+        limit: Optional[int] = None,
+        poll_interval_s: float = 0.05,
+    ) -> List[Dict[str, Any]]:
+        """
+        Long-poll: return as soon as records exist past from_offset, or [] after timeout_s.
+        """
+        deadline = time.monotonic() + max(0.0, timeout_s)
+        while True:
+            if self.end_offset() > from_offset:
+                recs = self.read(from_offset, limit=limit)
+                if recs:
+                    return recs
+            if time.monotonic() >= deadline:
+                return []
+            time.sleep(poll_interval_s)
+
+    def subscribe(
+        self,
+        from_offset: int = 0,
+        *,
+        idle_timeout_s: Optional[float] = None,
+        poll_interval_s: float = 0.05,
+        batch: int = 256,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Yield records from from_offset onwards, blocking for new ones.
+
+        idle_timeout_s=None blocks forever; otherwise iteration ends after that long
+        without a new record.
+        """
+        offset = from_offset
+        while True:
+            recs = self.poll(
+                offset,
+                timeout_s=idle_timeout_s if idle_timeout_s is not None else 3600.0,
+                limit=batch,
+                poll_interval_s=poll_interval_s,
+            )
+            if not recs:
+                if idle_timeout_s is not None:
+                    return
+                continue
+            for rec in recs:
+                yield rec
+            offset = recs[-1]["next_offset"]
+
+    def _cursor_path(self, consumer: str) -> Path:
+        if not _CONSUMER_RE.fullmatch(consumer):
+            raise ValueError(f"invalid consumer name: {consumer!r}")
+        return self.dir / "cursors" / consumer
+
+    def load_cursor(self, consumer: str) -> int:
+        """
+        Persisted resume offset for consumer (0 if none).
+        """
+        p = self._cursor_path(consumer)
+        try:
+            obj = json.loads(p.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return 0
+        return int(obj["offset"])
+
+    def commit_cursor(self, consumer: str, offset: int) -> None:
+        p = self._cursor_path(consumer)
+        p.parent.mkdir(parents=True, exist_ok=True)
+        tmp = p.with_name(f"{consumer}.{os.getpid()}.tmp")
+        tmp.write_text(canonical_json({"offset": int(offset)}), encoding="utf-8")
+        os.replace(tmp, p)
+
+    def reconcile(self, store: Any) -> int:
+        """
+        Publish committed events that are missing from the journal. Returns the count.
+
+        Scans the whole journal and every task stream; meant for crash recovery with
+        no writers active, not the steady state.
+        """
+        # A failed publish can be followed by a successful one for the same task, so
+        # the journal may hold a hole below its highest seq: track every seq seen and
+        # replay each stream from its first gap.
+        seen: Dict[str, Set[int]] = {}
+        for rec in self.read(0):
+            seen.setdefault(str(rec["task_id"]), set()).add(int(rec["seq"]))
+        n = 0
+        for task_id in store.list_tasks():
+            published = seen.get(task_id, set())
+            first_gap = 0
+            while first_gap in published:
+                first_gap += 1
+            evs = [
+                ev
+                for ev in store.iter_task_events(task_id, from_seq=first_gap)
+                if int(ev["seq"]) not in published
+            ]
+            self.publish(evs)
+            n += len(evs)
+        return n
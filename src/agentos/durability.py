@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from enum import Enum
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Union
+
+
+class DurabilityMode(str, Enum):
+    NONE = "none"
+    FSYNC = "fsync"
+    GROUP = "group"
+
+
+def _fsync_path(path: Path, *, directory: bool) -> None:
+    fd = os.open(str(path), os.O_RDONLY | (getattr(os, "O_DIRECTORY", 0) if directory else 0))
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class Durability:
+    """
+    Crash-durability policy shared by FSStore and EvidenceBundle.
+
+    Writers call commit(files=..., dirs=...) at each ordering barrier (e.g. event files
+    before HEAD). commit returns only once those paths are durable under this mode:
+
+    - none:  no fsync (page cache only; fastest, not crash-durable)
+    - fsync: fsync every file and directory immediately
+    - group: group commit; concurrent callers are coalesced into one flush that
+             fsyncs each distinct path once. The first caller leads the batch and
+             waits at most group_delay_s for others to join.
+    """
+
+    def __init__(self, mode: Union[DurabilityMode, str] = DurabilityMode.NONE, *, group_delay_s: float = 0.002) -> None:
+        self.mode = DurabilityMode(mode)
+        if group_delay_s < 0:
+            raise ValueError("group_delay_s must be >= 0")
+        self.group_delay_s = float(group_delay_s)
+        self._cv = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._files: Dict[str, None] = {}
+        self._dirs: Dict[str, None] = {}
+        self._collecting = 0
+        self._done = -1
+        self._leader = False
+        self._errors: Dict[int, BaseException] = {}
+        self._waiting: Dict[int, int] = {}
+        self.flushes = 0
+
+    def commit(self, *, files: Iterable[Path] = (), dirs: Iterable[Path] = ()) -> None:
+        if self.mode is DurabilityMode.NONE:
+            return
+        if self.mode is DurabilityMode.FSYNC:
+            self._flush(list(dict.fromkeys(str(p) for p in files)), list(dict.fromkeys(str(p) for p in dirs)))
+            return
+        self._group_commit(files, dirs)
+
+    def _flush(self, files: List[str], dirs: List[str]) -> None:
+        # Files first, then the directories whose entries point at them.
+        for f in files:
+            _fsync_path(Path(f), directory=False)
+        for d in dirs:
+            _fsync_path(Path(d), directory=True)
+        with self._cv:
+            self.flushes += 1
+
+    def _group_commit(self, files: Iterable[Path], dirs: Iterable[Path]) -> None:
+        with self._cv:
+            for p in files:
+                self._files[str(p)] = None
+            for p in dirs:
+                self._dirs[str(p)] = None
+            gen = self._collecting
+            lead = not self._leader
+            if lead:
+                self._leader = True
+            else:
+                self._waiting[gen] = self._waiting.get(gen, 0) + 1
+                while self._done < gen:
+                    self._cv.wait()
+                err = self._errors.get(gen)
+                # The last waiter of a generation drops its error.
+                self._waiting[gen] -= 1
+                if not self._waiting[gen]:
+                    del self._waiting[gen]
+                    self._errors.pop(gen, None)
+                if err is not None:
+                    raise err
+                return
+
+        if self.group_delay_s:
+            time.sleep(self.group_delay_s)
+        # Flushes run one at a time so generations complete in order.
+        with self._flush_lock:
+            with self._cv:
+                batch_files, batch_dirs = list(self._files), list(self._dirs)
+                self._files, self._dirs = {}, {}
+                self._collecting += 1
+                self._leader = False
+            err: Optional[BaseException] = None
+            try:
+                self._flush(batch_files, batch_dirs)
+            except BaseException as e:
+                err = e
+            with self._cv:
+                if err is not None and self._waiting.get(gen):
+                    self._errors[gen] = err
+                self._done = gen
+                self._cv.notify_all()
+        if err is not None:
+            raise err
+
+
+_SHARED: Dict[DurabilityMode, Durability] = {}
+_SHARED_LOCK = threading.Lock()
+
+
+def resolve_durability(spec: Union[Durability, DurabilityMode, str, None]) -> Durability:
+    """
+    Normalize a durability argument. Mode names map to one process-wide instance per
+    mode so every writer in the process shares the same group-commit barrier.
+    """
+    if isinstance(spec, Durability):
+        return spec
+    mode = DurabilityMode(spec if spec is not None else DurabilityMode.NONE)
+    with _SHARED_LOCK:
+        if mode not in _SHARED:
+            _SHARED[mode] = Durability(mode)
+        return _SHARED[mode]
@@ -12,24 +12,22 @@ from agentos.evidence import EvidenceBundle
 from agentos.store_fs import FSStore
 
 def _latest_run_succeeded_event(store: FSStore, task_id: str) -> Dict[str, Any]:
-    events = list(store.list_events(task_id))
-    for e in reversed(events):
+    for e in store.iter_task_events(task_id, reverse=True, types=('RUN_SUCCEEDED',)):
         if str(e.get('type')) == 'RUN_SUCCEEDED':
             return dict(e)
     raise RuntimeError('no_run_succeeded_event')
 
 def _load_run_summary(evidence_root: str, task_id: str, exec_id: str) -> Dict[str, Any]:
-    p = Path(evidence_root) / task_id / exec_id / 'run_summary.json'
-    if not p.exists():
-        raise FileNotFoundError(str(p))
-    return json.loads(p.read_text(encoding='utf-8'))
+    raw = EvidenceBundle(root=evidence_root).read_bundle_file(task_id, exec_id, 'run_summary.json')
+    return json.loads(raw.decode('utf-8'))
 
 def evaluate_task(
     *, store: FSStore, evidence_root: str, task_id: str, decision: str, note: Optional[str] = None
 ) -> Dict[str, str]:
     if decision not in ('accept', 'refine'):
         raise ValueError('decision must be accept or refine')
-    snap = rebuild_task_state(store, task_id)
+    # Writer path: about to append TASK_EVALUATED, so a checkpoint may be persisted.
+    snap = rebuild_task_state(store, task_id, persist=True)
     derived_state = TaskState(str(snap['state']))
     if derived_state is not TaskState.COMPLETED:
         raise RuntimeError(f'invalid_state_for_evaluation:{derived_state.value}')
@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import json
+from typing import Any, Dict, Iterator, Mapping, Optional, Tuple
+
+from agentos.canonical import canonical_json
+
+_HEADER: Tuple[str, ...] = ("prev_sha256", "seq", "sha256", "task_id", "ts_utc", "type")
+_HEADER_SET = frozenset(_HEADER)
+# canonical_json sorts keys, so a stored event always starts with its body.
+_BODY_PREFIX = '{"body":'
+_AFTER_BODY = ',"prev_sha256":'
+
+
+class _Missing:
+    __slots__ = ()
+
+    def __repr__(self) -> str:
+        return "<missing>"
+
+
+_MISSING: Any = _Missing()
+
+
+class Event(Mapping[str, Any]):
+    """
+    Immutable, compact record of one sealed store event.
+
+    Header fields live in __slots__; the body is kept as its canonical JSON text and
+    decoded only when read, so replay (which looks at type/seq/ts_utc) never parses
+    bodies. Each body access decodes a fresh object, so callers may mutate what they
+    get without touching the record.
+
+    Event is a read-only Mapping with the same keys as the stored event dict, so code
+    written against dict events keeps working; to_dict() converts at API boundaries.
+    """
+
+    __slots__ = ("prev_sha256", "seq", "sha256", "task_id", "ts_utc", "type", "_body_json", "_extra")
+
+    prev_sha256: Optional[str]
+    seq: int
+    sha256: str
+    task_id: str
+    ts_utc: str
+    type: str
+
+    def __init__(self, header: Mapping[str, Any], body_json: Optional[str], extra: Tuple[Tuple[str, Any], ...] = ()) -> None:
+        for k in _HEADER:
+            object.__setattr__(self, k, header.get(k, _MISSING))
+        object.__setattr__(self, "_body_json", body_json)
+        object.__setattr__(self, "_extra", extra)
+
+    @classmethod
+    def from_json(cls, text: str) -> "Event":
+        """
+        Parse stored canonical event json, leaving the body undecoded.
+
+        Anything not in the exact canonical shape is parsed in full instead.
+        """
+        if text.startswith(_BODY_PREFIX):
+            cut = text.rfind(_AFTER_BODY)
+            if cut > 0:
+                try:
+                    head = json.loads("{" + text[cut + 1:])
+                except ValueError:
+                    head = None
+                if isinstance(head, dict) and head.keys() == _HEADER_SET:
+                    return cls(head, text[len(_BODY_PREFIX):cut])
+        return cls.from_mapping(json.loads(text))
+
+    @classmethod
+    def from_mapping(cls, obj: Mapping[str, Any]) -> "Event":
+        if isinstance(obj, Event):
+            return obj
+        body_json = canonical_json(obj["body"]) if "body" in obj else None
+        extra = tuple((k, v) for k, v in obj.items() if k != "body" and k not in _HEADER_SET)
+        return cls(obj, body_json, extra)
+
+    @property
+    def body(self) -> Any:
+        if self._body_json is None:
+            raise KeyError("body")
+        return json.loads(self._body_json)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {k: self[k] for k in self}
+
+    def __getitem__(self, key: str) -> Any:
+        if key == "body":
+            return self.body
+        if key in _HEADER_SET:
+            v = object.__getattribute__(self, key)
+            if v is _MISSING:
+                raise KeyError(key)
+            return v
+        for k, v in self._extra:
+            if k == key:
+                return v
+        raise KeyError(key)
+
+    def __contains__(self, key: object) -> bool:
+        if key == "body":
+            return self._body_json is not None
+        if key in _HEADER_SET:
+            return object.__getattribute__(self, str(key)) is not _MISSING
+        return any(k == key for k, _ in self._extra)
+
+    def __iter__(self) -> Iterator[str]:
+        if self._body_json is not None:
+            yield "body"
+        for k in _HEADER:
+            if object.__getattribute__(self, k) is not _MISSING:
+                yield k
+        for k, _ in self._extra:
+            yield k
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError("Event is immutable")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError("Event is immutable")
+
+    def __reduce__(self) -> Any:
+        header = {k: v for k in _HEADER if (v := object.__getattribute__(self, k)) is not _MISSING}
+        return (Event, (header, self._body_json, self._extra))
+
+    def __repr__(self) -> str:
+        return f"Event(task_id={self.task_id!r}, seq={self.seq!r}, type={self.type!r}, sha256={self.sha256!r})"
@@ -1,28 +1,119 @@
 from __future__ import annotations
+import os
+import shutil
+import uuid
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Union
 import re
 from agentos.canonical import canonical_json, sha256_hex
+from agentos.durability import Durability, DurabilityMode, resolve_durability
 from agentos.execution import ExecutionSpec
+from agentos.executor import CapturedStream
+from agentos.layout import resolve_dir, resolve_layout
+from agentos.packs import PackStore
 from agentos.outcome import ExecutionOutcome, RUN_SUMMARY_SCHEMA_VERSION
 
 class EvidenceBundle:
-    def __init__(self, root: str = "evidence") -> None:
+    """
+    Writes execution, rejection and verification bundles under root.
+
+    durability follows agentos.durability: a bundle's files and the directories that
+    name them are made durable before the write_* call returns.
+
+    layout follows agentos.layout: "sharded" (recorded in <root>/LAYOUT) places task
+    directories at <root>/<ab>/<cd>/<task_id> and verification bundles at
+    <root>/verify/<ab>/<cd>/<spec_sha256>. Lookups resolve both layouts.
+
+    Task directories of archived tasks live in <root>/packs (see agentos.archive);
+    read_bundle_file falls back to the packs and writes treat packed bundles as existing.
+
+    Streamed output: new_capture_dir() gives the executor a staging directory
+    (<task dir>/.<exec_id>.capture-<uuid>, skipped by validators) to stream stdout and
+    stderr into; write_bundle() then moves those files into the bundle instead of
+    holding the output in memory.
+    """
+
+    def __init__(
+        self,
+        root: str = "evidence",
+        *,
+        durability: Union[Durability, DurabilityMode, str, None] = None,
+        layout: Optional[str] = None,
+    ) -> None:
         self.root = Path(root)
+        self.durability = resolve_durability(durability)
+        self.layout = resolve_layout(self.root, layout)
+        self._pack_store: Optional[PackStore] = None
+
+    def task_dir(self, task_id: str) -> Path:
+        return resolve_dir(self.root, task_id, self.layout)
+
+    def bundle_dir(self, task_id: str, exec_id: str) -> Path:
+        return self.task_dir(task_id) / exec_id
+
+    def verification_dir(self, spec_sha256: str) -> Path:
+        return resolve_dir(self.root / "verify", spec_sha256, self.layout)
+
+    def _packs(self) -> Optional[PackStore]:
+        if self._pack_store is None:
+            self._pack_store = PackStore.open_existing(self.root / "packs")
+        return self._pack_store
+
+    def _packed(self, prefix: str) -> bool:
+        ps = self._packs()
+        return ps is not None and ps.has_prefix(prefix)
+
+    def read_bundle_file(self, task_id: str, exec_id: str, name: str) -> bytes:
+        """
+        Bytes of one file of a task's bundle (loose or archived).
+        """
+        p = self.bundle_dir(task_id, exec_id) / name
+        if p.is_file():
+            return p.read_bytes()
+        ps = self._packs()
+        key = f"{task_id}/{exec_id}/{name}"
+        if ps is not None and ps.has(key):
+            return ps.get(key)
+        raise FileNotFoundError(str(p))
+
+    def new_capture_dir(self, task_id: str, exec_id: str) -> Path:
+        d = self.task_dir(task_id) / f".{exec_id}.capture-{uuid.uuid4().hex}"
+        d.mkdir(parents=True)
+        return d
+
+    def discard_capture(self, capture_dir: Optional[Path]) -> None:
+        if capture_dir is not None:
+            shutil.rmtree(capture_dir, ignore_errors=True)
+
+    def _place(self, path: Path, data: Union[bytes, CapturedStream]) -> str:
+        """
+        Put one output stream at path and return its sha256; a CapturedStream is
+        renamed into place (same filesystem), never read back into memory.
+        """
+        if isinstance(data, CapturedStream):
+            os.replace(data.path, path)
+            return data.sha256
+        path.write_bytes(data)
+        return sha256_hex(data)
+
+    def _commit(self, files: List[Path], bundle_dir: Path, *subdirs: Path) -> None:
+        # Cover the bundle and every directory entry up to root that may be new.
+        rel_depth = len(bundle_dir.relative_to(self.root).parts)
+        self.durability.commit(files=files, dirs=[*subdirs, bundle_dir, *list(bundle_dir.parents)[:rel_depth]])
 
     def write_bundle(
         self,
         *,
         spec: ExecutionSpec,
-        stdout: bytes,
-        stderr: bytes,
+        stdout: Union[bytes, CapturedStream],
+        stderr: Union[bytes, CapturedStream],
         outputs: Dict[str, bytes],
         outcome: ExecutionOutcome,
         reason: str,
         idempotency_key: str | None = None
     ) -> Dict[str, Any]:
-        bundle_dir = self.root / spec.task_id / spec.exec_id
-        if bundle_dir.exists():
+        bundle_dir = self.bundle_dir(spec.task_id, spec.exec_id)
+        if bundle_dir.exists() or self._packed(f"{spec.task_id}/{spec.exec_id}/"):
             raise FileExistsError(f"evidence_bundle_exists:{bundle_dir}")
         bundle_dir.mkdir(parents=True, exist_ok=False)
 
@@ -33,18 +124,18 @@ class EvidenceBundle:
         manifest["exec_spec.json"] = sha256_hex(exec_spec_path.read_bytes())
 
         stdout_path = bundle_dir / "stdout.txt"
-        stdout_path.write_bytes(stdout)
-        manifest["stdout.txt"] = sha256_hex(stdout)
+        manifest["stdout.txt"] = self._place(stdout_path, stdout)
 
         stderr_path = bundle_dir / "stderr.txt"
-        stderr_path.write_bytes(stderr)
-        manifest["stderr.txt"] = sha256_hex(stderr)
+        manifest["stderr.txt"] = self._place(stderr_path, stderr)
 
         outputs_dir = bundle_dir / "outputs"
         outputs_dir.mkdir(exist_ok=True)
+        written = [exec_spec_path, stdout_path, stderr_path]
         for name, data in outputs.items():
             p = outputs_dir / name
             p.write_bytes(data)
+            written.append(p)
             manifest[f"outputs/{name}"] = sha256_hex(data)
 
         manifest_path = bundle_dir / "manifest.sha256.json"
@@ -61,7 +152,9 @@ class EvidenceBundle:
             "inputs_manifest_sha256": spec.inputs_manifest_sha256,
             "manifest_sha256": sha256_hex(manifest_path.read_bytes()),
         }
-        (bundle_dir / "run_summary.json").write_text(canonical_json(summary), encoding="utf-8")
+        summary_path = bundle_dir / "run_summary.json"
+        summary_path.write_text(canonical_json(summary), encoding="utf-8")
+        self._commit(written + [manifest_path, summary_path], bundle_dir, outputs_dir)
 
         return {
             "files": manifest,
@@ -87,7 +180,7 @@ class EvidenceBundle:
         if not isinstance(reason, str) or not reason:
             raise TypeError("reason must be a non-empty string")
 
-        bundle_dir = self.root / "verify" / spec_sha256
+        bundle_dir = self.verification_dir(spec_sha256)
         bundle_dir.mkdir(parents=True, exist_ok=True)
 
         payload = {
@@ -108,6 +201,7 @@ class EvidenceBundle:
                 raise RuntimeError("verification bundle collision: existing manifest differs")
         else:
             manifest_path.write_bytes(new_bytes)
+            self._commit([manifest_path], bundle_dir)
 
         return {
             "bundle_dir": str(bundle_dir),
@@ -129,8 +223,8 @@ class EvidenceBundle:
         ctx = context if isinstance(context, dict) else {}
 
         rej_id = sha256_hex(reason.encode("utf-8"))[:16]
-        bundle_dir = self.root / task_id / "rejections" / rej_id
-        if bundle_dir.exists():
+        bundle_dir = self.task_dir(task_id) / "rejections" / rej_id
+        if bundle_dir.exists() or self._packed(f"{task_id}/rejections/{rej_id}/"):
             raise FileExistsError(f"evidence_bundle_exists:{bundle_dir}")
         bundle_dir.mkdir(parents=True, exist_ok=False)
 
@@ -156,6 +250,7 @@ class EvidenceBundle:
         manifest_path.write_text(canonical_json({"files": manifest}), encoding="utf-8")
         manifest_sha = sha256_hex(manifest_path.read_bytes())
         manifest["manifest.sha256.json"] = manifest_sha
+        self._commit([rej_path, manifest_path], bundle_dir)
 
         return {
             "files": manifest,
@@ -1,17 +1,115 @@
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import os
+import selectors
+import signal
 import subprocess
-from typing import Dict
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO, Dict, Optional
 
+from agentos.canonical import sha256_hex
 from agentos.execution import ExecutionSpec
 
+_CHUNK = 1 << 16
+
+
+@dataclass(frozen=True)
+class CapturedStream:
+    """
+    A child output stream written to a file while it ran: the file, its sha256 and size.
+    """
+
+    path: str
+    sha256: str
+    size: int
+
 
 class ExecutionResult:
-    def __init__(self, *, exit_code: int, stdout: bytes, stderr: bytes) -> None:
+    """
+    Exit code plus captured output: in memory (stdout/stderr bytes) or, when the
+    executor was given a capture_dir, streamed to files (stdout_capture/stderr_capture,
+    with stdout/stderr left empty). The *_sha256 properties work for both.
+    """
+
+    def __init__(
+        self,
+        *,
+        exit_code: int,
+        stdout: bytes = b"",
+        stderr: bytes = b"",
+        stdout_capture: Optional[CapturedStream] = None,
+        stderr_capture: Optional[CapturedStream] = None,
+    ) -> None:
         self.exit_code = int(exit_code)
         self.stdout = stdout
         self.stderr = stderr
+        self.stdout_capture = stdout_capture
+        self.stderr_capture = stderr_capture
+
+    @property
+    def stdout_sha256(self) -> str:
+        return self.stdout_capture.sha256 if self.stdout_capture is not None else sha256_hex(self.stdout)
+
+    @property
+    def stderr_sha256(self) -> str:
+        return self.stderr_capture.sha256 if self.stderr_capture is not None else sha256_hex(self.stderr)
+
+
+class _Sink:
+    """
+    One output stream: sha256 updated per chunk, bytes kept in memory or written
+    straight to path (so memory stays flat whatever the child prints).
+    """
+
+    def __init__(self, path: Optional[Path]) -> None:
+        self.path = path
+        self._sha = hashlib.sha256()
+        self._size = 0
+        self._buf = bytearray()
+        self._f: Optional[BinaryIO] = open(path, "wb") if path is not None else None
+
+    def write(self, chunk: bytes) -> None:
+        self._sha.update(chunk)
+        self._size += len(chunk)
+        if self._f is not None:
+            self._f.write(chunk)
+        else:
+            self._buf.extend(chunk)
+
+    def close(self) -> None:
+        if self._f is not None:
+            self._f.close()
+
+    def data(self) -> bytes:
+        return bytes(self._buf)
+
+    def capture(self) -> Optional[CapturedStream]:
+        if self.path is None:
+            return None
+        return CapturedStream(path=str(self.path), sha256=self._sha.hexdigest(), size=self._size)
+
+
+def _sinks(capture_dir: Optional[Path]) -> tuple[_Sink, _Sink]:
+    if capture_dir is None:
+        return _Sink(None), _Sink(None)
+    capture_dir = Path(capture_dir)
+    return _Sink(capture_dir / "stdout.txt"), _Sink(capture_dir / "stderr.txt")
+
+
+def _result(exit_code: int, out: _Sink, err: _Sink) -> ExecutionResult:
+    out.close()
+    err.close()
+    return ExecutionResult(
+        exit_code=exit_code,
+        stdout=out.data(),
+        stderr=err.data(),
+        stdout_capture=out.capture(),
+        stderr_capture=err.capture(),
+    )
 
 
 def _real_abs(path: str) -> str:
@@ -79,7 +177,10 @@ class LocalExecutor:
                 if os.path.exists(ap) and (not any(_allowed_path(ap, a) for a in allow)):
                     raise PermissionError(f"arg_path_not_allowlisted:{ap}")
 
-    def run(self, spec: ExecutionSpec) -> ExecutionResult:
+    def _prepare(self, spec: ExecutionSpec) -> Dict[str, str]:
+        """
+        Kind check and paths_allowlist preflight; returns the allowlisted environment.
+        """
         if spec.kind != "shell":
             raise ValueError(f"unsupported_execution_kind:{spec.kind}")
 
@@ -91,6 +192,22 @@ class LocalExecutor:
         for k in spec.env_allowlist:
             if k in os.environ:
                 env[k] = os.environ[k]
+        return env
+
+    def run(self, spec: ExecutionSpec, *, capture_dir: Optional[Path] = None) -> ExecutionResult:
+        """
+        Run spec to completion. With capture_dir, stdout/stderr are streamed to
+        capture_dir/stdout.txt and stderr.txt and hashed as they arrive instead of
+        being buffered; the bytes written are exactly what would have been returned.
+        """
+        env = self._prepare(spec)
+        if capture_dir is not None:
+            out, err = _sinks(capture_dir)
+            try:
+                return _result(self._run_streaming(spec, env, out, err), out, err)
+            finally:
+                out.close()
+                err.close()
 
         try:
             completed = subprocess.run(
@@ -112,4 +229,105 @@ class LocalExecutor:
             exit_code=completed.returncode,
             stdout=completed.stdout,
             stderr=completed.stderr,
-        )
\ No newline at end of file
+        )
+
+    def _run_streaming(self, spec: ExecutionSpec, env: Dict[str, str], out: _Sink, err: _Sink) -> int:
+        proc = subprocess.Popen(spec.cmd_argv, cwd=spec.cwd, env=env, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        deadline = time.monotonic() + spec.timeout_s
+        try:
+            with selectors.DefaultSelector() as sel:
+                sel.register(proc.stdout, selectors.EVENT_READ, out)
+                sel.register(proc.stderr, selectors.EVENT_READ, err)
+                while sel.get_map():
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        return 124  # Deterministic timeout failure
+                    for key, _ in sel.select(remaining):
+                        chunk = os.read(key.fd, _CHUNK)
+                        if chunk:
+                            key.data.write(chunk)
+                        else:
+                            sel.unregister(key.fileobj)
+            try:
+                return proc.wait(timeout=max(0.0, deadline - time.monotonic()))
+            except subprocess.TimeoutExpired:
+                return 124
+        finally:
+            if proc.returncode is None:
+                proc.kill()
+                proc.wait()
+            for pipe in (proc.stdout, proc.stderr):
+                if pipe is not None:
+                    pipe.close()
+
+
+async def _drain(stream: asyncio.StreamReader, sink: _Sink) -> None:
+    loop = asyncio.get_running_loop()
+    while True:
+        chunk = await stream.read(_CHUNK)
+        if not chunk:
+            return
+        if sink.path is None:
+            sink.write(chunk)
+        else:
+            # File writes (and hashing) run off the event loop, one chunk at a time.
+            await loop.run_in_executor(None, sink.write, chunk)
+
+
+class AsyncLocalExecutor(LocalExecutor):
+    """
+    LocalExecutor on asyncio subprocesses: one event loop supervises many children
+    instead of one blocked thread per execution.
+
+    run_async() applies the same preflight and environment as run() and keeps its
+    contract: exit code 124 with whatever output was read when timeout_s elapses,
+    byte-for-byte stdout/stderr otherwise. The child is killed if the coroutine is
+    cancelled (together with its process group). capture_dir streams output to files
+    exactly as run() does; preflight, file opens and capture writes run on the loop's
+    default executor so the loop itself never blocks on disk. The blocking run() is
+    inherited unchanged.
+    """
+
+    async def run_async(self, spec: ExecutionSpec, *, capture_dir: Optional[Path] = None) -> ExecutionResult:
+        loop = asyncio.get_running_loop()
+        # Preflight resolves paths on disk and the sinks open files: keep both off the loop.
+        env = await loop.run_in_executor(None, self._prepare, spec)
+        out, err = await loop.run_in_executor(None, _sinks, capture_dir)
+        try:
+            code = await self._run_async(spec, env, out, err)
+            return await loop.run_in_executor(None, _result, code, out, err)
+        finally:
+            out.close()
+            err.close()
+
+    async def _run_async(self, spec: ExecutionSpec, env: Dict[str, str], out: _Sink, err: _Sink) -> int:
+        # Own session, so a timeout or cancel can kill the whole process group: a
+        # grandchild that inherited the pipes would otherwise keep wait() blocked.
+        proc = await asyncio.create_subprocess_exec(
+            *spec.cmd_argv,
+            cwd=spec.cwd,
+            env=env,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            start_new_session=True,
+        )
+        finished = False
+        try:
+            # Like subprocess.run, the timeout covers reading both pipes to EOF and the exit.
+            await asyncio.wait_for(
+                asyncio.gather(_drain(proc.stdout, out), _drain(proc.stderr, err), proc.wait()),
+                timeout=spec.timeout_s,
+            )
+            finished = True
+        except asyncio.TimeoutError:
+            # Deterministic timeout failure
+            return 124
+        finally:
+            if not finished:
+                try:
+                    os.killpg(proc.pid, signal.SIGKILL)
+                except ProcessLookupError:
+                    pass
+                await proc.wait()
+
+        return int(proc.returncode)
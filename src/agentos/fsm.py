@@ -13,12 +13,16 @@ Important:
 
 from __future__ import annotations
 
+import copy
+import threading
+from collections import OrderedDict
 from dataclasses import dataclass
 from enum import Enum
 from hashlib import sha256
-from typing import Any, Dict, Iterable, List, Mapping, Sequence, Tuple
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
 import json
 
+from agentos.event import Event
 from agentos.task import TaskState
 
 
@@ -58,6 +62,22 @@ _TERMINAL: Tuple[TaskState, ...] = (
 )
 
 
+def next_state(state: TaskState, event_type: str) -> Optional[TaskState]:
+    """
+    Pure transition lookup for derived views (indexes, sidecars).
+
+    Returns None when the event type is unknown, the transition is illegal, or state is
+    terminal. Authoritative replay must still go through TaskFSM.apply (fail-closed).
+    """
+    if state in _TERMINAL:
+        return None
+    try:
+        et = EventType(str(event_type))
+    except ValueError:
+        return None
+    return _ALLOWED.get((state, et))
+
+
 def _canonical_json(obj: Any) -> str:
     return json.dumps(obj, sort_keys=True, separators=(",", ":"), ensure_ascii=False, allow_nan=False)
 
@@ -114,7 +134,7 @@ class TaskFSM:
             raise ValueError("task_id must be a non-empty string")
         self.task_id = task_id
         self.state: TaskState = initial_state
-        self.history: List[Dict[str, Any]] = []
+        self.history: List[Mapping[str, Any]] = []
 
     def apply(self, event: Mapping[str, Any]) -> TaskState:
         if event.get("task_id") != self.task_id:
@@ -145,7 +165,8 @@ class TaskFSM:
                 reason=f"illegal transition: {self.state.value} --{et.value}--> ?",
             )
 
-        self.history.append(dict(event))
+        # Event records are immutable and shared as-is; plain mappings are copied.
+        self.history.append(event if isinstance(event, Event) else dict(event))
         self.state = nxt
         return self.state
 
@@ -186,7 +207,167 @@ class TaskFSM:
         raise FSMViolationError(violation)
 
 
-def rebuild_task_state(store: Any, task_id: str) -> Dict[str, Any]:
+# Write a new checkpoint once a rebuild had to replay at least this many events.
+CHECKPOINT_EVERY = 64
+
+_CHECKPOINT_KEYS: Tuple[str, ...] = ("task_id", "state", "seq", "sha256")
+
+
+def make_checkpoint(task_id: str, state: TaskState, seq: int, sha256_: str) -> Dict[str, Any]:
+    """
+    Hash-anchored FSM checkpoint: derived state after applying events 0..seq, anchored
+    to the sha256 of event seq, sealed with its own checkpoint_sha256.
+    """
+    core = {"task_id": task_id, "state": state.value, "seq": int(seq), "sha256": sha256_}
+    out = dict(core)
+    out["checkpoint_sha256"] = _hash_evidence(core)
+    return out
+
+
+def verify_checkpoint(store: Any, task_id: str, checkpoint: Mapping[str, Any]) -> bool:
+    """
+    A checkpoint is valid only if it is self-consistent and its anchor sha256 is the
+    recomputed hash of the stored event at checkpoint seq.
+    """
+    from agentos.store_fs import verify_event_chain
+
+    try:
+        core = {k: checkpoint[k] for k in _CHECKPOINT_KEYS}
+        if checkpoint.get("checkpoint_sha256") != _hash_evidence(core):
+            return False
+        if core["task_id"] != task_id or not isinstance(core["seq"], int) or core["seq"] < 0:
+            return False
+        TaskState(str(core["state"]))
+        anchor = store.read_event(task_id, core["seq"])
+    except Exception:
+        return False
+    if anchor.get("seq") != core["seq"] or anchor.get("sha256") != core["sha256"]:
+        return False
+    return verify_event_chain([anchor], anchor_sha256=anchor.get("prev_sha256"))
+
+
+def _replay_from_checkpoint(store: Any, task_id: str) -> Optional[Tuple[TaskFSM, List[Mapping[str, Any]]]]:
+    """
+    Start from the store's checkpoint and return (fsm, tail) when the tail chains onto
+    the anchor. Any doubt returns None so the caller falls back to full replay.
+    """
+    if not (hasattr(store, "load_checkpoint") and hasattr(store, "iter_task_events")):
+        return None
+    cp = store.load_checkpoint(task_id)
+    if cp is None or not verify_checkpoint(store, task_id, cp):
+        return None
+    from agentos.store_fs import verify_event_chain
+
+    tail = list(store.iter_task_events(task_id, from_seq=int(cp["seq"]) + 1))
+    if not verify_event_chain(tail, anchor_sha256=str(cp["sha256"])):
+        return None
+    fsm = TaskFSM(task_id=task_id, initial_state=TaskState(str(cp["state"])))
+    return fsm, tail
+
+
+def _resume_from_sidecar(store: Any, task_id: str) -> Optional[TaskFSM]:
+    """
+    An FSM at HEAD from the store's state sidecar, or None unless the sidecar is
+    anchored on the current tail event (same seq, recomputed sha256).
+    """
+    if not (hasattr(store, "load_state_sidecar") and hasattr(store, "count_events")):
+        return None
+    sc = store.load_state_sidecar(task_id)
+    if sc is None or sc.get("seq") != store.count_events(task_id) - 1:
+        return None
+    if not verify_checkpoint(store, task_id, sc):
+        return None
+    return TaskFSM(task_id=task_id, initial_state=TaskState(str(sc["state"])))
+
+
+def _detached(event: Mapping[str, Any]) -> Mapping[str, Any]:
+    # Event records are immutable and safe to share; anything else is copied.
+    return event if isinstance(event, Event) else copy.deepcopy(event)
+
+
+class SnapshotCache:
+    """
+    Bounded, thread-safe LRU of rebuild_task_state snapshots keyed by
+    (task_id, tail seq, tail sha256).
+
+    The tail sha256 commits to the whole chain, so a key maps to exactly one state and
+    no explicit invalidation is needed: an append moves the tail and the next lookup
+    misses. Hits hand out a fresh snapshot dict and events list. Immutable
+    agentos.event.Event records are shared; plain dict events (MemStore.list_events,
+    SQLite) are deep-copied on put and on every hit, so a caller that mutates one
+    cannot corrupt the cache.
+    """
+
+    def __init__(self, maxsize: int = 256) -> None:
+        self.maxsize = int(maxsize)
+        self._entries: "OrderedDict[Tuple[str, int, str], Tuple[str, Tuple[Mapping[str, Any], ...]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Tuple[str, int, str]) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            hit = self._entries.get(key)
+            if hit is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        state, events = hit
+        return {"task_id": key[0], "state": state, "events": [_detached(ev) for ev in events]}
+
+    def put(self, key: Tuple[str, int, str], snapshot: Mapping[str, Any]) -> None:
+        if self.maxsize <= 0:
+            return
+        entry = (str(snapshot["state"]), tuple(_detached(ev) for ev in snapshot["events"]))
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+# Process-wide cache used by rebuild_task_state(cache=True).
+SNAPSHOT_CACHE = SnapshotCache()
+
+
+def _tail_key(store: Any, task_id: str) -> Optional[Tuple[str, int, str]]:
+    """
+    (task_id, seq, sha256) of the current tail event, or None if the store cannot say
+    cheaply or the tail's stored sha256 is not the recomputed hash of its content.
+    """
+    if not (hasattr(store, "count_events") and hasattr(store, "read_event")):
+        return None
+    from agentos.store_fs import verify_event_chain
+
+    seq = store.count_events(task_id) - 1
+    if seq < 0:
+        return None
+    try:
+        tail = store.read_event(task_id, seq)
+    except Exception:
+        return None
+    if tail.get("seq") != seq or not verify_event_chain([tail], anchor_sha256=tail.get("prev_sha256")):
+        return None
+    return (task_id, seq, str(tail["sha256"]))
+
+
+def rebuild_task_state(
+    store: Any,
+    task_id: str,
+    *,
+    checkpoint_every: int = CHECKPOINT_EVERY,
+    cache: bool = True,
+    persist: bool = False,
+) -> Dict[str, Any]:
     """
     Rebuild task state from append-only store events.
 
@@ -198,19 +379,61 @@ def rebuild_task_state(store: Any, task_id: str) -> Dict[str, Any]:
       - store.load_task_events(task_id) -> Sequence[Mapping]
         OR
       - store.list_events(task_id) -> Sequence[Mapping]
+
+    Checkpoints (optional; store.load_checkpoint/write_checkpoint/read_event):
+      Replay starts at a verified checkpoint and applies only the tail; "events" in the
+      returned snapshot then holds just the tail. Stores that yield agentos.event.Event
+      records are replayed without copying or decoding event bodies. With persist=True
+      (writers about to append, e.g. routing and running), replaying checkpoint_every or
+      more events also writes a fresh checkpoint anchored at the last event; read-only
+      callers leave the store untouched.
+
+    State sidecar (optional; store.load_state_sidecar/write_state_sidecar/count_events):
+      A sidecar anchored on the current tail event answers without replay ("events" is
+      then empty). Otherwise replay proceeds as above and, with persist=True, the
+      sidecar is rewritten at the replayed tail.
+
+    Snapshot cache (cache=True; store.count_events/read_event):
+      Replayed snapshots are memoized in SNAPSHOT_CACHE under the tail (seq, sha256),
+      which is re-read and re-hashed on every call. A snapshot is stored only if the
+      replay ended exactly at that tail, so a concurrent append cannot poison it.
     """
-    if hasattr(store, "iter_task_events"):
-        events = list(store.iter_task_events(task_id))
-    elif hasattr(store, "read_task_events"):
-        events = list(store.read_task_events(task_id))
-    elif hasattr(store, "load_task_events"):
-        events = list(store.load_task_events(task_id))
-    elif hasattr(store, "list_events"):
-        events = list(store.list_events(task_id))
+    at_head = _resume_from_sidecar(store, task_id)
+    if at_head is not None:
+        return at_head.snapshot()
+
+    key = _tail_key(store, task_id) if cache else None
+    if key is not None:
+        hit = SNAPSHOT_CACHE.get(key)
+        if hit is not None:
+            return hit
+
+    resumed = _replay_from_checkpoint(store, task_id)
+    if resumed is not None:
+        fsm, events = resumed
     else:
-        raise TypeError("store does not expose iter_task_events/read_task_events/load_task_events/list_events")
-
-    fsm = TaskFSM(task_id=task_id)
-    events_sorted = sorted([dict(e) for e in events], key=lambda e: _event_key(e, 0))
+        if hasattr(store, "iter_task_events"):
+            events = list(store.iter_task_events(task_id))
+        elif hasattr(store, "read_task_events"):
+            events = list(store.read_task_events(task_id))
+        elif hasattr(store, "load_task_events"):
+            events = list(store.load_task_events(task_id))
+        elif hasattr(store, "list_events"):
+            events = list(store.list_events(task_id))
+        else:
+            raise TypeError("store does not expose iter_task_events/read_task_events/load_task_events/list_events")
+        fsm = TaskFSM(task_id=task_id)
+
+    events_sorted = sorted(events, key=lambda e: _event_key(e, 0))
     fsm.replay(events_sorted)
-    return fsm.snapshot()
+
+    last = max(events_sorted, key=lambda e: int(e.get("seq", -1))) if events_sorted else None
+    if last is not None and isinstance(last.get("seq"), int) and isinstance(last.get("sha256"), str):
+        if persist and len(events_sorted) >= checkpoint_every and hasattr(store, "write_checkpoint"):
+            store.write_checkpoint(task_id, make_checkpoint(task_id, fsm.state, last["seq"], last["sha256"]))
+        if persist and hasattr(store, "write_state_sidecar"):
+            store.write_state_sidecar(task_id, make_checkpoint(task_id, fsm.state, last["seq"], last["sha256"]))
+    snap = fsm.snapshot()
+    if key is not None and last is not None and (last.get("seq"), last.get("sha256")) == key[1:]:
+        SNAPSHOT_CACHE.put(key, snap)
+    return snap
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import json
+import os
+import re
+from pathlib import Path
+from typing import Iterator, Optional, Tuple
+
+from agentos.canonical import canonical_json, sha256_hex
+
+FLAT = "flat"
+SHARDED = "sharded"
+LAYOUTS: Tuple[str, ...] = (FLAT, SHARDED)
+
+# Marker recording the layout new entries are written in; readers resolve both.
+LAYOUT_FILE = "LAYOUT"
+
+_SHARD_RE = re.compile(r"[0-9a-f]{2}")
+
+
+def shard_parts(key: str) -> Tuple[str, str]:
+    """
+    Two-level shard for key: the first two byte pairs of sha256(key), e.g. ("ab", "cd").
+    """
+    h = sha256_hex(key.encode("utf-8"))
+    return h[0:2], h[2:4]
+
+
+def sharded_path(base: Path, key: str) -> Path:
+    a, b = shard_parts(key)
+    return base / a / b / key
+
+
+def load_layout(root: Path) -> str:
+    """
+    Layout recorded at root (FLAT when unmarked, i.e. every pre-existing tree).
+    """
+    try:
+        obj = json.loads((root / LAYOUT_FILE).read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return FLAT
+    layout = obj.get("layout") if isinstance(obj, dict) else None
+    if layout not in LAYOUTS:
+        raise RuntimeError(f"unknown_layout:{root / LAYOUT_FILE}:{layout!r}")
+    return str(layout)
+
+
+def save_layout(root: Path, layout: str) -> None:
+    if layout not in LAYOUTS:
+        raise ValueError(f"unknown layout: {layout!r}")
+    root.mkdir(parents=True, exist_ok=True)
+    tmp = root / f"{LAYOUT_FILE}.tmp"
+    tmp.write_text(canonical_json({"layout": layout}), encoding="utf-8")
+    os.replace(tmp, root / LAYOUT_FILE)
+
+
+def resolve_layout(root: Path, layout: Optional[str]) -> str:
+    """
+    Use an explicit layout (recording it when root is unmarked) or the recorded one.
+    """
+    if layout is None:
+        return load_layout(root)
+    if layout not in LAYOUTS:
+        raise ValueError(f"unknown layout: {layout!r}")
+    if layout == SHARDED and not (root / LAYOUT_FILE).exists():
+        save_layout(root, layout)
+    return layout
+
+
+def resolve_dir(base: Path, key: str, layout: str) -> Path:
+    """
+    Directory for key under base: wherever it already exists (either layout), else
+    where the preferred layout would create it.
+    """
+    flat = base / key
+    sharded = sharded_path(base, key)
+    preferred, other = (sharded, flat) if layout == SHARDED else (flat, sharded)
+    if preferred.is_dir():
+        return preferred
+    if other.is_dir():
+        return other
+    return preferred
+
+
+def is_shard_dir(p: Path) -> bool:
+    return bool(_SHARD_RE.fullmatch(p.name)) and p.is_dir()
+
+
+def iter_keyed_dirs(base: Path) -> Iterator[Tuple[str, Path]]:
+    """
+    Yield (key, dir) for every entry under base in either layout, sorted by key.
+
+    A two-hex-char directory is a shard level only if it holds entries whose key
+    hashes into it; anything else is a flat entry.
+    """
+    if not base.is_dir():
+        return
+    found = {}
+    for p in base.iterdir():
+        if not p.is_dir():
+            continue
+        sharded_here = False
+        if is_shard_dir(p):
+            for q in p.iterdir():
+                if not is_shard_dir(q):
+                    continue
+                for r in q.iterdir():
+                    if r.is_dir() and shard_parts(r.name) == (p.name, q.name):
+                        found.setdefault(r.name, r)
+                        sharded_here = True
+        if not sharded_here:
+            found.setdefault(p.name, p)
+    for key in sorted(found):
+        yield key, found[key]
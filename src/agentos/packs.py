@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import lzma
+import os
+import sqlite3
+import threading
+import uuid
+import zlib
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from agentos.canonical import sha256_hex
+from agentos.durability import Durability, DurabilityMode
+
+CODECS: Dict[str, Tuple[Callable[[bytes], bytes], Callable[[bytes], bytes]]] = {
+    "lzma": (lzma.compress, lzma.decompress),
+    "zlib": (lambda b: zlib.compress(b, 9), zlib.decompress),
+}
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS entries (
+        key TEXT PRIMARY KEY,
+        pack TEXT NOT NULL,
+        offset INTEGER NOT NULL,
+        length INTEGER NOT NULL,
+        codec TEXT NOT NULL,
+        size INTEGER NOT NULL,
+        sha256 TEXT NOT NULL
+    ) WITHOUT ROWID
+    """,
+)
+
+CATALOG = "catalog.sqlite3"
+
+
+class PackStore:
+    """
+    Read-only compressed pack files with a random-access catalog.
+
+    Layout:
+      <dir>/pack-<id>.pack     -> concatenated, individually compressed entries
+      <dir>/catalog.sqlite3    -> entries(key PK, pack, offset, length, codec, size, sha256)
+
+    Each entry is compressed on its own, so get(key) reads and inflates one entry.
+    A pack is fsynced before its catalog rows commit, and the catalog commit is the
+    point at which entries become visible. sha256 is of the uncompressed bytes and is
+    re-checked on every read (fail-closed).
+    """
+
+    def __init__(self, dir: Path) -> None:
+        self.dir = Path(dir)
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.dir / CATALOG), isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # Loose originals are deleted once rows commit, so the catalog must be durable.
+        self._conn.execute("PRAGMA synchronous=FULL")
+        self._conn.execute("PRAGMA busy_timeout=30000")
+        for stmt in _SCHEMA:
+            self._conn.execute(stmt)
+
+    @classmethod
+    def open_existing(cls, dir: Path) -> Optional["PackStore"]:
+        """
+        Open the pack store at dir, or None if nothing was ever archived there.
+        """
+        if not (Path(dir) / CATALOG).exists():
+            return None
+        return cls(dir)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def write_pack(self, entries: Iterable[Tuple[str, bytes]], *, codec: str = "lzma") -> Optional[str]:
+        """
+        Write entries into one new pack and publish them. Returns the pack name, or
+        None if there were no entries.
+
+        entries is consumed once, in order, and each entry is compressed and written
+        before the next is pulled, so a generator keeps one entry in memory at a time.
+        Fail-closed: a key that is already cataloged aborts the whole pack.
+        """
+        if codec not in CODECS:
+            raise ValueError(f"unknown codec: {codec!r}")
+        compress = CODECS[codec][0]
+        name = f"pack-{uuid.uuid4().hex}.pack"
+        path = self.dir / name
+        tmp = self.dir / f"{name}.tmp"
+        rows = []
+        offset = 0
+        try:
+            with open(tmp, "wb") as fh:
+                for key, data in entries:
+                    blob = compress(data)
+                    fh.write(blob)
+                    rows.append((key, name, offset, len(blob), codec, len(data), sha256_hex(data)))
+                    offset += len(blob)
+        except BaseException:
+            tmp.unlink()
+            raise
+        if not rows:
+            tmp.unlink()
+            return None
+        os.replace(tmp, path)
+        Durability(DurabilityMode.FSYNC).commit(files=[path], dirs=[self.dir])
+
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.executemany(
+                    "INSERT INTO entries (key, pack, offset, length, codec, size, sha256) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    rows,
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                path.unlink()
+                raise
+        return name
+
+    def _row(self, key: str) -> Optional[Tuple[str, int, int, str, int, str]]:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT pack, offset, length, codec, size, sha256 FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+
+    def has(self, key: str) -> bool:
+        return self._row(key) is not None
+
+    def get(self, key: str) -> bytes:
+        row = self._row(key)
+        if row is None:
+            raise FileNotFoundError(f"{self.dir}#{key}")
+        pack, offset, length, codec, size, sha = row
+        with open(self.dir / pack, "rb") as fh:
+            fh.seek(offset)
+            blob = fh.read(length)
+        try:
+            data = CODECS[codec][1](blob)
+        except Exception:
+            data = b""
+        if len(data) != size or sha256_hex(data) != sha:
+            raise RuntimeError(f"pack_entry_corrupt:{self.dir / pack}#{key}")
+        return data
+
+    def keys(self, prefix: str = "") -> List[str]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key FROM entries WHERE key >= ? AND key < ? ORDER BY key", (prefix, prefix + "\U0010ffff")
+            ).fetchall()
+        return [r[0] for r in rows]
+
+    def has_prefix(self, prefix: str) -> bool:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM entries WHERE key >= ? AND key < ? LIMIT 1", (prefix, prefix + "\U0010ffff")
+            ).fetchone()
+        return row is not None
+
+
+def pack_task_files(root: Path) -> Iterator[Tuple[str, bytes]]:
+    """
+    Yield (relative path, bytes) for every file under root, sorted by path; each file
+    is read only when its entry is pulled.
+
+    Empty directories (e.g. a bundle's outputs/) are kept as "<rel>/" with no bytes so
+    an extracted tree has the same shape as the original.
+    """
+    for p in sorted(root.rglob("*")):
+        if p.is_file():
+            yield p.relative_to(root).as_posix(), p.read_bytes()
+        elif p.is_dir() and not any(p.iterdir()):
+            yield p.relative_to(root).as_posix() + "/", b""
@@ -3,7 +3,8 @@ from __future__ import annotations
 import json
 import re
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
+from agentos.blobs import payload_fields
 from agentos.evidence import EvidenceBundle
 from agentos.canonical import sha256_hex, canonical_json
 from agentos.policy import decide
@@ -89,22 +90,28 @@ def verify_plan(steps: List[Step], evidence_root: str | None = None) -> Pipeline
         verification_manifest_sha256=bundle["manifest_sha256"]
     )
 
+def _append_decision(
+    store: FSStore, task_id: str, created: Optional[dict], type_: str, body: dict
+) -> Tuple[Optional[EventRef], EventRef]:
+    # TASK_CREATED (first verification only) and the decision commit as one batch.
+    if created is None:
+        return None, store.append_events(task_id, [(type_, body)])[0]
+    created_ref, decision_ref = store.append_events(task_id, [('TASK_CREATED', created), (type_, body)])
+    return created_ref, decision_ref
+
 def verify_task(store: FSStore, task: Task) -> TaskVerifyResult:
     created_ref: Optional[EventRef] = None
     decision_ref: Optional[EventRef] = None
 
-    prior = store.list_events(task.task_id)
-    if len(prior) == 0:
-        created_ref = store.append_event(
-            task.task_id,
-            'TASK_CREATED',
-            {
-                'role': task.role,
-                'action': task.action,
-                'payload': task.payload,
-                'attempt': task.attempt,
-            },
-        )
+    created: Optional[dict] = None
+    if store.count_events(task.task_id) == 0:
+        created = {
+            'role': task.role,
+            'action': task.action,
+            # Large payloads are stored once as a blob and referenced by digest.
+            **payload_fields(store, task.payload),
+            'attempt': task.attempt,
+        }
 
     d = decide(task.role, task.action)
 
@@ -118,8 +125,10 @@ def verify_task(store: FSStore, task: Task) -> TaskVerifyResult:
             reason='task_verification',
             idempotency_key=None,
         )
-        decision_ref = store.append_event(
+        created_ref, decision_ref = _append_decision(
+            store,
             task.task_id,
+            created,
             'TASK_REJECTED',
             {
                 'role': task.role,
@@ -152,8 +161,10 @@ def verify_task(store: FSStore, task: Task) -> TaskVerifyResult:
     )
 
     if d.allow:
-        decision_ref = store.append_event(
+        created_ref, decision_ref = _append_decision(
+            store,
             task.task_id,
+            created,
             'TASK_VERIFIED',
             {
                 'role': task.role,
@@ -173,8 +184,10 @@ def verify_task(store: FSStore, task: Task) -> TaskVerifyResult:
             verification_manifest_sha256=bundle['manifest_sha256'],
         )
 
-    decision_ref = store.append_event(
+    created_ref, decision_ref = _append_decision(
+        store,
         task.task_id,
+        created,
         'TASK_REJECTED',
         {
             'role': task.role,
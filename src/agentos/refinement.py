@@ -5,6 +5,7 @@ from pathlib import Path
 from typing import Any, Dict
 
 from agentos.adapter_role_contract_checker import contract_sha256
+from agentos.blobs import resolve_payload
 from agentos.canonical import canonical_json, sha256_hex
 from agentos.evidence import EvidenceBundle
 from agentos.pipeline import verify_task
@@ -13,42 +14,36 @@ from agentos.task import Task, TaskState
 
 
 def _latest_task_evaluated_event(store: FSStore, task_id: str) -> Dict[str, Any]:
-    events = list(store.list_events(task_id))
-    for e in reversed(events):
+    for e in store.iter_task_events(task_id, reverse=True, types=("TASK_EVALUATED",)):
         if str(e.get("type")) == "TASK_EVALUATED":
             return dict(e)
     raise RuntimeError("no_task_evaluated_event")
 
 
 def _load_created_event(store: FSStore, task_id: str) -> Dict[str, Any]:
-    events = list(store.list_events(task_id))
-    for e in events:
+    for e in store.iter_task_events(task_id, types=("TASK_CREATED",)):
         if str(e.get("type")) == "TASK_CREATED":
             return dict(e)
     raise RuntimeError("missing_task_created_event")
 
 
 def _load_verified_event(store: FSStore, task_id: str) -> Dict[str, Any]:
-    events = list(store.list_events(task_id))
-    for e in reversed(events):
+    for e in store.iter_task_events(task_id, reverse=True, types=("TASK_VERIFIED",)):
         if str(e.get("type")) == "TASK_VERIFIED":
             return dict(e)
     raise RuntimeError("missing_task_verified_event")
 
 
 def _latest_run_succeeded_event(store: FSStore, task_id: str) -> Dict[str, Any]:
-    events = list(store.list_events(task_id))
-    for e in reversed(events):
+    for e in store.iter_task_events(task_id, reverse=True, types=("RUN_SUCCEEDED",)):
         if str(e.get("type")) == "RUN_SUCCEEDED":
             return dict(e)
     raise RuntimeError("no_run_succeeded_event")
 
 
 def _load_run_summary(evidence_root: str, task_id: str, exec_id: str) -> Dict[str, Any]:
-    p = Path(evidence_root) / task_id / exec_id / "run_summary.json"
-    if not p.exists():
-        raise FileNotFoundError(str(p))
-    return json.loads(p.read_text(encoding="utf-8"))
+    raw = EvidenceBundle(root=evidence_root).read_bundle_file(task_id, exec_id, "run_summary.json")
+    return json.loads(raw.decode("utf-8"))
 
 
 def _refinement_depth(task_id: str) -> int:
@@ -84,13 +79,11 @@ def create_refinement_task_from_parent(
     # Prevent duplicate refinement with identical note hash
     note_hash = sha256_hex(note.strip().encode("utf-8"))
     prefix = f"refine::{parent_task_id}::"
-    for entry in store.root.joinpath("events").glob(f"{prefix}*"):
-        rid = entry.name
-        events = store.list_events(rid)
-        for ev2 in events:
+    for rid in (t for t in store.list_tasks() if t.startswith(prefix)):
+        for ev2 in store.iter_task_events(rid, types=("TASK_CREATED",)):
             if str(ev2.get("type")) == "TASK_CREATED":
                 body2 = dict(ev2.get("body") or {})
-                payload2 = body2.get("payload") or {}
+                payload2 = resolve_payload(store, body2) or {}
                 if payload2.get("lineage_refinement_note_sha256") == note_hash:
                     raise RuntimeError("duplicate_refinement_note")
     if refinement_task_id != expected:
@@ -106,7 +99,7 @@ def create_refinement_task_from_parent(
     created_body = dict(created_ev.get("body") or {})
     role = created_body.get("role")
     action = created_body.get("action")
-    payload = created_body.get("payload")
+    payload = resolve_payload(store, created_body)
 
     if not isinstance(role, str) or not role:
         raise RuntimeError("parent_created_missing_role")
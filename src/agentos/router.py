@@ -27,10 +27,11 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 
-from agentos.fsm import FSMViolationError, rebuild_task_state
+from agentos.fsm import FSMViolationError
 from agentos.policy import decide
 from agentos.store_fs import FSStore
 from agentos.task import Task, TaskState
+from agentos.task_context import TaskContext
 
 
 @dataclass(frozen=True)
@@ -57,10 +58,11 @@ class ExecutionRouter:
         self.store = store
 
     def route(self, task: Task) -> RouteResult:
-        # Authoritative state is derived from append-only history (fail-closed).
+        # Authoritative state is derived from append-only history (fail-closed); the
+        # same single scan also supplies the verified inputs manifest below.
         try:
-            snap = rebuild_task_state(self.store, task.task_id)
-            derived_state = TaskState(str(snap["state"]))
+            ctx = TaskContext.load(self.store, task.task_id)
+            derived_state = ctx.state
         except FSMViolationError as e:
             # Fail-closed: surface deterministic violation hash as reason.
             return RouteResult(
@@ -109,9 +111,6 @@ class ExecutionRouter:
             )
 
         # Authorized: emit dispatch event
-        # Load verified inputs manifest for audit continuity
-        from agentos.runner import TaskRunner
-
         # Refinement task checks (lineage enforcement)
         from agentos.refinement import _refinement_depth
         # Enforce maximum refinement depth
@@ -126,7 +125,8 @@ class ExecutionRouter:
                 action=task.action,
             )
 
-        verified_ims = TaskRunner(self.store)._load_verified_inputs_manifest_sha256(task.task_id)
+        # Load verified inputs manifest for audit continuity
+        verified_ims = ctx.verified_inputs_manifest_sha256()
 
         self.store.append_event(
             task.task_id,
@@ -1,16 +1,21 @@
 from __future__ import annotations
 
+import asyncio
+import copy
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Any, Dict, Mapping, Optional
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
 
+from agentos.blobs import resolve_payload
 from agentos.canonical import sha256_hex
 from agentos.evidence import EvidenceBundle
 from agentos.execution import ExecutionSpec, canonical_inputs_manifest
 from agentos.outcome import ExecutionOutcome
-from agentos.executor import LocalExecutor
-from agentos.fsm import rebuild_task_state
+from agentos.executor import AsyncLocalExecutor, ExecutionResult, LocalExecutor
 from agentos.run_events import RunEventWriter
 from agentos.store_fs import FSStore
+from agentos.task_context import TaskContext
 from agentos.task import TaskState
 
 
@@ -41,6 +46,39 @@ class RunSummary:
         }
 
 
+@dataclass(frozen=True)
+class RunManyReport:
+    """
+    Outcome of TaskRunner.run_many (or run_many_async), in input order.
+
+    summaries[i] is the RunSummary for task_ids[i], or None if run_dispatched raised
+    (a rejection such as invalid_state or duplicate_execution); errors[i] then holds
+    "<ExceptionClass>:<message>". Rejection evidence is written exactly as for a
+    serial call.
+    """
+
+    task_ids: Tuple[str, ...]
+    summaries: Tuple[Optional[RunSummary], ...]
+    errors: Tuple[Optional[str], ...]
+    task_s: Tuple[float, ...]
+    wall_s: float
+    max_workers: int
+
+    def to_obj(self) -> Dict[str, Any]:
+        busy = sum(self.task_s)
+        return {
+            "n": len(self.task_ids),
+            "ok": sum(1 for s in self.summaries if s is not None and s.ok),
+            "failed": sum(1 for s in self.summaries if s is not None and not s.ok),
+            "errors": sum(1 for e in self.errors if e is not None),
+            "max_workers": int(self.max_workers),
+            "wall_s": round(self.wall_s, 6),
+            "task_s_total": round(busy, 6),
+            "task_s_max": round(max(self.task_s, default=0.0), 6),
+            "parallelism": round(busy / self.wall_s, 3) if self.wall_s > 0 else 0.0,
+        }
+
+
 class TaskRunner:
     """
     Deterministic runner for DISPATCHED tasks.
@@ -58,6 +96,7 @@ class TaskRunner:
     def __init__(self, store: FSStore, *, evidence_root: str = "evidence") -> None:
         self.store = store
         self.executor = LocalExecutor()
+        self.async_executor = AsyncLocalExecutor()
         self.events = RunEventWriter(store)
         er = evidence_root
         try:
@@ -66,49 +105,49 @@ class TaskRunner:
                 er = str(_P(str(getattr(store, "root"))) / er)
         except Exception:
             pass
-        self.evidence = EvidenceBundle(er)
-
-    def _load_created_payload(self, task_id: str) -> Dict[str, Any]:
-        evs = list(self.store.list_events(task_id))
-        for ev in evs:
-            if str(ev.get("type")) == "TASK_CREATED":
-                body = ev.get("body")
-                if not isinstance(body, dict):
-                    raise TypeError("TASK_CREATED body must be an object")
-                payload = body.get("payload")
-                if not isinstance(payload, dict):
-                    raise TypeError("TASK_CREATED body.payload must be an object")
-                return dict(payload)
-        raise RuntimeError("missing TASK_CREATED event")
-
-    def _load_created_role_action(self, task_id: str) -> tuple[str, str]:
-        evs = list(self.store.list_events(task_id))
-        for ev in evs:
-            if str(ev.get("type")) == "TASK_CREATED":
-                body = ev.get("body")
-                if not isinstance(body, dict):
-                    raise TypeError("TASK_CREATED body must be an object")
-                role = body.get("role")
-                action = body.get("action")
-                if not isinstance(role, str) or not role:
-                    raise TypeError("TASK_CREATED body.role must be a non-empty string")
-                if not isinstance(action, str) or not action:
-                    raise TypeError("TASK_CREATED body.action must be a non-empty string")
-                return role, action
-        raise RuntimeError("missing TASK_CREATED event")
-
-    def _load_verified_inputs_manifest_sha256(self, task_id: str) -> str:
-        evs = list(self.store.list_events(task_id))
-        for ev in evs:
-            if str(ev.get("type")) == "TASK_VERIFIED":
-                body = ev.get("body")
-                if not isinstance(body, dict):
-                    raise TypeError("TASK_VERIFIED body must be an object")
-                ims = body.get("inputs_manifest_sha256")
-                if not isinstance(ims, str) or not ims:
-                    raise TypeError("TASK_VERIFIED body.inputs_manifest_sha256 must be a non-empty string")
-                return ims
-        raise RuntimeError("missing TASK_VERIFIED event")
+        # Evidence inherits the store's durability so a run is as durable as its events.
+        self.evidence = EvidenceBundle(er, durability=getattr(store, "durability", None))
+
+    def load_context(self, task_id: str) -> TaskContext:
+        """
+        One event scan for everything a run needs (see agentos.task_context).
+        """
+        return TaskContext.load(self.store, task_id)
+
+    def _context(self, task_id: str, ctx: Optional[TaskContext]) -> TaskContext:
+        return ctx if ctx is not None else self.load_context(task_id)
+
+    def _load_created_payload(self, task_id: str, ctx: Optional[TaskContext] = None) -> Dict[str, Any]:
+        body = self._context(task_id, ctx).body("TASK_CREATED")
+        payload = resolve_payload(self.store, body)
+        if not isinstance(payload, dict):
+            raise TypeError("TASK_CREATED body.payload must be an object")
+        return dict(payload)
+
+    def _load_created_role_action(self, task_id: str, ctx: Optional[TaskContext] = None) -> tuple[str, str]:
+        body = self._context(task_id, ctx).body("TASK_CREATED")
+        role = body.get("role")
+        action = body.get("action")
+        if not isinstance(role, str) or not role:
+            raise TypeError("TASK_CREATED body.role must be a non-empty string")
+        if not isinstance(action, str) or not action:
+            raise TypeError("TASK_CREATED body.action must be a non-empty string")
+        return role, action
+
+    def _load_verified_inputs_manifest_sha256(self, task_id: str, ctx: Optional[TaskContext] = None) -> str:
+        return self._context(task_id, ctx).verified_inputs_manifest_sha256()
+
+    def _spec_for(self, ctx: TaskContext) -> ExecutionSpec:
+        """
+        The ExecutionSpec for a context: the created payload with the VERIFIED inputs
+        manifest substituted (audit-authoritative), validated by _build_spec.
+        """
+        if ctx.spec is not None:
+            return ctx.spec
+        created_payload = self._load_created_payload(ctx.task_id, ctx)
+        role, action = self._load_created_role_action(ctx.task_id, ctx)
+        created_payload["inputs_manifest_sha256"] = self._load_verified_inputs_manifest_sha256(ctx.task_id, ctx)
+        return self._build_spec(task_id=ctx.task_id, role=role, action=action, payload=created_payload)
 
     def _require_str(self, obj: Mapping[str, Any], k: str) -> str:
         v = obj.get(k)
@@ -156,23 +195,103 @@ class TaskRunner:
             note=note,
         )
 
-    def run_dispatched(self, task_id: str) -> RunSummary:
+    def run_many(self, task_ids: Sequence[str], *, max_workers: int = 4) -> RunManyReport:
+        """
+        Run many DISPATCHED tasks concurrently on a bounded thread pool.
+
+        Each task goes through run_dispatched (the idempotent entry point) on its own
+        shallow copy of this runner, so per-run attributes never cross threads while
+        the store, executor, evidence writer and idempotency store stay shared. Per-task
+        event order is kept by the store's task lock, and the idempotency lock still
+        refuses the same spec running twice at once.
+        """
+        if max_workers < 1:
+            raise ValueError("max_workers must be >= 1")
+        ids = [str(t) for t in task_ids]
+        summaries: List[Optional[RunSummary]] = [None] * len(ids)
+        errors: List[Optional[str]] = [None] * len(ids)
+        task_s: List[float] = [0.0] * len(ids)
+
+        def one(i: int) -> None:
+            worker = copy.copy(self)
+            t0 = time.perf_counter()
+            try:
+                summaries[i] = worker.run_dispatched(ids[i])
+            except Exception as e:
+                errors[i] = f"{e.__class__.__name__}:{e}"
+            finally:
+                task_s[i] = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="agentos-run") as pool:
+            for f in [pool.submit(one, i) for i in range(len(ids))]:
+                f.result()
+        return RunManyReport(
+            task_ids=tuple(ids),
+            summaries=tuple(summaries),
+            errors=tuple(errors),
+            task_s=tuple(task_s),
+            wall_s=time.perf_counter() - t0,
+            max_workers=max_workers,
+        )
+
+    async def run_many_async(self, task_ids: Sequence[str], *, max_concurrency: int = 256) -> RunManyReport:
+        """
+        Run many DISPATCHED tasks concurrently on the running event loop.
+
+        Like run_many, but each task goes through run_dispatched_async (the idempotent
+        async entry point) on its own shallow copy of this runner, and at most
+        max_concurrency children are alive at once. No thread is held per child.
+        The report's max_workers is max_concurrency.
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be >= 1")
+        ids = [str(t) for t in task_ids]
+        summaries: List[Optional[RunSummary]] = [None] * len(ids)
+        errors: List[Optional[str]] = [None] * len(ids)
+        task_s: List[float] = [0.0] * len(ids)
+        slots = asyncio.Semaphore(max_concurrency)
+
+        async def one(i: int) -> None:
+            async with slots:
+                worker = copy.copy(self)
+                t0 = time.perf_counter()
+                try:
+                    summaries[i] = await worker.run_dispatched_async(ids[i])
+                except Exception as e:
+                    errors[i] = f"{e.__class__.__name__}:{e}"
+                finally:
+                    task_s[i] = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        await asyncio.gather(*(one(i) for i in range(len(ids))))
+        return RunManyReport(
+            task_ids=tuple(ids),
+            summaries=tuple(summaries),
+            errors=tuple(errors),
+            task_s=tuple(task_s),
+            wall_s=time.perf_counter() - t0,
+            max_workers=max_concurrency,
+        )
+
+    def _preflight(self, task_id: str) -> Tuple[ExecutionSpec, Optional[str]]:
+        """
+        State check and spec build before RUN_STARTED; returns (spec, idempotency key).
+
+        Every reject is auditable: rejection evidence is written before raising.
+        """
         try:
             idem_key = getattr(self, '_current_idempotency_key', None)
-            snap = rebuild_task_state(self.store, task_id)
-            derived_state = TaskState(str(snap["state"]))
+            # Reuse the caller's context (idempotency patch) only if no event landed since.
+            ctx = getattr(self, '_current_task_context', None)
+            if ctx is None or ctx.task_id != task_id or not ctx.is_current(self.store):
+                ctx = self.load_context(task_id)
+            derived_state = ctx.state
             if derived_state is not TaskState.DISPATCHED:
                 self.evidence.write_rejection(task_id, reason=f"invalid_state:{derived_state.value}")
                 raise RuntimeError(f"invalid_state:{derived_state.value}")
 
-            created_payload = self._load_created_payload(task_id)
-            role, action = self._load_created_role_action(task_id)
-
-            verified_ims = self._load_verified_inputs_manifest_sha256(task_id)
-            created_payload = dict(created_payload)
-            created_payload['inputs_manifest_sha256'] = verified_ims
-
-            spec = self._build_spec(task_id=task_id, role=role, action=action, payload=created_payload)
+            spec = self._spec_for(ctx)
 
 
             # Fail-closed: unsupported execution kinds are REJECTED pre-run (auditable)
@@ -190,55 +309,104 @@ class TaskRunner:
                 raise RuntimeError(reason)
             self.evidence.write_rejection(task_id, reason=f"preflight_error:{e.__class__.__name__}:{e}", idempotency_key=idem_key)
             raise
+        return spec, idem_key
+
+    def run_dispatched(self, task_id: str) -> RunSummary:
+        spec, idem_key = self._preflight(task_id)
 
         # Emit RUN_STARTED first (FSM enforces legality)
         self.events.emit_run_started(spec)
 
+        capture_dir = None
+        try:
+            # Output streams into the evidence staging area, never into memory.
+            capture_dir = self.evidence.new_capture_dir(spec.task_id, spec.exec_id)
+            res = self.executor.run(spec, capture_dir=capture_dir)
+        except Exception as e:
+            self.evidence.discard_capture(capture_dir)
+            return self._executor_failure(spec, idem_key, e)
         try:
-            res = self.executor.run(spec)
+            return self._record_result(spec, idem_key, res)
+        finally:
+            self.evidence.discard_capture(capture_dir)
+
+    async def run_dispatched_async(self, task_id: str) -> RunSummary:
+        """
+        run_dispatched with the child supervised by AsyncLocalExecutor.run_async, so
+        one event loop can drive many executions. Preflight, events and evidence are
+        the same calls as the blocking path; they do file I/O, fsync and fcntl locking,
+        so they run on the loop's default executor rather than on the loop.
+        """
+        loop = asyncio.get_running_loop()
+        spec, idem_key = await loop.run_in_executor(None, self._preflight, task_id)
+
+        # Emit RUN_STARTED first (FSM enforces legality)
+        await loop.run_in_executor(None, self.events.emit_run_started, spec)
 
+        capture_dir = None
+        try:
+            # Output streams into the evidence staging area, never into memory.
+            capture_dir = await loop.run_in_executor(None, self.evidence.new_capture_dir, spec.task_id, spec.exec_id)
+            res = await self.async_executor.run_async(spec, capture_dir=capture_dir)
         except Exception as e:
-            reason = f"executor_exception:{e.__class__.__name__}:{e}"
-            receipt_exc = self.evidence.write_bundle(
-                spec=spec,
-                stdout=b"",
-                stderr=b"",
-                outputs={},
-                outcome=ExecutionOutcome.FAILED,
-                reason=reason,
-                idempotency_key=idem_key,
-            )
+            await loop.run_in_executor(None, self.evidence.discard_capture, capture_dir)
+            return await loop.run_in_executor(None, self._executor_failure, spec, idem_key, e)
+        try:
+            return await loop.run_in_executor(None, self._record_result, spec, idem_key, res)
+        finally:
+            await loop.run_in_executor(None, self.evidence.discard_capture, capture_dir)
+
+    def _executor_failure(self, spec: ExecutionSpec, idem_key: Optional[str], e: Exception) -> RunSummary:
+        """
+        Terminal evidence and RUN_FAILED for an executor that raised after RUN_STARTED.
+        """
+        reason = f"executor_exception:{e.__class__.__name__}:{e}"
+        receipt_exc = self.evidence.write_bundle(
+            spec=spec,
+            stdout=b"",
+            stderr=b"",
+            outputs={},
+            outcome=ExecutionOutcome.FAILED,
+            reason=reason,
+            idempotency_key=idem_key,
+        )
 
-            err_sha = sha256_hex(reason.encode("utf-8"))
-            self.events.emit_run_failed(
-                spec,
-                error_class="executor_exception",
-                error_sha256=err_sha,
-                exit_code=None,
-            )
+        err_sha = sha256_hex(reason.encode("utf-8"))
+        self.events.emit_run_failed(
+            spec,
+            error_class="executor_exception",
+            error_sha256=err_sha,
+            exit_code=None,
+        )
 
-            return RunSummary(
-                ok=False,
-                task_id=task_id,
-                exec_id=spec.exec_id,
-                exit_code=125,
-                stdout_sha256=sha256_hex(b""),
-                stderr_sha256=sha256_hex(b""),
-                outputs_manifest_sha256=canonical_inputs_manifest({}),
-                evidence_bundle_dir=str(receipt_exc.get("bundle_dir")),
-                evidence_manifest_sha256=str(receipt_exc.get("manifest_sha256")),
-            )
+        return RunSummary(
+            ok=False,
+            task_id=spec.task_id,
+            exec_id=spec.exec_id,
+            exit_code=125,
+            stdout_sha256=sha256_hex(b""),
+            stderr_sha256=sha256_hex(b""),
+            outputs_manifest_sha256=canonical_inputs_manifest({}),
+            evidence_bundle_dir=str(receipt_exc.get("bundle_dir")),
+            evidence_manifest_sha256=str(receipt_exc.get("manifest_sha256")),
+        )
 
-        stdout_sha = sha256_hex(res.stdout)
-        stderr_sha = sha256_hex(res.stderr)
+    def _record_result(self, spec: ExecutionSpec, idem_key: Optional[str], res: ExecutionResult) -> RunSummary:
+        """
+        Evidence bundle and terminal run event for a finished execution.
+        """
+        stdout_sha = res.stdout_sha256
+        stderr_sha = res.stderr_sha256
+        stdout = res.stdout_capture if res.stdout_capture is not None else res.stdout
+        stderr = res.stderr_capture if res.stderr_capture is not None else res.stderr
 
         outputs_manifest_sha = canonical_inputs_manifest({})
 
         if res.exit_code == 0:
             receipt = self.evidence.write_bundle(
                 spec=spec,
-                stdout=res.stdout,
-                stderr=res.stderr,
+                stdout=stdout,
+                stderr=stderr,
                 outputs={},
                 outcome=ExecutionOutcome.SUCCEEDED,
                 reason="exit_code:0",
@@ -255,7 +423,7 @@ class TaskRunner:
 
             return RunSummary(
                 ok=True,
-                task_id=task_id,
+                task_id=spec.task_id,
                 exec_id=spec.exec_id,
                 exit_code=res.exit_code,
                 stdout_sha256=stdout_sha,
@@ -267,8 +435,8 @@ class TaskRunner:
 
         receipt = self.evidence.write_bundle(
             spec=spec,
-            stdout=res.stdout,
-            stderr=res.stderr,
+            stdout=stdout,
+            stderr=stderr,
             outputs={},
             outcome=ExecutionOutcome.FAILED,
             reason=f"exit_code:{res.exit_code}",
@@ -285,7 +453,7 @@ class TaskRunner:
 
         return RunSummary(
             ok=False,
-            task_id=task_id,
+            task_id=spec.task_id,
             exec_id=spec.exec_id,
             exit_code=res.exit_code,
             stdout_sha256=stdout_sha,
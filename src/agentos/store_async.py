@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, TypeVar, Union
+
+from agentos.durability import Durability, DurabilityMode
+from agentos.store_fs import EventRef, FSStore
+
+T = TypeVar("T")
+
+_DONE = object()
+
+
+class AsyncFSStore:
+    """
+    asyncio facade over FSStore.
+
+    Filesystem work runs on a bounded thread pool so the event loop never blocks.
+    Operations on one task_id run one at a time in call order (an append is visible
+    to a list_events issued after it); different tasks proceed in parallel, so a slow
+    task never holds up the others beyond the pool size.
+
+    append_event/append_events/list_events/read_event/verify_chain return awaitables
+    that are scheduled at call time, which is what pins the per-task order.
+    """
+
+    def __init__(
+        self,
+        root: str = "store",
+        *,
+        max_workers: int = 8,
+        store: Optional[FSStore] = None,
+        index: bool = False,
+        durability: Union[Durability, DurabilityMode, str, None] = None,
+    ) -> None:
+        if max_workers < 1:
+            raise ValueError("max_workers must be >= 1")
+        self.store = store if store is not None else FSStore(root, index=index, durability=durability)
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="agentos-store")
+        self._tails: Dict[str, "asyncio.Task[Any]"] = {}
+
+    async def __aenter__(self) -> "AsyncFSStore":
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        pending = list(self._tails.values())
+        if pending:
+            await asyncio.wait(pending)
+        self._pool.shutdown(wait=True)
+
+    def _submit(self, task_id: str, fn: Callable[[], T]) -> "asyncio.Task[T]":
+        loop = asyncio.get_running_loop()
+        prev = self._tails.get(task_id)
+
+        async def run() -> T:
+            if prev is not None:
+                # Wait for the previous op on this task; its outcome is its caller's concern.
+                await asyncio.wait([prev])
+            return await loop.run_in_executor(self._pool, fn)
+
+        task = loop.create_task(run())
+        self._tails[task_id] = task
+
+        def forget(t: "asyncio.Task[Any]") -> None:
+            if self._tails.get(task_id) is t:
+                del self._tails[task_id]
+
+        task.add_done_callback(forget)
+        return task
+
+    def append_event(
+        self, task_id: str, type_: str, body: Dict[str, Any], *, expected_seq: Optional[int] = None
+    ) -> Awaitable[EventRef]:
+        return self._submit(task_id, lambda: self.store.append_event(task_id, type_, body, expected_seq=expected_seq))
+
+    def append_events(
+        self,
+        task_id: str,
+        events: Sequence[Tuple[str, Dict[str, Any]]],
+        *,
+        expected_seq: Optional[int] = None,
+    ) -> Awaitable[Tuple[EventRef, ...]]:
+        batch = list(events)
+        return self._submit(task_id, lambda: self.store.append_events(task_id, batch, expected_seq=expected_seq))
+
+    def read_event(self, task_id: str, seq: int) -> Awaitable[Dict[str, Any]]:
+        return self._submit(task_id, lambda: self.store.read_event(task_id, seq))
+
+    def list_events(
+        self,
+        task_id: str,
+        *,
+        from_seq: int = 0,
+        to_seq: Optional[int] = None,
+        limit: Optional[int] = None,
+        reverse: bool = False,
+    ) -> Awaitable[Tuple[Dict[str, Any], ...]]:
+        return self._submit(
+            task_id,
+            lambda: self.store.list_events(task_id, from_seq=from_seq, to_seq=to_seq, limit=limit, reverse=reverse),
+        )
+
+    def count_events(self, task_id: str) -> Awaitable[int]:
+        return self._submit(task_id, lambda: self.store.count_events(task_id))
+
+    def verify_chain(self, task_id: str) -> Awaitable[bool]:
+        return self._submit(task_id, lambda: self.store.verify_chain(task_id))
+
+    async def list_tasks(self) -> List[str]:
+        return await asyncio.get_running_loop().run_in_executor(self._pool, self.store.list_tasks)
+
+    async def iter_task_events(
+        self,
+        task_id: str,
+        *,
+        from_seq: int = 0,
+        to_seq: Optional[int] = None,
+        reverse: bool = False,
+        types: Optional[Iterable[str]] = None,
+        batch_size: int = 64,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Async iteration over committed events, decoded batch_size at a time off-loop.
+
+        Bounded by HEAD when iteration starts, like FSStore.iter_task_events.
+        """
+        it = self.store.iter_task_events(task_id, from_seq=from_seq, to_seq=to_seq, reverse=reverse, types=types)
+
+        def take() -> List[Any]:
+            out: List[Any] = []
+            for ev in it:
+                out.append(ev)
+                if len(out) >= batch_size:
+                    return out
+            out.append(_DONE)
+            return out
+
+        while True:
+            chunk = await self._submit(task_id, take)
+            for ev in chunk:
+                if ev is _DONE:
+                    return
+                yield ev
@@ -1,12 +1,30 @@
 from __future__ import annotations
 
+import fcntl
+import itertools
 import os
+import shutil
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple, Union
 
 from agentos.canonical import canonical_json, sha256_hex
+from agentos.event import Event
+from agentos.fsm import make_checkpoint, next_state
+from agentos.durability import Durability, DurabilityMode, resolve_durability
+from agentos.layout import iter_keyed_dirs, resolve_dir, resolve_layout
+from agentos.packs import PackStore
+from agentos.task import TaskState
+
+
+# Archived streams kept decoded per FSStore (see FSStore._packed_lines).
+PACKED_CACHE_TASKS = 64
+
+_CORE_KEYS: Tuple[str, ...] = ("task_id", "seq", "ts_utc", "type", "body", "prev_sha256")
 
 
 @dataclass(frozen=True)
@@ -17,6 +35,92 @@ class EventRef:
     path: str
 
 
+class SequenceConflictError(RuntimeError):
+    """
+    Raised when a compare-and-append finds the stream head is not the expected seq.
+    """
+
+    def __init__(self, task_id: str, expected_seq: int, actual_seq: int) -> None:
+        super().__init__(f"sequence conflict for task_id={task_id}: expected head {expected_seq}, got {actual_seq}")
+        self.task_id = task_id
+        self.expected_seq = expected_seq
+        self.actual_seq = actual_seq
+
+
+@contextmanager
+def exclusive_file_lock(path: Path) -> Iterator[None]:
+    """
+    Hold an exclusive fcntl advisory lock on path (created if missing).
+
+    flock locks belong to the open file description, so this serializes both
+    threads and processes that lock the same path.
+    """
+    fd = os.open(str(path), os.O_CREAT | os.O_RDWR, 0o600)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        yield
+    finally:
+        # Closing the descriptor releases the lock.
+        os.close(fd)
+
+
+def utc_now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+def build_event(
+    task_id: str,
+    seq: int,
+    type_: str,
+    body: Dict[str, Any],
+    prev_sha256: Optional[str],
+    *,
+    ts_utc: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Build a sealed event: the canonical core plus its explicit sha256.
+
+    Every store backend must use this so hashes are identical across layouts.
+    """
+    event_core = {
+        "task_id": task_id,
+        "seq": seq,
+        "ts_utc": ts_utc if ts_utc is not None else utc_now_iso(),
+        "type": type_,
+        "body": body,
+        "prev_sha256": prev_sha256,
+    }
+    event = dict(event_core)
+    event["sha256"] = sha256_hex(canonical_json(event_core).encode("utf-8"))
+    return event
+
+
+def verify_event_chain(events: Iterable[Mapping[str, Any]], *, anchor_sha256: Optional[str] = None) -> bool:
+    """
+    Verify sha256 fields and prev_sha256 chaining for an ordered event stream.
+
+    anchor_sha256 is the sha256 of the event preceding the stream (None for seq 0).
+    """
+    prev = anchor_sha256
+    for ev in events:
+        sha = ev.get("sha256")
+        try:
+            core = {k: ev[k] for k in _CORE_KEYS}
+        except KeyError:
+            return False
+        recomputed = sha256_hex(canonical_json(core).encode("utf-8"))
+        if sha != recomputed:
+            return False
+        if prev is None:
+            if ev.get("prev_sha256") is not None:
+                return False
+        else:
+            if ev.get("prev_sha256") != prev:
+                return False
+        prev = sha
+    return True
+
+
 class FSStore:
     """
     Append-only filesystem event store.
@@ -24,14 +128,117 @@ class FSStore:
     Layout:
       store/events/<task_id>/HEAD          -> last sequence integer
       store/events/<task_id>/<seq>.json    -> canonical event json (includes sha256)
+      store/events/<task_id>/CHECKPOINT    -> latest FSM checkpoint (see agentos.fsm.make_checkpoint)
+      store/events/<task_id>/STATE         -> derived state at HEAD (state_sidecar=True)
+
+    Sharded layout (layout="sharded", recorded in store/LAYOUT):
+      store/events/<ab>/<cd>/<task_id>/... with ab/cd taken from sha256(task_id), so no
+      directory holds more than a few hundred entries. Readers resolve both layouts;
+      new tasks use the recorded layout (see agentos.layout, tools/migrate_layout.py).
+
+    Archive packs (store/packs, see agentos.packs and agentos.archive):
+      Terminal tasks may be moved into compressed packs; their loose directory is then
+      gone and reads fall back to the pack. Appending to an archived task raises.
+
+    Tail cache:
+      Each append remembers (seq, sha256, HEAD file identity) per task. The next append
+      trusts the cached tail only if HEAD still has the same inode/mtime/size; any other
+      writer replaces HEAD atomically, so a mismatch falls back to reading disk.
+
+    Concurrency:
+      Appends hold an exclusive fcntl lock on store/events/<task_id>/LOCK, so several
+      processes (or threads) can share one store. expected_seq turns an append into a
+      compare-and-append against the current head seq (-1 for an empty stream).
+
+    Task index (index=True):
+      Each committed append also advances the task's row in store/index/tasks.sqlite3
+      (see agentos.task_index.TaskIndex) while the task lock is still held. If that
+      update fails the task is marked dirty; opening the store resyncs dirty rows.
+
+    Change feed (feed=True):
+      Each committed batch is also published to store/feed/journal.log (see
+      agentos.change_feed.ChangeFeed) under the task lock, so per-task order holds.
+
+    State sidecar (state_sidecar=True):
+      Each committed append folds the batch into STATE, a checkpoint-format record of
+      the derived state at the new HEAD. rebuild_task_state trusts it only when it sits
+      at HEAD and its anchor is the recomputed hash of the tail event; a sidecar that
+      cannot be advanced (missing, stale, illegal transition) is left behind and the
+      next full replay rewrites it.
+
+    Durability (durability="none" | "fsync" | "group", or a Durability instance):
+      Event files and the task directory are made durable before HEAD is replaced,
+      then HEAD and the directory again, so a crash never exposes a HEAD that points
+      past durable events. "group" coalesces concurrent appenders into shared fsyncs
+      (see agentos.durability.Durability).
     """
 
-    def __init__(self, root: str = "store") -> None:
+    def __init__(
+        self,
+        root: str = "store",
+        *,
+        index: bool = False,
+        feed: bool = False,
+        durability: Union[Durability, DurabilityMode, str, None] = None,
+        layout: Optional[str] = None,
+        state_sidecar: bool = False,
+    ) -> None:
         self.root = Path(root)
+        self.durability = resolve_durability(durability)
+        self.layout = resolve_layout(self.root, layout)
+        self._dirs: Dict[str, Path] = {}
+        self._pack_store: Optional[PackStore] = None
+        self._packed_cache: "OrderedDict[str, List[str]]" = OrderedDict()
+        self._packed_lock = threading.Lock()
+        self._tail: Dict[str, Tuple[int, Optional[str], Tuple[int, int, int]]] = {}
+        self.index: Optional[Any] = None
+        if index:
+            from agentos.task_index import TaskIndex
+            self.index = TaskIndex(str(self.root))
+        self.state_sidecar = bool(state_sidecar)
+        self.feed: Optional[Any] = None
+        if feed:
+            from agentos.change_feed import ChangeFeed
+            self.feed = ChangeFeed(str(self.root), durability=self.durability)
+        if self.index is not None:
+            self.index.resync(self)
 
     def _task_dir(self, task_id: str) -> Path:
         # task_id is treated as an opaque string; caller should ensure safe characters.
-        return self.root / "events" / task_id
+        d = self._dirs.get(task_id)
+        if d is None:
+            d = resolve_dir(self.root / "events", task_id, self.layout)
+            # Only existing directories are cached; a task never moves while in use.
+            if d.is_dir():
+                self._dirs[task_id] = d
+        return d
+
+    def _packs(self) -> Optional[PackStore]:
+        if self._pack_store is None:
+            self._pack_store = PackStore.open_existing(self.root / "packs")
+        return self._pack_store
+
+    def _packed_lines(self, task_id: str) -> Optional[List[str]]:
+        """
+        Raw event json lines of an archived task, or None if it is not archived.
+
+        Pack entries never change once cataloged, so decoded streams are kept in a small
+        LRU and repeated reads of one task (a replay, paging) inflate it only once.
+        """
+        with self._packed_lock:
+            lines = self._packed_cache.get(task_id)
+            if lines is not None:
+                self._packed_cache.move_to_end(task_id)
+                return lines
+        ps = self._packs()
+        if ps is None or not ps.has(task_id):
+            return None
+        lines = ps.get(task_id).decode("utf-8").splitlines()
+        with self._packed_lock:
+            self._packed_cache[task_id] = lines
+            while len(self._packed_cache) > PACKED_CACHE_TASKS:
+                self._packed_cache.popitem(last=False)
+        return lines
 
     def _head_path(self, task_id: str) -> Path:
         return self._task_dir(task_id) / "HEAD"
@@ -54,89 +261,399 @@ class FSStore:
         tmp.write_text(f"{seq}", encoding="utf-8")
         os.replace(tmp, head)
 
-    def append_event(self, task_id: str, type_: str, body: Dict[str, Any]) -> EventRef:
+    def _head_identity(self, task_id: str) -> Optional[Tuple[int, int, int]]:
+        try:
+            st = os.stat(self._head_path(task_id))
+        except FileNotFoundError:
+            return None
+        return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+    def _read_tail(self, task_id: str) -> Tuple[int, Optional[str]]:
         """
-        Append an event to a task stream. Deterministic serialization, explicit sha256.
+        Return (head seq, head sha256), served from the tail cache when HEAD is unchanged.
         """
-        td = self._task_dir(task_id)
-        td.mkdir(parents=True, exist_ok=True)
+        ident = self._head_identity(task_id)
+        cached = self._tail.get(task_id)
+        if cached is not None and ident is not None and cached[2] == ident:
+            return cached[0], cached[1]
+        self._tail.pop(task_id, None)
 
         prev_seq = self._read_head(task_id)
-        seq = prev_seq + 1
-
-        ts_utc = datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
         prev_hash = None
         if prev_seq >= 0:
             prev_path = self._event_path(task_id, prev_seq)
             if prev_path.exists():
                 # We store the prior event hash to form a hash chain.
-                import json as _json
-                prev_obj = _json.loads(prev_path.read_text(encoding="utf-8"))
-                prev_hash = prev_obj.get("sha256")
-
-        event_core = {
-            "task_id": task_id,
-            "seq": seq,
-            "ts_utc": ts_utc,
-            "type": type_,
-            "body": body,
-            "prev_sha256": prev_hash,
-        }
-
-        sha = sha256_hex(canonical_json(event_core).encode("utf-8"))
-        event = dict(event_core)
-        event["sha256"] = sha
-
-        path = self._event_path(task_id, seq)
-        # Fail-closed: do not overwrite existing event files.
-        if path.exists():
-            raise RuntimeError(f"event already exists: {path}")
-
-        # Atomic write via temp + rename
-        tmp = path.with_suffix(".json.tmp")
-        tmp.write_text(canonical_json(event), encoding="utf-8")
-        os.replace(tmp, path)
-
-        # Update HEAD last (also atomic)
-        self._write_head_atomic(task_id, seq)
-
-        return EventRef(task_id=task_id, seq=seq, sha256=sha, path=str(path))
+                prev_hash = Event.from_json(prev_path.read_text(encoding="utf-8")).get("sha256")
+        return prev_seq, prev_hash
+
+    def _remember_tail(self, task_id: str, seq: int, sha: str) -> None:
+        ident = self._head_identity(task_id)
+        if ident is None:
+            self._tail.pop(task_id, None)
+            return
+        self._tail[task_id] = (seq, sha, ident)
+
+    def lock_task(self, task_id: str) -> Any:
+        """
+        Context manager holding the task's exclusive LOCK, the lock every append takes.
+        """
+        td = self._task_dir(task_id)
+        td.mkdir(parents=True, exist_ok=True)
+        return exclusive_file_lock(td / "LOCK")
+
+    def append_event(
+        self, task_id: str, type_: str, body: Dict[str, Any], *, expected_seq: Optional[int] = None
+    ) -> EventRef:
+        """
+        Append an event to a task stream. Deterministic serialization, explicit sha256.
+        """
+        return self.append_events(task_id, [(type_, body)], expected_seq=expected_seq)[0]
+
+    def append_events(
+        self,
+        task_id: str,
+        events: Sequence[Tuple[str, Dict[str, Any]]],
+        *,
+        expected_seq: Optional[int] = None,
+    ) -> Tuple[EventRef, ...]:
+        """
+        Append several events to a task stream as one batch.
+
+        Hashes are chained in memory; every event file is staged before anything is
+        published, and the single HEAD update is the commit point. If any step fails,
+        every file written for the batch is removed and HEAD is left untouched.
+        """
+        if not events:
+            return tuple()
+        with self.lock_task(task_id):
+            return self._append_locked(task_id, events, expected_seq)
+
+    def _append_locked(
+        self,
+        task_id: str,
+        events: Sequence[Tuple[str, Dict[str, Any]]],
+        expected_seq: Optional[int],
+    ) -> Tuple[EventRef, ...]:
+        prev_seq, prev_hash = self._read_tail(task_id)
+        packs = self._packs() if prev_seq < 0 else None
+        if packs is not None and packs.has(task_id):
+            raise RuntimeError(f"task_archived:{task_id}")
+        if expected_seq is not None and expected_seq != prev_seq:
+            raise SequenceConflictError(task_id, expected_seq, prev_seq)
+        batch: List[Dict[str, Any]] = []
+        for i, (type_, body) in enumerate(events):
+            event = build_event(task_id, prev_seq + 1 + i, type_, body, prev_hash)
+            prev_hash = event["sha256"]
+            batch.append(event)
+        return self._commit_sealed(task_id, prev_seq, batch)
+
+    def import_events(self, task_id: str, events: Sequence[Mapping[str, Any]]) -> Tuple[EventRef, ...]:
+        """
+        Append already-sealed events verbatim, as one batch (e.g. MemStore.flush_to).
+
+        Fail-closed: the batch must start at the next seq and chain onto the current tail.
+        """
+        if not events:
+            return tuple()
+        with self.lock_task(task_id):
+            prev_seq, prev_hash = self._read_tail(task_id)
+            packs = self._packs() if prev_seq < 0 else None
+            if packs is not None and packs.has(task_id):
+                raise RuntimeError(f"task_archived:{task_id}")
+            batch = [dict(ev) for ev in events]
+            for i, ev in enumerate(batch):
+                if ev.get("task_id") != task_id or ev.get("seq") != prev_seq + 1 + i:
+                    raise RuntimeError(f"import seq mismatch: expected {prev_seq + 1 + i}, got {ev.get('seq')}")
+            if not verify_event_chain(batch, anchor_sha256=prev_hash):
+                raise RuntimeError(f"import chain mismatch at seq {prev_seq + 1}")
+            return self._commit_sealed(task_id, prev_seq, batch)
+
+    def _repair_tail(self, task_id: str, head: int) -> None:
+        """
+        Drop event files and temp files past HEAD left by an interrupted commit.
+
+        A batch is staged and renamed in seq order, so its leftovers are contiguous from
+        HEAD+1; the probe stops at the first seq with neither file. Caller holds the lock.
+        """
+        seq = head + 1
+        while True:
+            path = self._event_path(task_id, seq)
+            tmp = path.with_suffix(".json.tmp")
+            if not path.exists() and not tmp.exists():
+                return
+            for p in (path, tmp):
+                try:
+                    p.unlink()
+                except FileNotFoundError:
+                    pass
+            seq += 1
+
+    def _commit_sealed(self, task_id: str, prev_seq: int, batch: List[Dict[str, Any]]) -> Tuple[EventRef, ...]:
+        # Caller holds the task lock and has chained batch onto (prev_seq, tail sha256).
+        self._repair_tail(task_id, prev_seq)
+        sealed: List[Tuple[Path, Dict[str, Any]]] = []
+        for event in batch:
+            path = self._event_path(task_id, int(event["seq"]))
+            # Fail-closed: do not overwrite existing event files.
+            if path.exists():
+                self._tail.pop(task_id, None)
+                raise RuntimeError(f"event already exists: {path}")
+            sealed.append((path, event))
+        prev_hash = batch[-1]["sha256"]
+
+        written: List[Path] = []
+        try:
+            staged = []
+            for path, event in sealed:
+                tmp = path.with_suffix(".json.tmp")
+                written.append(tmp)
+                tmp.write_text(canonical_json(event), encoding="utf-8")
+                staged.append((tmp, path))
+            # Atomic publish via rename, then update HEAD last (also atomic)
+            for tmp, path in staged:
+                os.replace(tmp, path)
+                written.append(path)
+            td = self._task_dir(task_id)
+            # A brand-new stream also needs its directory entries (and shards) persisted.
+            depth = len(td.relative_to(self.root / "events").parts)
+            self.durability.commit(
+                files=[path for _, path in staged],
+                dirs=[td] if prev_seq >= 0 else [td, *list(td.parents)[:depth]],
+            )
+            last_seq = int(sealed[-1][1]["seq"])
+            self._write_head_atomic(task_id, last_seq)
+        except BaseException:
+            self._tail.pop(task_id, None)
+            for p in written:
+                try:
+                    p.unlink()
+                except FileNotFoundError:
+                    pass
+            raise
+
+        self._remember_tail(task_id, last_seq, str(prev_hash))
+        try:
+            # HEAD is already published here, so a failed fsync must not unlink the batch.
+            self.durability.commit(files=[self._head_path(task_id)], dirs=[td])
+        finally:
+            # Visible to readers even if that barrier raised, so derived views follow it.
+            self._after_commit(task_id, prev_seq, batch)
+        return tuple(
+            EventRef(task_id=task_id, seq=int(ev["seq"]), sha256=str(ev["sha256"]), path=str(path))
+            for path, ev in sealed
+        )
+
+    def _after_commit(self, task_id: str, prev_seq: int, batch: List[Dict[str, Any]]) -> None:
+        # Caller holds the task lock and HEAD already points at batch[-1].
+        if self.state_sidecar:
+            try:
+                self._advance_state_sidecar(task_id, prev_seq, batch)
+            except Exception:
+                # Derived and verified on read; a stale sidecar only costs a replay.
+                pass
+        if self.index is not None:
+            try:
+                self.index.apply(task_id, batch, history=lambda: self.iter_task_events(task_id))
+            except Exception:
+                # The batch is already committed; the row is recomputed from the log by
+                # TaskIndex.resync (on open, or by readers before they query).
+                self.index.mark_dirty(task_id)
+        if self.feed is not None:
+            try:
+                self.feed.publish(batch)
+            except Exception:
+                # Committed regardless; ChangeFeed.reconcile republishes missing records.
+                pass
 
     def read_event(self, task_id: str, seq: int) -> Dict[str, Any]:
         p = self._event_path(task_id, seq)
-        if not p.exists():
-            raise FileNotFoundError(str(p))
         import json as _json
+        head = self._read_head(task_id)
+        if head < 0:
+            lines = self._packed_lines(task_id)
+            if lines is not None and 0 <= seq < len(lines):
+                return _json.loads(lines[seq])
+        # Events past HEAD are not committed yet.
+        if not p.exists() or seq > head:
+            raise FileNotFoundError(str(p))
         return _json.loads(p.read_text(encoding="utf-8"))
 
-    def list_events(self, task_id: str) -> Tuple[Dict[str, Any], ...]:
-        td = self._task_dir(task_id)
-        if not td.exists():
-            return tuple()
-        paths = sorted([p for p in td.glob("*.json") if p.name != "HEAD.json"])
-        out = []
+    def _iter_raw(
+        self, task_id: str, from_seq: int, reverse: bool, to_seq: Optional[int] = None
+    ) -> Iterator[str]:
+        head = self._read_head(task_id)
+        lines = self._packed_lines(task_id) if head < 0 else None
+        if lines is not None:
+            head = len(lines) - 1
+        if to_seq is not None:
+            head = min(head, to_seq)
+        seqs = range(max(0, from_seq), head + 1)
+        for seq in (reversed(seqs) if reverse else seqs):
+            yield lines[seq] if lines is not None else self._event_path(task_id, seq).read_text(encoding="utf-8")
+
+    def loose_tasks(self) -> List[str]:
+        """
+        Tasks whose stream is stored as loose event files, i.e. not archived into packs.
+        """
+        return [task_id for task_id, _ in iter_keyed_dirs(self.root / "events")]
+
+    def export_stream(self, task_id: str) -> bytes:
+        """
+        Committed events as newline-terminated raw json lines, the archive pack format.
+
+        Hold lock_task(task_id) to get a stable snapshot.
+        """
+        return "".join(raw + "\n" for raw in self._iter_raw(task_id, 0, False)).encode("utf-8")
+
+    def remove_loose_task(self, task_id: str) -> None:
+        """
+        Delete a task's loose directory once its stream is packed (see agentos.archive).
+        Reads then fall back to the pack.
+        """
+        shutil.rmtree(self._task_dir(task_id))
+        self._dirs.pop(task_id, None)
+        self._tail.pop(task_id, None)
+
+    def iter_task_events(
+        self,
+        task_id: str,
+        *,
+        from_seq: int = 0,
+        to_seq: Optional[int] = None,
+        reverse: bool = False,
+        types: Optional[Iterable[str]] = None,
+    ) -> Iterator[Event]:
+        """
+        Lazily yield committed events (seq <= HEAD) as Event records, parsing each file
+        on demand; bodies are decoded only when read.
+
+        Walks [from_seq, to_seq] (to_seq defaults to HEAD); reverse walks from the top
+        down; types filters by event type.
+        Fail-closed: a missing file inside the committed range raises FileNotFoundError.
+        """
+        wanted = None if types is None else frozenset(str(t) for t in types)
+        for raw in self._iter_raw(task_id, from_seq, reverse, to_seq):
+            ev = Event.from_json(raw)
+            if wanted is None or str(ev.get("type")) in wanted:
+                yield ev
+
+    def list_events(
+        self,
+        task_id: str,
+        *,
+        from_seq: int = 0,
+        to_seq: Optional[int] = None,
+        limit: Optional[int] = None,
+        reverse: bool = False,
+    ) -> Tuple[Dict[str, Any], ...]:
+        """
+        Committed events in [from_seq, to_seq], at most limit of them.
+
+        Only the requested page is read. Next page: from_seq = last seq + 1, or with
+        reverse=True (newest first), to_seq = last seq - 1.
+        """
+        # Files past HEAD belong to an uncommitted batch and are not yet visible.
+        import json as _json
+        raws = self._iter_raw(task_id, from_seq, reverse, to_seq)
+        return tuple(_json.loads(raw) for raw in itertools.islice(raws, limit))
+
+    def count_events(self, task_id: str) -> int:
+        """
+        Number of committed events, from HEAD alone (no event file is parsed).
+        """
+        head = self._read_head(task_id)
+        if head < 0:
+            lines = self._packed_lines(task_id)
+            if lines is not None:
+                return len(lines)
+        return head + 1
+
+    def load_checkpoint(self, task_id: str) -> Optional[Dict[str, Any]]:
+        p = self._task_dir(task_id) / "CHECKPOINT"
+        if not p.exists():
+            return None
+        import json as _json
+        try:
+            obj = _json.loads(p.read_text(encoding="utf-8"))
+        except ValueError:
+            return None
+        return obj if isinstance(obj, dict) else None
+
+    def write_checkpoint(self, task_id: str, checkpoint: Mapping[str, Any]) -> None:
+        """
+        Atomically replace the task's checkpoint. Readers verify it against the chain.
+
+        No-op for streams without a loose HEAD (empty or archived), so a checkpoint
+        write never recreates the directory of a packed task.
+        """
+        if self._read_head(task_id) < 0:
+            return
+        with self.lock_task(task_id):
+            td = self._task_dir(task_id)
+            tmp = td / "CHECKPOINT.tmp"
+            tmp.write_text(canonical_json(dict(checkpoint)), encoding="utf-8")
+            os.replace(tmp, td / "CHECKPOINT")
+
+    def load_state_sidecar(self, task_id: str) -> Optional[Dict[str, Any]]:
+        p = self._task_dir(task_id) / "STATE"
+        if not p.exists():
+            return None
         import json as _json
-        for p in paths:
-            out.append(_json.loads(p.read_text(encoding="utf-8")))
-        return tuple(out)
+        try:
+            obj = _json.loads(p.read_text(encoding="utf-8"))
+        except ValueError:
+            return None
+        return obj if isinstance(obj, dict) else None
+
+    def _write_state_file(self, task_id: str, sidecar: Mapping[str, Any]) -> None:
+        td = self._task_dir(task_id)
+        tmp = td / "STATE.tmp"
+        tmp.write_text(canonical_json(dict(sidecar)), encoding="utf-8")
+        os.replace(tmp, td / "STATE")
+
+    def write_state_sidecar(self, task_id: str, sidecar: Mapping[str, Any]) -> None:
+        """
+        Replace the sidecar after a full replay, but only if it still covers HEAD, so a
+        slow reader never regresses a sidecar that an append has already advanced.
+
+        No-op for streams without a loose HEAD (empty or archived): taking the lock
+        would recreate the task directory of a packed task.
+        """
+        if not self.state_sidecar or self._read_head(task_id) < 0:
+            return
+        with self.lock_task(task_id):
+            if sidecar.get("seq") == self._read_head(task_id):
+                self._write_state_file(task_id, sidecar)
+
+    def _advance_state_sidecar(self, task_id: str, prev_seq: int, batch: List[Dict[str, Any]]) -> None:
+        # Caller holds the task lock and HEAD already points at batch[-1].
+        if prev_seq < 0:
+            state: Optional[TaskState] = TaskState.CREATED
+        else:
+            sc = self.load_state_sidecar(task_id)
+            if sc is None or sc.get("seq") != prev_seq or sc.get("sha256") != batch[0].get("prev_sha256"):
+                return
+            try:
+                state = TaskState(str(sc.get("state")))
+            except ValueError:
+                return
+        for ev in batch:
+            state = next_state(state, str(ev.get("type")))
+            if state is None:
+                return
+        last = batch[-1]
+        self._write_state_file(task_id, make_checkpoint(task_id, state, int(last["seq"]), str(last["sha256"])))
+
+    def list_tasks(self) -> List[str]:
+        ps = self._packs()
+        if ps is None:
+            return self.loose_tasks()
+        return sorted(set(self.loose_tasks()).union(ps.keys()))
 
     def verify_chain(self, task_id: str) -> bool:
         """
-        Verify sha256 fields and prev_sha256 chaining for a task.
+        Verify sha256 fields and prev_sha256 chaining for a task, streaming one event at a time.
         """
-        events = self.list_events(task_id)
-        prev = None
-        for ev in events:
-            sha = ev.get("sha256")
-            core = {k: ev[k] for k in ("task_id", "seq", "ts_utc", "type", "body", "prev_sha256")}
-            recomputed = sha256_hex(canonical_json(core).encode("utf-8"))
-            if sha != recomputed:
-                return False
-            if prev is None:
-                if ev.get("prev_sha256") is not None:
-                    return False
-            else:
-                if ev.get("prev_sha256") != prev:
-                    return False
-            prev = sha
-        return True
+        import json as _json
+        return verify_event_chain(_json.loads(raw) for raw in self._iter_raw(task_id, 0, False))
@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import itertools
+import json
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from agentos.blobs import MemBlobStore, blob_store_for
+from agentos.canonical import canonical_json
+from agentos.event import Event
+from agentos.store_fs import EventRef, FSStore, SequenceConflictError, build_event, verify_event_chain
+
+
+class MemStore:
+    """
+    In-memory event store implementing the FSStore protocol.
+
+    Events are sealed with build_event and held as their canonical JSON, exactly the
+    bytes FSStore would write, so hashes, chains and replay are identical. Nothing is
+    durable until flush_to() copies the streams into an FSStore; with snapshot_to and
+    snapshot_every set, that happens automatically every snapshot_every appended events;
+    a failed automatic snapshot does not fail the append, it is recorded in
+    last_snapshot_error and retried on the next append.
+
+    root is only where collaborators keyed off store.root (evidence, the runner) put
+    their files; no events are written there. Payload blobs stay in memory (self.blobs).
+    """
+
+    def __init__(
+        self,
+        root: str = "store",
+        *,
+        snapshot_to: Optional[FSStore] = None,
+        snapshot_every: int = 0,
+    ) -> None:
+        self.root = Path(root)
+        self.blobs = MemBlobStore()
+        self._events: Dict[str, List[str]] = {}
+        self._tails: Dict[str, Optional[str]] = {}
+        self._lock = threading.RLock()
+        self._snapshot_to = snapshot_to
+        self._snapshot_every = int(snapshot_every)
+        self._since_snapshot = 0
+        self.last_snapshot_error: Optional[str] = None
+
+    def append_event(
+        self, task_id: str, type_: str, body: Dict[str, Any], *, expected_seq: Optional[int] = None
+    ) -> EventRef:
+        return self.append_events(task_id, [(type_, body)], expected_seq=expected_seq)[0]
+
+    def append_events(
+        self,
+        task_id: str,
+        events: Sequence[Tuple[str, Dict[str, Any]]],
+        *,
+        expected_seq: Optional[int] = None,
+    ) -> Tuple[EventRef, ...]:
+        if not events:
+            return tuple()
+        with self._lock:
+            stream = self._events.get(task_id, [])
+            prev_seq = len(stream) - 1
+            if expected_seq is not None and expected_seq != prev_seq:
+                raise SequenceConflictError(task_id, expected_seq, prev_seq)
+            prev_hash = self._tails.get(task_id)
+            sealed = []
+            for i, (type_, body) in enumerate(events):
+                event = build_event(task_id, prev_seq + 1 + i, type_, body, prev_hash)
+                prev_hash = event["sha256"]
+                sealed.append(event)
+            # Serialise everything before publishing so a bad body leaves the stream as it was.
+            raws = [canonical_json(ev) for ev in sealed]
+            self._events[task_id] = stream + raws
+            self._tails[task_id] = prev_hash
+            self._since_snapshot += len(sealed)
+            snapshot_due = self._snapshot_to is not None and 0 < self._snapshot_every <= self._since_snapshot
+        refs = tuple(
+            EventRef(task_id=task_id, seq=int(ev["seq"]), sha256=str(ev["sha256"]), path=f"mem:{task_id}#{ev['seq']}")
+            for ev in sealed
+        )
+        if snapshot_due:
+            self._auto_snapshot()
+        return refs
+
+    def _auto_snapshot(self) -> None:
+        # The append has already happened, so a failed snapshot must not raise out of
+        # it. The counter is only reset by a successful flush, so the next append retries.
+        try:
+            self.flush_to(self._snapshot_to)
+        except Exception as e:
+            self.last_snapshot_error = f"{e.__class__.__name__}:{e}"
+        else:
+            self.last_snapshot_error = None
+
+    def read_event(self, task_id: str, seq: int) -> Dict[str, Any]:
+        with self._lock:
+            stream = self._events.get(task_id, [])
+            if seq < 0 or seq >= len(stream):
+                raise FileNotFoundError(f"mem:{task_id}#{seq}")
+            raw = stream[seq]
+        return json.loads(raw)
+
+    def _iter_raw(
+        self, task_id: str, from_seq: int, reverse: bool, to_seq: Optional[int] = None
+    ) -> Iterator[str]:
+        # Streams only grow, so a snapshot of the list is a consistent committed prefix.
+        with self._lock:
+            stream = self._events.get(task_id, [])
+        head = len(stream) - 1 if to_seq is None else min(len(stream) - 1, to_seq)
+        seqs = range(max(0, from_seq), head + 1)
+        for seq in (reversed(seqs) if reverse else seqs):
+            yield stream[seq]
+
+    def iter_task_events(
+        self,
+        task_id: str,
+        *,
+        from_seq: int = 0,
+        to_seq: Optional[int] = None,
+        reverse: bool = False,
+        types: Optional[Iterable[str]] = None,
+    ) -> Iterator[Event]:
+        wanted = None if types is None else frozenset(str(t) for t in types)
+        for raw in self._iter_raw(task_id, from_seq, reverse, to_seq):
+            ev = Event.from_json(raw)
+            if wanted is None or str(ev.get("type")) in wanted:
+                yield ev
+
+    def list_events(
+        self,
+        task_id: str,
+        *,
+        from_seq: int = 0,
+        to_seq: Optional[int] = None,
+        limit: Optional[int] = None,
+        reverse: bool = False,
+    ) -> Tuple[Dict[str, Any], ...]:
+        raws = self._iter_raw(task_id, from_seq, reverse, to_seq)
+        return tuple(json.loads(raw) for raw in itertools.islice(raws, limit))
+
+    def count_events(self, task_id: str) -> int:
+        with self._lock:
+            return len(self._events.get(task_id, []))
+
+    def list_tasks(self) -> List[str]:
+        with self._lock:
+            return sorted(self._events)
+
+    def verify_chain(self, task_id: str) -> bool:
+        """
+        Verify sha256 fields and prev_sha256 chaining for a task.
+        """
+        return verify_event_chain(json.loads(raw) for raw in self._iter_raw(task_id, 0, False))
+
+    def flush_to(self, target: FSStore) -> Dict[str, int]:
+        """
+        Copy every stream into target as verbatim FS event files (FSStore.import_events).
+
+        Incremental: only events past target's HEAD are written. Blobs are written
+        first, so no flushed event references content the target lacks. Fail-closed:
+        a target stream that is longer than ours or whose tail differs raises.
+        """
+        out = {"tasks": 0, "events": 0, "blobs": 0}
+        with self._lock:
+            target_blobs = blob_store_for(target)
+            for sha, data in self.blobs.items():
+                if not target_blobs.has(sha):
+                    target_blobs.put(data)
+                    out["blobs"] += 1
+            for task_id in sorted(self._events):
+                stream = self._events[task_id]
+                have = target.count_events(task_id)
+                if have > len(stream):
+                    raise RuntimeError(f"flush_diverged:{task_id}")
+                if have > 0 and target.read_event(task_id, have - 1)["sha256"] != json.loads(stream[have - 1])["sha256"]:
+                    raise RuntimeError(f"flush_diverged:{task_id}")
+                if have == len(stream):
+                    continue
+                target.import_events(task_id, [json.loads(raw) for raw in stream[have:]])
+                out["tasks"] += 1
+                out["events"] += len(stream) - have
+            self._since_snapshot = 0
+        return out
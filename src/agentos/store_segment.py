@@ -0,0 +1,259 @@
+from __future__ import annotations
+
+import itertools
+import json
+import os
+import struct
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from agentos.canonical import canonical_json
+from agentos.event import Event
+from agentos.store_fs import EventRef, SequenceConflictError, build_event, exclusive_file_lock, verify_event_chain
+
+# Each log record is a 4-byte big-endian length prefix followed by canonical event json.
+_LEN = struct.Struct(">I")
+# Each index entry is (offset:u64, length:u32); entry i describes event seq i.
+_IDX = struct.Struct(">QI")
+
+
+class SegmentStore:
+    """
+    Append-only segmented log event store.
+
+    Same append_event/list_events/read_event/verify_chain contract and hash chain as
+    FSStore, but each task stream lives in two files instead of one file per event.
+
+    Layout:
+      store/segments/<task_id>/events.log   -> length-prefixed canonical event records
+      store/segments/<task_id>/events.idx   -> fixed-width (offset, length) entry per seq
+
+    The index entry is the commit point: a record is visible only once its index entry
+    is fully written. Trailing bytes past the last indexed record (torn writes) are
+    truncated before the next append. Appends hold an exclusive fcntl lock on
+    store/segments/<task_id>/LOCK.
+    """
+
+    def __init__(self, root: str = "store") -> None:
+        self.root = Path(root)
+
+    def _task_dir(self, task_id: str) -> Path:
+        # task_id is treated as an opaque string; caller should ensure safe characters.
+        return self.root / "segments" / task_id
+
+    def _log_path(self, task_id: str) -> Path:
+        return self._task_dir(task_id) / "events.log"
+
+    def _idx_path(self, task_id: str) -> Path:
+        return self._task_dir(task_id) / "events.idx"
+
+    def _read_index(self, task_id: str) -> List[Tuple[int, int]]:
+        p = self._idx_path(task_id)
+        if not p.exists():
+            return []
+        raw = p.read_bytes()
+        n = len(raw) // _IDX.size
+        return [_IDX.unpack_from(raw, i * _IDX.size) for i in range(n)]
+
+    def _head(self, task_id: str) -> int:
+        p = self._idx_path(task_id)
+        if not p.exists():
+            return -1
+        return p.stat().st_size // _IDX.size - 1
+
+    def _read_raw(self, fh: Any, offset: int, length: int) -> str:
+        fh.seek(offset)
+        raw = fh.read(_LEN.size + length)
+        if len(raw) != _LEN.size + length or _LEN.unpack_from(raw, 0)[0] != length:
+            raise RuntimeError(f"corrupt segment record at offset {offset}")
+        return raw[_LEN.size:].decode("utf-8")
+
+    def _read_record(self, fh: Any, offset: int, length: int) -> Dict[str, Any]:
+        return json.loads(self._read_raw(fh, offset, length))
+
+    def _repair_tail(self, task_id: str) -> List[Tuple[int, int]]:
+        """
+        Drop torn index entries and unindexed log bytes left by an interrupted append.
+        """
+        entries = self._read_index(task_id)
+        idx = self._idx_path(task_id)
+        if idx.exists() and idx.stat().st_size != len(entries) * _IDX.size:
+            os.truncate(idx, len(entries) * _IDX.size)
+        log = self._log_path(task_id)
+        end = 0
+        if entries:
+            off, ln = entries[-1]
+            end = off + _LEN.size + ln
+        if log.exists() and log.stat().st_size > end:
+            os.truncate(log, end)
+        return entries
+
+    def _write_events(self, task_id: str, events: Sequence[Dict[str, Any]], entries: List[Tuple[int, int]]) -> None:
+        """
+        Write records with one log write and one index write; roll both back on failure.
+        """
+        offset = 0
+        if entries:
+            off, ln = entries[-1]
+            offset = off + _LEN.size + ln
+        start = offset
+        records = bytearray()
+        index = bytearray()
+        new_entries = []
+        for event in events:
+            data = canonical_json(event).encode("utf-8")
+            records += _LEN.pack(len(data)) + data
+            index += _IDX.pack(offset, len(data))
+            new_entries.append((offset, len(data)))
+            offset += _LEN.size + len(data)
+        try:
+            with open(self._log_path(task_id), "ab") as fh:
+                fh.write(records)
+            with open(self._idx_path(task_id), "ab") as fh:
+                fh.write(index)
+        except BaseException:
+            if self._idx_path(task_id).exists():
+                os.truncate(self._idx_path(task_id), len(entries) * _IDX.size)
+            if self._log_path(task_id).exists():
+                os.truncate(self._log_path(task_id), start)
+            raise
+        entries.extend(new_entries)
+
+    def _tail_sha256(self, task_id: str, entries: List[Tuple[int, int]]) -> Optional[str]:
+        if not entries:
+            return None
+        with open(self._log_path(task_id), "rb") as fh:
+            return Event.from_json(self._read_raw(fh, *entries[-1])).get("sha256")
+
+    def append_event(
+        self, task_id: str, type_: str, body: Dict[str, Any], *, expected_seq: Optional[int] = None
+    ) -> EventRef:
+        """
+        Append an event to a task stream. Deterministic serialization, explicit sha256.
+        """
+        return self.append_events(task_id, [(type_, body)], expected_seq=expected_seq)[0]
+
+    def append_events(
+        self,
+        task_id: str,
+        events: Sequence[Tuple[str, Dict[str, Any]]],
+        *,
+        expected_seq: Optional[int] = None,
+    ) -> Tuple[EventRef, ...]:
+        """
+        Append several events to a task stream as one batch (single index commit).
+        """
+        if not events:
+            return tuple()
+        td = self._task_dir(task_id)
+        td.mkdir(parents=True, exist_ok=True)
+
+        with exclusive_file_lock(td / "LOCK"):
+            entries = self._repair_tail(task_id)
+            if expected_seq is not None and expected_seq != len(entries) - 1:
+                raise SequenceConflictError(task_id, expected_seq, len(entries) - 1)
+            prev_hash = self._tail_sha256(task_id, entries)
+            sealed = []
+            for i, (type_, body) in enumerate(events):
+                event = build_event(task_id, len(entries) + i, type_, body, prev_hash)
+                prev_hash = event["sha256"]
+                sealed.append(event)
+            self._write_events(task_id, sealed, entries)
+        return tuple(
+            EventRef(task_id=task_id, seq=int(ev["seq"]), sha256=str(ev["sha256"]), path=str(self._log_path(task_id)))
+            for ev in sealed
+        )
+
+    def import_event(self, event: Dict[str, Any]) -> EventRef:
+        """
+        Append an already-sealed event verbatim (migration path).
+
+        Fail-closed: the event must be the next seq and chain onto the current tail.
+        """
+        task_id = str(event.get("task_id"))
+        td = self._task_dir(task_id)
+        td.mkdir(parents=True, exist_ok=True)
+
+        with exclusive_file_lock(td / "LOCK"):
+            entries = self._repair_tail(task_id)
+            prev_hash = self._tail_sha256(task_id, entries)
+            if event.get("seq") != len(entries):
+                raise RuntimeError(f"import seq mismatch: expected {len(entries)}, got {event.get('seq')}")
+            if not verify_event_chain([event], anchor_sha256=prev_hash):
+                raise RuntimeError(f"import chain mismatch at seq {event.get('seq')}")
+            self._write_events(task_id, [dict(event)], entries)
+        return EventRef(task_id=task_id, seq=int(event["seq"]), sha256=str(event["sha256"]), path=str(self._log_path(task_id)))
+
+    def read_event(self, task_id: str, seq: int) -> Dict[str, Any]:
+        idx = self._idx_path(task_id)
+        if seq < 0 or seq > self._head(task_id):
+            raise FileNotFoundError(f"{self._log_path(task_id)}#{seq}")
+        with open(idx, "rb") as fh:
+            fh.seek(seq * _IDX.size)
+            offset, length = _IDX.unpack(fh.read(_IDX.size))
+        with open(self._log_path(task_id), "rb") as fh:
+            return self._read_record(fh, offset, length)
+
+    def _iter_raw(
+        self, task_id: str, from_seq: int, reverse: bool, to_seq: Optional[int] = None
+    ) -> Iterator[str]:
+        head = self._head(task_id)
+        if to_seq is not None:
+            head = min(head, to_seq)
+        lo = max(0, from_seq)
+        if head < lo:
+            return
+        # Only the index slice covering [lo, head] is loaded.
+        with open(self._idx_path(task_id), "rb") as ih:
+            ih.seek(lo * _IDX.size)
+            raw = ih.read((head - lo + 1) * _IDX.size)
+        entries = [_IDX.unpack_from(raw, i * _IDX.size) for i in range(len(raw) // _IDX.size)]
+        order = reversed(entries) if reverse else iter(entries)
+        with open(self._log_path(task_id), "rb") as fh:
+            for offset, length in order:
+                yield self._read_raw(fh, offset, length)
+
+    def iter_task_events(
+        self,
+        task_id: str,
+        *,
+        from_seq: int = 0,
+        to_seq: Optional[int] = None,
+        reverse: bool = False,
+        types: Optional[Iterable[str]] = None,
+    ) -> Iterator[Event]:
+        """
+        Lazily yield indexed events as Event records, decoding each record on demand.
+        """
+        wanted = None if types is None else frozenset(str(t) for t in types)
+        for raw in self._iter_raw(task_id, from_seq, reverse, to_seq):
+            ev = Event.from_json(raw)
+            if wanted is None or str(ev.get("type")) in wanted:
+                yield ev
+
+    def list_events(
+        self,
+        task_id: str,
+        *,
+        from_seq: int = 0,
+        to_seq: Optional[int] = None,
+        limit: Optional[int] = None,
+        reverse: bool = False,
+    ) -> Tuple[Dict[str, Any], ...]:
+        raws = self._iter_raw(task_id, from_seq, reverse, to_seq)
+        return tuple(json.loads(raw) for raw in itertools.islice(raws, limit))
+
+    def count_events(self, task_id: str) -> int:
+        return self._head(task_id) + 1
+
+    def list_tasks(self) -> List[str]:
+        d = self.root / "segments"
+        if not d.exists():
+            return []
+        return sorted(p.name for p in d.iterdir() if p.is_dir())
+
+    def verify_chain(self, task_id: str) -> bool:
+        """
+        Verify sha256 fields and prev_sha256 chaining for a task, streaming one event at a time.
+        """
+        return verify_event_chain(json.loads(raw) for raw in self._iter_raw(task_id, 0, False))
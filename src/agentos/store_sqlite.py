@@ -0,0 +1,231 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from agentos.canonical import canonical_json
+from agentos.event import Event
+from agentos.store_fs import EventRef, SequenceConflictError, build_event, verify_event_chain
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS events (
+        task_id TEXT NOT NULL,
+        seq INTEGER NOT NULL,
+        ts_utc TEXT NOT NULL,
+        type TEXT NOT NULL,
+        prev_sha256 TEXT,
+        sha256 TEXT NOT NULL,
+        event_json TEXT NOT NULL,
+        PRIMARY KEY (task_id, seq)
+    ) WITHOUT ROWID
+    """,
+    "CREATE INDEX IF NOT EXISTS events_by_type ON events(type, ts_utc)",
+    "CREATE INDEX IF NOT EXISTS events_by_ts ON events(ts_utc)",
+    """
+    CREATE TRIGGER IF NOT EXISTS events_no_update BEFORE UPDATE ON events
+    BEGIN SELECT RAISE(ABORT, 'events are append-only'); END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS events_no_delete BEFORE DELETE ON events
+    BEGIN SELECT RAISE(ABORT, 'events are append-only'); END
+    """,
+)
+
+
+class SQLiteStore:
+    """
+    Append-only SQLite (WAL) event store.
+
+    Implements the same append_event/list_events/read_event/verify_chain contract and
+    hash chain as FSStore, plus iter_task_events for rebuild_task_state.
+
+    Layout:
+      store/events.sqlite3   -> events(task_id, seq) table, unique per (task_id, seq)
+
+    Append-only is enforced by triggers; indexed lookups by task, type and time avoid
+    directory walks entirely.
+    """
+
+    def __init__(self, root: str = "store") -> None:
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.db_path = self.root / "events.sqlite3"
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA busy_timeout=30000")
+        for stmt in _SCHEMA:
+            self._conn.execute(stmt)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def append_event(
+        self, task_id: str, type_: str, body: Dict[str, Any], *, expected_seq: Optional[int] = None
+    ) -> EventRef:
+        """
+        Append an event to a task stream. Deterministic serialization, explicit sha256.
+        """
+        return self.append_events(task_id, [(type_, body)], expected_seq=expected_seq)[0]
+
+    def append_events(
+        self,
+        task_id: str,
+        events: Sequence[Tuple[str, Dict[str, Any]]],
+        *,
+        expected_seq: Optional[int] = None,
+    ) -> Tuple[EventRef, ...]:
+        """
+        Append several events to a task stream in one transaction.
+
+        BEGIN IMMEDIATE serializes writers across processes; (task_id, seq) uniqueness
+        is the backstop. expected_seq compares against the current head seq.
+        """
+        if not events:
+            return tuple()
+        with self._lock:
+            cur = self._conn.cursor()
+            cur.execute("BEGIN IMMEDIATE")
+            try:
+                row = cur.execute(
+                    "SELECT seq, sha256 FROM events WHERE task_id = ? ORDER BY seq DESC LIMIT 1",
+                    (task_id,),
+                ).fetchone()
+                prev_seq, prev_hash = (row[0], row[1]) if row else (-1, None)
+                if expected_seq is not None and expected_seq != prev_seq:
+                    raise SequenceConflictError(task_id, expected_seq, prev_seq)
+                sealed = []
+                for i, (type_, body) in enumerate(events):
+                    event = build_event(task_id, prev_seq + 1 + i, type_, body, prev_hash)
+                    prev_hash = event["sha256"]
+                    sealed.append(event)
+                cur.executemany(
+                    "INSERT INTO events (task_id, seq, ts_utc, type, prev_sha256, sha256, event_json) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    [
+                        (task_id, ev["seq"], ev["ts_utc"], ev["type"], ev["prev_sha256"], ev["sha256"], canonical_json(ev))
+                        for ev in sealed
+                    ],
+                )
+                cur.execute("COMMIT")
+            except BaseException:
+                cur.execute("ROLLBACK")
+                raise
+        return tuple(
+            EventRef(task_id=task_id, seq=int(ev["seq"]), sha256=str(ev["sha256"]), path=str(self.db_path))
+            for ev in sealed
+        )
+
+    def read_event(self, task_id: str, seq: int) -> Dict[str, Any]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT event_json FROM events WHERE task_id = ? AND seq = ?", (task_id, seq)
+            ).fetchone()
+        if row is None:
+            raise FileNotFoundError(f"{self.db_path}#{task_id}/{seq}")
+        return json.loads(row[0])
+
+    def iter_task_events(
+        self,
+        task_id: str,
+        *,
+        from_seq: int = 0,
+        to_seq: Optional[int] = None,
+        reverse: bool = False,
+        types: Optional[Iterable[str]] = None,
+    ) -> Iterator[Event]:
+        """
+        Yield Event records in seq order (or reverse), filtered in SQL by seq range and types.
+        """
+        sql = "SELECT event_json FROM events WHERE task_id = ? AND seq >= ?"
+        args: List[Any] = [task_id, max(0, from_seq)]
+        if to_seq is not None:
+            sql += " AND seq <= ?"
+            args.append(int(to_seq))
+        if types is not None:
+            wanted = sorted(set(str(t) for t in types))
+            if not wanted:
+                return
+            sql += " AND type IN (" + ",".join("?" for _ in wanted) + ")"
+            args.extend(wanted)
+        sql += " ORDER BY seq DESC" if reverse else " ORDER BY seq"
+        with self._lock:
+            rows = self._conn.execute(sql, args).fetchall()
+        for r in rows:
+            yield Event.from_json(r[0])
+
+    def list_events(
+        self,
+        task_id: str,
+        *,
+        from_seq: int = 0,
+        to_seq: Optional[int] = None,
+        limit: Optional[int] = None,
+        reverse: bool = False,
+    ) -> Tuple[Dict[str, Any], ...]:
+        sql = "SELECT event_json FROM events WHERE task_id = ? AND seq >= ?"
+        args: List[Any] = [task_id, max(0, from_seq)]
+        if to_seq is not None:
+            sql += " AND seq <= ?"
+            args.append(int(to_seq))
+        sql += " ORDER BY seq DESC" if reverse else " ORDER BY seq"
+        if limit is not None:
+            sql += " LIMIT ?"
+            args.append(int(limit))
+        with self._lock:
+            rows = self._conn.execute(sql, args).fetchall()
+        return tuple(json.loads(r[0]) for r in rows)
+
+    def count_events(self, task_id: str) -> int:
+        with self._lock:
+            row = self._conn.execute("SELECT MAX(seq) FROM events WHERE task_id = ?", (task_id,)).fetchone()
+        return 0 if row[0] is None else int(row[0]) + 1
+
+    def list_tasks(self) -> List[str]:
+        with self._lock:
+            rows = self._conn.execute("SELECT DISTINCT task_id FROM events ORDER BY task_id").fetchall()
+        return [r[0] for r in rows]
+
+    def query_events(
+        self,
+        *,
+        type_: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> Tuple[Dict[str, Any], ...]:
+        """
+        Indexed lookup across all tasks by event type and/or ts_utc range [since, until).
+        """
+        where: List[str] = []
+        args: List[Any] = []
+        if type_ is not None:
+            where.append("type = ?")
+            args.append(type_)
+        if since is not None:
+            where.append("ts_utc >= ?")
+            args.append(since)
+        if until is not None:
+            where.append("ts_utc < ?")
+            args.append(until)
+        sql = "SELECT event_json FROM events"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY ts_utc, task_id, seq"
+        if limit is not None:
+            sql += " LIMIT ?"
+            args.append(int(limit))
+        with self._lock:
+            rows = self._conn.execute(sql, args).fetchall()
+        return tuple(json.loads(r[0]) for r in rows)
+
+    def verify_chain(self, task_id: str) -> bool:
+        """
+        Verify sha256 fields and prev_sha256 chaining for a task.
+        """
+        return verify_event_chain(self.list_events(task_id))
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from agentos.canonical import canonical_json
+from agentos.store_fs import FSStore, verify_event_chain
+
+
+def _marks_path(root: str) -> Path:
+    return Path(root) / "index" / "verified.json"
+
+
+def load_marks(root: str) -> Dict[str, Dict[str, Any]]:
+    """
+    Load per-task "verified up to seq N / sha X" marks. Missing or unreadable -> empty.
+    """
+    p = _marks_path(root)
+    if not p.exists():
+        return {}
+    try:
+        obj = json.loads(p.read_text(encoding="utf-8"))
+    except ValueError:
+        return {}
+    marks = obj.get("marks") if isinstance(obj, dict) else None
+    return dict(marks) if isinstance(marks, dict) else {}
+
+
+def _write_marks(root: str, marks: Dict[str, Dict[str, Any]]) -> None:
+    p = _marks_path(root)
+    p.parent.mkdir(parents=True, exist_ok=True)
+    tmp = p.with_suffix(f".json.{os.getpid()}.tmp")
+    tmp.write_text(canonical_json({"marks": marks}), encoding="utf-8")
+    os.replace(tmp, p)
+
+
+def verify_task_incremental(store: FSStore, task_id: str, mark: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Verify one task chain, hashing only events after a prior mark.
+
+    The marked event itself is re-read and re-hashed so the new tail is anchored to
+    the exact event that was verified before; any mismatch fails the task.
+    """
+    anchor: Optional[str] = None
+    from_seq = 0
+    try:
+        if mark is not None:
+            ev = store.read_event(task_id, int(mark["seq"]))
+            if ev.get("sha256") != mark.get("sha256") or not verify_event_chain([ev], anchor_sha256=ev.get("prev_sha256")):
+                return {"task_id": task_id, "ok": False, "reason": "mark_anchor_mismatch", "hashed": 1}
+            anchor = str(mark["sha256"])
+            from_seq = int(mark["seq"]) + 1
+        tail = list(store.iter_task_events(task_id, from_seq=from_seq))
+    except Exception as e:
+        return {"task_id": task_id, "ok": False, "reason": f"read_error:{e.__class__.__name__}", "hashed": 0}
+
+    if not verify_event_chain(tail, anchor_sha256=anchor):
+        return {"task_id": task_id, "ok": False, "reason": "chain_invalid", "hashed": len(tail)}
+    new_mark = mark
+    if tail:
+        new_mark = {"seq": int(tail[-1]["seq"]), "sha256": str(tail[-1]["sha256"])}
+    return {"task_id": task_id, "ok": True, "reason": "ok", "hashed": len(tail), "mark": new_mark}
+
+
+def _verify_worker(args: Tuple[str, str, Optional[Dict[str, Any]]]) -> Dict[str, Any]:
+    root, task_id, mark = args
+    return verify_task_incremental(FSStore(root=root), task_id, mark)
+
+
+def verify_store(root: str, *, jobs: int = 1, full: bool = False) -> Dict[str, Any]:
+    """
+    Verify every task chain in an FSStore and return a machine-readable report.
+
+    jobs > 1 spreads tasks over a process pool. Unless full=True, tasks resume from
+    their recorded marks; marks are advanced for tasks that verify and dropped for
+    tasks that fail so they are re-hashed from seq 0 next time.
+    """
+    t0 = time.perf_counter()
+    store = FSStore(root=root)
+    marks = {} if full else load_marks(root)
+    work = [(root, t, marks.get(t)) for t in store.list_tasks()]
+
+    if jobs > 1 and len(work) > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            results = list(pool.map(_verify_worker, work, chunksize=max(1, len(work) // (jobs * 4))))
+    else:
+        results = [_verify_worker(w) for w in work]
+
+    new_marks = load_marks(root)
+    failed: List[Dict[str, str]] = []
+    for r in results:
+        if r["ok"]:
+            if r.get("mark") is not None:
+                new_marks[r["task_id"]] = r["mark"]
+        else:
+            new_marks.pop(r["task_id"], None)
+            failed.append({"task_id": r["task_id"], "reason": r["reason"]})
+    _write_marks(root, new_marks)
+
+    return {
+        "ok": not failed,
+        "root": str(root),
+        "tasks": len(results),
+        "tasks_ok": len(results) - len(failed),
+        "failed": failed,
+        "events_hashed": sum(int(r["hashed"]) for r in results),
+        "full": bool(full),
+        "jobs": int(jobs),
+        "elapsed_s": round(time.perf_counter() - t0, 6),
+    }
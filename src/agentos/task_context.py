@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import dataclasses
+from dataclasses import dataclass
+from typing import Any, Dict, Mapping, Optional
+
+from agentos.execution import ExecutionSpec
+from agentos.fsm import rebuild_task_state
+from agentos.task import TaskState
+
+# The event types whose bodies routing and running read (TaskContext.body).
+_BODY_TYPES = ("TASK_CREATED", "TASK_VERIFIED")
+
+
+@dataclass(frozen=True)
+class TaskContext:
+    """
+    Everything one route or run needs about a task: its state and the TASK_CREATED and
+    TASK_VERIFIED events whose bodies it reads.
+
+    load() takes the state from rebuild_task_state, so the sidecar, snapshot cache and
+    checkpoints apply (fail-closed, FSMViolationError propagates); route and run are
+    writer paths, so a long replay persists a checkpoint. The two bodies come from a
+    type-filtered scan that stops once both are found. The runner adds the
+    ExecutionSpec it builds (with_spec) so the idempotency patch and the original
+    run_dispatched share it instead of re-reading the store.
+
+    A context describes the stream at head_seq only; is_current() is the O(1) check
+    callers make before trusting it after taking a lock.
+    """
+
+    task_id: str
+    snapshot: Mapping[str, Any]
+    head_seq: int
+    first_events: Mapping[str, Mapping[str, Any]]
+    spec: Optional[ExecutionSpec] = None
+    spec_sha256: Optional[str] = None
+
+    @classmethod
+    def load(cls, store: Any, task_id: str) -> "TaskContext":
+        # HEAD is read first: if an append lands before the replay, the context reports
+        # the older head and is_current() sends the caller back to reload.
+        head_seq = store.count_events(task_id) - 1
+        snapshot = rebuild_task_state(store, task_id, persist=True)
+        first: Dict[str, Mapping[str, Any]] = {}
+        for ev in store.iter_task_events(task_id, to_seq=head_seq, types=_BODY_TYPES):
+            first.setdefault(str(ev.get("type")), ev)
+            if len(first) == len(_BODY_TYPES):
+                break
+        return cls(task_id=task_id, snapshot=snapshot, head_seq=head_seq, first_events=first)
+
+    @property
+    def state(self) -> TaskState:
+        return TaskState(str(self.snapshot["state"]))
+
+    def is_current(self, store: Any) -> bool:
+        return store.count_events(self.task_id) - 1 == self.head_seq
+
+    def with_spec(self, spec: ExecutionSpec) -> "TaskContext":
+        return dataclasses.replace(self, spec=spec, spec_sha256=spec.spec_sha256())
+
+    def body(self, type_: str) -> Dict[str, Any]:
+        """
+        Body of the first event of type_; fail-closed if absent or not an object.
+        """
+        ev = self.first_events.get(type_)
+        if ev is None:
+            raise RuntimeError(f"missing {type_} event")
+        body = ev.get("body")
+        if not isinstance(body, dict):
+            raise TypeError(f"{type_} body must be an object")
+        return body
+
+    def verified_inputs_manifest_sha256(self) -> str:
+        ims = self.body("TASK_VERIFIED").get("inputs_manifest_sha256")
+        if not isinstance(ims, str) or not ims:
+            raise TypeError("TASK_VERIFIED body.inputs_manifest_sha256 must be a non-empty string")
+        return ims
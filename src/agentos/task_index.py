@@ -0,0 +1,281 @@
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+import uuid
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Set
+
+from agentos.fsm import next_state
+from agentos.task import TaskState
+
+# Derived state recorded once a stream contains an event the FSM would reject.
+FSM_VIOLATION = "FSM_VIOLATION"
+
+_COLUMNS = ("task_id", "state", "last_type", "last_seq", "last_sha256", "last_ts_utc", "role", "action")
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS tasks (
+        task_id TEXT PRIMARY KEY,
+        state TEXT NOT NULL,
+        last_type TEXT NOT NULL,
+        last_seq INTEGER NOT NULL,
+        last_sha256 TEXT NOT NULL,
+        last_ts_utc TEXT NOT NULL,
+        role TEXT,
+        action TEXT
+    ) WITHOUT ROWID
+    """,
+    "CREATE INDEX IF NOT EXISTS tasks_by_state ON tasks(state, last_ts_utc)",
+)
+
+
+def _fold(row: Optional[Dict[str, Any]], task_id: str, events: Iterable[Mapping[str, Any]]) -> Optional[Dict[str, Any]]:
+    """
+    Advance an index row over events (seq order). Pure; no store access.
+    """
+    out = dict(row) if row is not None else None
+    for ev in events:
+        if out is None:
+            out = {"task_id": task_id, "state": TaskState.CREATED.value, "role": None, "action": None}
+        state = out["state"]
+        if state != FSM_VIOLATION:
+            nxt = next_state(TaskState(state), str(ev.get("type")))
+            out["state"] = FSM_VIOLATION if nxt is None else nxt.value
+        # Only decode the body while role/action are still unknown.
+        body = ev.get("body") if out["role"] is None or out["action"] is None else None
+        if isinstance(body, dict):
+            if out["role"] is None and isinstance(body.get("role"), str):
+                out["role"] = body["role"]
+            if out["action"] is None and isinstance(body.get("action"), str):
+                out["action"] = body["action"]
+        out["last_type"] = str(ev.get("type"))
+        out["last_seq"] = int(ev["seq"])
+        out["last_sha256"] = str(ev.get("sha256"))
+        out["last_ts_utc"] = str(ev.get("ts_utc"))
+    return out
+
+
+class TaskIndex:
+    """
+    Secondary index: task_id -> current derived state and last event metadata.
+
+    Layout:
+      store/index/tasks.sqlite3   -> tasks(task_id PK, state, last_type, last_seq,
+                                           last_sha256, last_ts_utc, role, action)
+
+    Derived, never authoritative: routing decisions still replay the FSM. Rows are
+    advanced on each append and can always be rebuilt from the event log.
+
+    An append whose row update fails is still committed; the task is then marked
+    dirty (store/index/DIRTY, one task id per line) and resync() recomputes its row
+    from the log. FSStore(index=True) resyncs on open; readers that need a current
+    answer (e.g. agentos.worker) resync before querying, and catch_up() also picks
+    up appends made through a store opened without the index.
+    """
+
+    def __init__(self, root: str = "store") -> None:
+        self.root = Path(root)
+        d = self.root / "index"
+        d.mkdir(parents=True, exist_ok=True)
+        self.db_path = d / "tasks.sqlite3"
+        self.dirty_path = d / "DIRTY"
+        self._lock = threading.Lock()
+        # Marks whose DIRTY write failed; retried by the next resync() in this process.
+        self._dirty_mem: set = set()
+        self._conn = sqlite3.connect(str(self.db_path), isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA busy_timeout=30000")
+        for stmt in _SCHEMA:
+            self._conn.execute(stmt)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _get_row(self, task_id: str) -> Optional[Dict[str, Any]]:
+        row = self._conn.execute(
+            f"SELECT {', '.join(_COLUMNS)} FROM tasks WHERE task_id = ?", (task_id,)
+        ).fetchone()
+        return None if row is None else dict(zip(_COLUMNS, row))
+
+    def _put_row(self, row: Dict[str, Any]) -> None:
+        self._conn.execute(
+            f"INSERT OR REPLACE INTO tasks ({', '.join(_COLUMNS)}) VALUES ({', '.join('?' for _ in _COLUMNS)})",
+            tuple(row[c] for c in _COLUMNS),
+        )
+
+    def apply(
+        self,
+        task_id: str,
+        events: Sequence[Mapping[str, Any]],
+        *,
+        history: Callable[[], Iterable[Mapping[str, Any]]],
+    ) -> None:
+        """
+        Advance the row for task_id over newly appended events in one transaction.
+
+        If the row does not end exactly before events[0] (appends made without the
+        index, or a lost update), the row is recomputed from history() instead.
+        """
+        if not events:
+            return
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._get_row(task_id)
+                last_seq = -1 if row is None else int(row["last_seq"])
+                if last_seq == int(events[0]["seq"]) - 1:
+                    new = _fold(row, task_id, events)
+                else:
+                    new = _fold(None, task_id, history())
+                if new is not None:
+                    self._put_row(new)
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def mark_dirty(self, task_id: str) -> None:
+        """
+        Record that task_id's row may be behind the log. Never raises.
+        """
+        with self._lock:
+            self._dirty_mem.add(task_id)
+        try:
+            fd = os.open(str(self.dirty_path), os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o600)
+            try:
+                os.write(fd, f"{task_id}\n".encode("utf-8"))
+            finally:
+                os.close(fd)
+        except OSError:
+            return
+        with self._lock:
+            self._dirty_mem.discard(task_id)
+
+    def is_dirty(self) -> bool:
+        return bool(self._dirty_mem) or any(self.dirty_path.parent.glob(f"{self.dirty_path.name}*"))
+
+    def _recompute(self, task_id: str, events: Iterable[Mapping[str, Any]]) -> None:
+        new = _fold(None, task_id, events)
+        if new is None:
+            return
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._get_row(task_id)
+                # An append that committed after our read already wrote a newer row.
+                if row is None or int(row["last_seq"]) <= int(new["last_seq"]):
+                    self._put_row(new)
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def resync(self, store: Any) -> int:
+        """
+        Recompute the rows of every task marked dirty. Returns the number of tasks.
+
+        The DIRTY file is renamed aside before it is read, so marks written meanwhile
+        land in a fresh file. Each work file is claimed by renaming it to a name of our
+        own, so concurrent resyncs never read or delete the same file; one that vanished
+        was claimed by another resync, which recomputes its rows. A resync that fails
+        leaves its work files for the next one.
+        """
+        if not self.is_dirty():
+            return 0
+        task_ids: Set[str] = set()
+        claimed: List[Path] = []
+        with self._lock:
+            task_ids.update(self._dirty_mem)
+            self._dirty_mem.clear()
+            candidates = [self.dirty_path] + sorted(self.dirty_path.parent.glob(f"{self.dirty_path.name}.*.work"))
+            for p in candidates:
+                mine = self.dirty_path.with_name(f"{self.dirty_path.name}.{uuid.uuid4().hex}.work")
+                try:
+                    os.replace(p, mine)
+                    data = mine.read_text(encoding="utf-8")
+                except FileNotFoundError:
+                    continue
+                claimed.append(mine)
+                task_ids.update(t for t in data.split() if t)
+        try:
+            for task_id in sorted(task_ids):
+                self._recompute(task_id, store.iter_task_events(task_id))
+        except BaseException:
+            with self._lock:
+                self._dirty_mem.update(task_ids)
+            raise
+        for p in claimed:
+            try:
+                p.unlink()
+            except FileNotFoundError:
+                pass
+        return len(task_ids)
+
+    def catch_up(self, store: Any, task_ids: Optional[Iterable[str]] = None) -> int:
+        """
+        Recompute rows that are missing or behind the task's HEAD, i.e. tasks appended
+        to through a store opened without index=True. Returns the number of tasks.
+
+        Costs one count_events (a HEAD read on FSStore) per task; task_ids defaults to
+        store.list_tasks().
+        """
+        with self._lock:
+            known = {r[0]: int(r[1]) for r in self._conn.execute("SELECT task_id, last_seq FROM tasks").fetchall()}
+        n = 0
+        for task_id in (store.list_tasks() if task_ids is None else task_ids):
+            if known.get(task_id, -1) < store.count_events(task_id) - 1:
+                self._recompute(task_id, store.iter_task_events(task_id))
+                n += 1
+        return n
+
+    def rebuild(self, store: Any) -> int:
+        """
+        Recompute every row from the store's event log. Returns the number of tasks.
+        """
+        rows = []
+        for task_id in store.list_tasks():
+            row = _fold(None, task_id, store.iter_task_events(task_id))
+            if row is not None:
+                rows.append(row)
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute("DELETE FROM tasks")
+                for row in rows:
+                    self._put_row(row)
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return len(rows)
+
+    def get(self, task_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self._get_row(task_id)
+
+    def tasks_in_state(self, state: str, *, limit: Optional[int] = None) -> List[str]:
+        sql = "SELECT task_id FROM tasks WHERE state = ? ORDER BY task_id"
+        args: List[Any] = [str(state)]
+        if limit is not None:
+            sql += " LIMIT ?"
+            args.append(int(limit))
+        with self._lock:
+            return [r[0] for r in self._conn.execute(sql, args).fetchall()]
+
+    def count_by_state(self, *, since: Optional[str] = None) -> Dict[str, int]:
+        """
+        Count tasks per current state; since restricts to last_ts_utc >= since.
+        """
+        sql = "SELECT state, COUNT(*) FROM tasks"
+        args: List[Any] = []
+        if since is not None:
+            sql += " WHERE last_ts_utc >= ?"
+            args.append(since)
+        sql += " GROUP BY state ORDER BY state"
+        with self._lock:
+            return {r[0]: int(r[1]) for r in self._conn.execute(sql, args).fetchall()}
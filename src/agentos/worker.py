@@ -0,0 +1,362 @@
+from __future__ import annotations
+
+import copy
+import json
+import os
+import socket
+import threading
+import time
+import uuid
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from agentos.canonical import canonical_json
+from agentos.fsm import FSMViolationError, rebuild_task_state
+from agentos.runner import RunSummary, TaskRunner
+from agentos.store_fs import exclusive_file_lock
+from agentos.task import TaskState
+from agentos.task_context import TaskContext
+
+
+@dataclass(frozen=True)
+class Lease:
+    task_id: str
+    owner: str
+    token: str
+    expires_at: float
+
+
+class LeaseStore:
+    """
+    Time-bounded execution leases, one file per task.
+
+    Layout:
+      <store root>/leases/<task_id>.json   # {"task_id","owner","token","expires_at",...}
+      <store root>/leases/LOCK             # fcntl lock serialising claim/renew/release
+
+    A lease says which worker owns a task's execution until expires_at; holders renew
+    it while running. An expired lease may be claimed by anyone, so a task whose worker
+    crashed before RUN_STARTED is picked up again after one lease period. A crash after
+    RUN_STARTED is not recovered: the task stays RUNNING, which no worker polls for,
+    and its idempotency lock refuses a retry. Leases are coordination, not authority:
+    the FSM and the idempotency lock still refuse a second run of the same task.
+    """
+
+    def __init__(self, root: str, *, clock: Callable[[], float] = time.time) -> None:
+        self.dir = Path(root) / "leases"
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self._clock = clock
+
+    def _path(self, task_id: str) -> Path:
+        return self.dir / f"{task_id}.json"
+
+    def _read(self, task_id: str) -> Optional[Dict[str, Any]]:
+        try:
+            obj = json.loads(self._path(task_id).read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return None
+        except ValueError:
+            # A torn or garbled lease protects nothing; treat it as expired.
+            return {"expires_at": 0.0}
+        return obj if isinstance(obj, dict) else {"expires_at": 0.0}
+
+    def _write(self, lease: Lease, **extra: Any) -> None:
+        p = self._path(lease.task_id)
+        tmp = self.dir / f".{lease.task_id}.{uuid.uuid4().hex}.tmp"
+        obj = {
+            "task_id": lease.task_id,
+            "owner": lease.owner,
+            "token": lease.token,
+            "expires_at": lease.expires_at,
+            **extra,
+        }
+        tmp.write_text(canonical_json(obj), encoding="utf-8")
+        os.replace(tmp, p)
+
+    def get(self, task_id: str) -> Optional[Dict[str, Any]]:
+        return self._read(task_id)
+
+    def is_held(self, task_id: str) -> bool:
+        cur = self._read(task_id)
+        return cur is not None and float(cur.get("expires_at", 0.0)) > self._clock()
+
+    def claim(self, task_id: str, owner: str, ttl_s: float) -> Optional[Lease]:
+        """
+        Take the lease if nobody holds a live one; None if it is held.
+        """
+        with exclusive_file_lock(self.dir / "LOCK"):
+            now = self._clock()
+            cur = self._read(task_id)
+            if cur is not None and float(cur.get("expires_at", 0.0)) > now:
+                return None
+            lease = Lease(task_id=task_id, owner=owner, token=uuid.uuid4().hex, expires_at=now + ttl_s)
+            self._write(lease, acquired_at=now)
+            return lease
+
+    def renew(self, lease: Lease, ttl_s: float) -> Optional[Lease]:
+        """
+        Extend a lease we still hold; None if it expired and was taken over (or released).
+        """
+        with exclusive_file_lock(self.dir / "LOCK"):
+            cur = self._read(lease.task_id)
+            if cur is None or cur.get("token") != lease.token:
+                return None
+            renewed = Lease(task_id=lease.task_id, owner=lease.owner, token=lease.token, expires_at=self._clock() + ttl_s)
+            self._write(renewed, acquired_at=cur.get("acquired_at"))
+            return renewed
+
+    def release(self, lease: Lease) -> bool:
+        """
+        Drop the lease if it is still ours; a lease taken over by another worker is left alone.
+        """
+        with exclusive_file_lock(self.dir / "LOCK"):
+            cur = self._read(lease.task_id)
+            if cur is None or cur.get("token") != lease.token:
+                return False
+            self._path(lease.task_id).unlink()
+            return True
+
+
+@dataclass
+class WorkerReport:
+    """
+    What one Worker.run() did. errors maps task_id -> "<ExceptionClass>:<message>" for
+    runs that raised; lease_lost lists tasks whose lease could not be renewed mid-run.
+    """
+
+    owner: str
+    workers: int
+    summaries: List[RunSummary] = field(default_factory=list)
+    errors: Dict[str, str] = field(default_factory=dict)
+    lease_lost: List[str] = field(default_factory=list)
+    skipped: int = 0
+    polls: int = 0
+    wall_s: float = 0.0
+    stopped: bool = False
+
+    def to_obj(self) -> Dict[str, Any]:
+        return {
+            "owner": self.owner,
+            "workers": int(self.workers),
+            "runs": len(self.summaries) + len(self.errors),
+            "ok": sum(1 for s in self.summaries if s.ok),
+            "failed": sum(1 for s in self.summaries if not s.ok),
+            "errors": dict(sorted(self.errors.items())),
+            "lease_lost": sorted(self.lease_lost),
+            "skipped": int(self.skipped),
+            "polls": int(self.polls),
+            "wall_s": round(self.wall_s, 6),
+            "stopped": bool(self.stopped),
+        }
+
+
+# States from which a task can still become (or is) DISPATCHED.
+_PRE_RUN_STATES = frozenset(s.value for s in (TaskState.CREATED, TaskState.VERIFIED, TaskState.DISPATCHED))
+
+
+def default_owner() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class Worker:
+    """
+    Executes DISPATCHED tasks claimed through leases, up to `workers` at a time.
+
+    The loop polls for DISPATCHED tasks: the store's task index when it has one (swept
+    for appends it missed on the first poll and every sweep_s), otherwise a scan that
+    replays only tasks whose HEAD moved since the last poll and skips tasks already
+    past DISPATCHED. It claims a lease per task, re-checks the state under the lease
+    and hands the task to TaskRunner.run_dispatched on its own shallow copy of the
+    runner, as run_many does. A heartbeat thread renews every held lease each
+    heartbeat_s while the run is in flight; the lease is released when the run returns
+    or raises.
+
+    request_stop() (wired to SIGTERM by tools/run_worker.py) stops claiming new tasks;
+    run() then drains the runs already in flight and returns. Several Worker processes
+    may share one store: leases keep them off each other's tasks and the FSM keeps a
+    task from running twice even if a lease is lost. A task left RUNNING by a crashed
+    worker is not retried (see LeaseStore).
+    """
+
+    def __init__(
+        self,
+        runner: TaskRunner,
+        *,
+        workers: int = 1,
+        lease_s: float = 60.0,
+        heartbeat_s: Optional[float] = None,
+        poll_s: float = 1.0,
+        owner: Optional[str] = None,
+        leases: Optional[LeaseStore] = None,
+        sweep_s: float = 60.0,
+    ) -> None:
+        if workers < 1:
+            raise ValueError("workers must be >= 1")
+        if lease_s <= 0:
+            raise ValueError("lease_s must be > 0")
+        self.runner = runner
+        self.store = runner.store
+        self.workers = int(workers)
+        self.lease_s = float(lease_s)
+        self.heartbeat_s = float(heartbeat_s) if heartbeat_s is not None else self.lease_s / 3.0
+        if not 0 < self.heartbeat_s < self.lease_s:
+            raise ValueError("heartbeat_s must be > 0 and < lease_s")
+        self.poll_s = float(poll_s)
+        self.owner = owner or default_owner()
+        self.leases = leases if leases is not None else LeaseStore(str(self.store.root))
+        self._stop = threading.Event()
+        self._held: Dict[str, Lease] = {}
+        self._held_lock = threading.Lock()
+        self.sweep_s = float(sweep_s)
+        self._next_sweep = 0.0
+        # Replay scan cache: task_id -> (event count, state) as of the last poll.
+        self._scanned: Dict[str, Tuple[int, str]] = {}
+
+    def request_stop(self) -> None:
+        self._stop.set()
+
+    @property
+    def stopping(self) -> bool:
+        return self._stop.is_set()
+
+    def dispatched_tasks(self) -> List[str]:
+        """
+        Task ids currently DISPATCHED, in task id order.
+        """
+        # Archived tasks are terminal; skip unpacking them when the store can tell.
+        list_tasks = getattr(self.store, "loose_tasks", None) or self.store.list_tasks
+        index = getattr(self.store, "index", None)
+        if index is not None:
+            # Failed row updates are marked dirty; resync is a no-op unless one was.
+            index.resync(self.store)
+            # Appends made through a store opened without index=True leave no row (or an
+            # old one); those are caught up by a sweep on the first poll and every sweep_s.
+            now = time.monotonic()
+            if now >= self._next_sweep:
+                index.catch_up(self.store, list_tasks())
+                self._next_sweep = now + self.sweep_s
+            return index.tasks_in_state(TaskState.DISPATCHED.value)
+        out = []
+        scanned: Dict[str, Tuple[int, str]] = {}
+        for task_id in list_tasks():
+            prev = self._scanned.get(task_id)
+            if prev is not None and prev[1] not in _PRE_RUN_STATES:
+                # A task never returns to DISPATCHED once it has left it.
+                scanned[task_id] = prev
+                continue
+            count = self.store.count_events(task_id)
+            if prev is not None and prev[0] == count:
+                state = prev[1]
+            else:
+                try:
+                    state = rebuild_task_state(self.store, task_id)["state"]
+                except (FSMViolationError, FileNotFoundError, ValueError):
+                    continue
+            scanned[task_id] = (count, state)
+            if state == TaskState.DISPATCHED.value:
+                out.append(task_id)
+        self._scanned = scanned
+        return out
+
+    def _claim(self, task_id: str) -> Optional[Lease]:
+        lease = self.leases.claim(task_id, self.owner, self.lease_s)
+        if lease is None:
+            return None
+        # The scan may be stale: another worker can have run the task and released its lease.
+        try:
+            current = TaskContext.load(self.store, task_id).state is TaskState.DISPATCHED
+        except (FSMViolationError, FileNotFoundError, ValueError):
+            current = False
+        if not current:
+            self.leases.release(lease)
+            return None
+        with self._held_lock:
+            self._held[task_id] = lease
+        return lease
+
+    def _run_one(self, task_id: str) -> RunSummary:
+        try:
+            return copy.copy(self.runner).run_dispatched(task_id)
+        finally:
+            with self._held_lock:
+                lease = self._held.pop(task_id, None)
+            if lease is not None:
+                self.leases.release(lease)
+
+    def _heartbeat(self, done: threading.Event, report: WorkerReport) -> None:
+        while not done.wait(self.heartbeat_s):
+            with self._held_lock:
+                held = list(self._held.values())
+            for lease in held:
+                renewed = self.leases.renew(lease, self.lease_s)
+                with self._held_lock:
+                    if self._held.get(lease.task_id) is not lease:
+                        continue  # finished while we were renewing
+                    if renewed is None:
+                        del self._held[lease.task_id]
+                        report.lease_lost.append(lease.task_id)
+                    else:
+                        self._held[lease.task_id] = renewed
+
+    def run(self, *, idle_exit: bool = False) -> WorkerReport:
+        """
+        Claim and run DISPATCHED tasks until request_stop(), then drain and return.
+
+        With idle_exit the loop also ends once nothing is in flight and a poll finds no
+        task it can claim (drain the current backlog and exit).
+        """
+        report = WorkerReport(owner=self.owner, workers=self.workers)
+        inflight: Dict[Future, str] = {}
+        # A run that raised leaves the task DISPATCHED (rejections append no event);
+        # trying it again would only be refused again, so each task gets one attempt.
+        # A task never returns to DISPATCHED, so ids are dropped once it leaves.
+        attempted: Set[str] = set()
+        hb_done = threading.Event()
+        hb = threading.Thread(target=self._heartbeat, args=(hb_done, report), name="agentos-lease-hb", daemon=True)
+        hb.start()
+        t0 = time.perf_counter()
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="agentos-worker") as pool:
+                while not self._stop.is_set():
+                    claimed = 0
+                    if len(inflight) < self.workers:
+                        report.polls += 1
+                        dispatched = self.dispatched_tasks()
+                        attempted.intersection_update(dispatched)
+                        for task_id in dispatched:
+                            if len(inflight) >= self.workers or self._stop.is_set():
+                                break
+                            if task_id in attempted:
+                                continue
+                            if self._claim(task_id) is None:
+                                report.skipped += 1
+                                continue
+                            attempted.add(task_id)
+                            inflight[pool.submit(self._run_one, task_id)] = task_id
+                            claimed += 1
+                    if not inflight:
+                        if idle_exit and claimed == 0:
+                            break
+                        self._stop.wait(self.poll_s)
+                        continue
+                    finished, _ = wait(list(inflight), timeout=self.poll_s, return_when=FIRST_COMPLETED)
+                    self._collect(finished, inflight, report)
+                # Drain: no new claims, let in-flight runs finish and release their leases.
+                self._collect(wait(list(inflight)).done, inflight, report)
+        finally:
+            hb_done.set()
+            hb.join()
+        report.stopped = self._stop.is_set()
+        report.wall_s = time.perf_counter() - t0
+        return report
+
+    @staticmethod
+    def _collect(finished: Any, inflight: Dict[Future, str], report: WorkerReport) -> None:
+        for f in finished:
+            task_id = inflight.pop(f)
+            try:
+                report.summaries.append(f.result())
+            except Exception as e:
+                report.errors[task_id] = f"{e.__class__.__name__}:{e}"
@@ -13,11 +13,13 @@ def test_evaluate_task_appends_event_and_writes_bundle(tmp_path):
     task_id = 't_eval_1'
     exec_id = 'e1'
 
-    store.append_event(task_id, 'TASK_CREATED', {'role':'envoy','action':'weekly_proof','attempt':0})
-    store.append_event(task_id, 'TASK_VERIFIED', {'role':'envoy','action':'weekly_proof','inputs_manifest_sha256':'x','attempt':0})
-    store.append_event(task_id, 'TASK_DISPATCHED', {'role':'envoy','action':'weekly_proof','attempt':0,'inputs_manifest_sha256':'x'})
-    store.append_event(task_id, 'RUN_STARTED', {'exec_id':exec_id,'spec_sha256':'a'*64,'inputs_manifest_sha256':'x','kind':'shell'})
-    store.append_event(task_id, 'RUN_SUCCEEDED', {'exec_id':exec_id,'spec_sha256':'a'*64,'exit_code':0,'stdout_sha256':'b'*64,'stderr_sha256':'c'*64,'outputs_manifest_sha256':'d'*64})
+    store.append_events(task_id, [
+        ('TASK_CREATED', {'role':'envoy','action':'weekly_proof','attempt':0}),
+        ('TASK_VERIFIED', {'role':'envoy','action':'weekly_proof','inputs_manifest_sha256':'x','attempt':0}),
+        ('TASK_DISPATCHED', {'role':'envoy','action':'weekly_proof','attempt':0,'inputs_manifest_sha256':'x'}),
+        ('RUN_STARTED', {'exec_id':exec_id,'spec_sha256':'a'*64,'inputs_manifest_sha256':'x','kind':'shell'}),
+        ('RUN_SUCCEEDED', {'exec_id':exec_id,'spec_sha256':'a'*64,'exit_code':0,'stdout_sha256':'b'*64,'stderr_sha256':'c'*64,'outputs_manifest_sha256':'d'*64}),
+    ])
 
     bundle_dir = ev_root / task_id / exec_id
     bundle_dir.mkdir(parents=True, exist_ok=True)
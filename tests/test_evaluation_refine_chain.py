@@ -6,21 +6,22 @@ from agentos.evaluation import evaluate_task
 from agentos.fsm import rebuild_task_state
 
 def _emit_minimal_completed(store: FSStore, task_id: str):
-    store.append_event(task_id, "TASK_CREATED", {"task_id": task_id})
-    store.append_event(task_id, "TASK_VERIFIED", {"task_id": task_id})
-    store.append_event(task_id, "TASK_DISPATCHED", {"task_id": task_id})
-    store.append_event(task_id, "RUN_STARTED", {"task_id": task_id})
-    store.append_event(
-        task_id,
-        "RUN_SUCCEEDED",
-        {
-            "task_id": task_id,
-            "exec_id": "weekly_proof",
-            "spec_sha256": "specsha",
-            "exit_code": 0,
-            "manifest_sha256": "manisha",
-        },
-    )
+    store.append_events(task_id, [
+        ("TASK_CREATED", {"task_id": task_id}),
+        ("TASK_VERIFIED", {"task_id": task_id}),
+        ("TASK_DISPATCHED", {"task_id": task_id}),
+        ("RUN_STARTED", {"task_id": task_id}),
+        (
+            "RUN_SUCCEEDED",
+            {
+                "task_id": task_id,
+                "exec_id": "weekly_proof",
+                "spec_sha256": "specsha",
+                "exit_code": 0,
+                "manifest_sha256": "manisha",
+            },
+        ),
+    ])
 
 def test_evaluate_refine_emits_refinement_task_id(tmp_path: Path):
     store = FSStore(str(tmp_path / "events"))
@@ -15,47 +15,49 @@ def _emit_completed_with_run_summary(tmp_path: Path, store: FSStore, task_id: st
     """Creates a fresh task that reaches EVALUATED (bootstrap only)."""
     evidence_root = str(tmp_path / "evidence")
     
-    store.append_event(task_id, "TASK_CREATED", {
-        "role": "envoy",
-        "action": "deterministic_local_execution",
-        "payload": {
+    store.append_events(task_id, [
+        ("TASK_CREATED", {
+            "role": "envoy",
+            "action": "deterministic_local_execution",
+            "payload": {
+                "exec_id": "e1",
+                "kind": "shell",
+                "cmd_argv": ["true"],
+                "cwd": ".",
+                "env_allowlist": [],
+                "timeout_s": 1,
+                "inputs_manifest_sha256": "x",
+                "paths_allowlist": []
+            },
+            "attempt": 0
+        }),
+        ("TASK_VERIFIED", {
+            "role": "envoy",
+            "action": "deterministic_local_execution",
+            "inputs_manifest_sha256": "a"*64,
+            "attempt": 0
+        }),
+        ("TASK_DISPATCHED", {
+            "role": "envoy",
+            "action": "deterministic_local_execution",
+            "attempt": 0,
+            "inputs_manifest_sha256": "a"*64
+        }),
+        ("RUN_STARTED", {
             "exec_id": "e1",
-            "kind": "shell",
-            "cmd_argv": ["true"],
-            "cwd": ".",
-            "env_allowlist": [],
-            "timeout_s": 1,
-            "inputs_manifest_sha256": "x",
-            "paths_allowlist": []
-        },
-        "attempt": 0
-    })
-    store.append_event(task_id, "TASK_VERIFIED", {
-        "role": "envoy",
-        "action": "deterministic_local_execution",
-        "inputs_manifest_sha256": "a"*64,
-        "attempt": 0
-    })
-    store.append_event(task_id, "TASK_DISPATCHED", {
-        "role": "envoy",
-        "action": "deterministic_local_execution",
-        "attempt": 0,
-        "inputs_manifest_sha256": "a"*64
-    })
-    store.append_event(task_id, "RUN_STARTED", {
-        "exec_id": "e1",
-        "spec_sha256": "b"*64,
-        "inputs_manifest_sha256": "a"*64,
-        "kind": "shell"
-    })
-    store.append_event(task_id, "RUN_SUCCEEDED", {
-        "exec_id": "e1",
-        "spec_sha256": "b"*64,
-        "exit_code": 0,
-        "stdout_sha256": "c"*64,
-        "stderr_sha256": "d"*64,
-        "outputs_manifest_sha256": "e"*64
-    })
+            "spec_sha256": "b"*64,
+            "inputs_manifest_sha256": "a"*64,
+            "kind": "shell"
+        }),
+        ("RUN_SUCCEEDED", {
+            "exec_id": "e1",
+            "spec_sha256": "b"*64,
+            "exit_code": 0,
+            "stdout_sha256": "c"*64,
+            "stderr_sha256": "d"*64,
+            "outputs_manifest_sha256": "e"*64
+        }),
+    ])
     
     p = Path(evidence_root) / task_id / "e1"
     p.mkdir(parents=True, exist_ok=True)
@@ -74,16 +76,18 @@ def _advance_to_evaluated(tmp_path: Path, store: FSStore, task_id: str, evidence
         return
     
     if current_state in (TaskState.CREATED, TaskState.VERIFIED):
-        store.append_event(task_id, "TASK_DISPATCHED", {
-            "role": "envoy", "action": "deterministic_local_execution", "attempt": 0, "inputs_manifest_sha256": "a"*64
-        })
-        store.append_event(task_id, "RUN_STARTED", {
-            "exec_id": "e1", "spec_sha256": "b"*64, "inputs_manifest_sha256": "a"*64, "kind": "shell"
-        })
-        store.append_event(task_id, "RUN_SUCCEEDED", {
-            "exec_id": "e1", "spec_sha256": "b"*64, "exit_code": 0,
-            "stdout_sha256": "c"*64, "stderr_sha256": "d"*64, "outputs_manifest_sha256": "e"*64
-        })
+        store.append_events(task_id, [
+            ("TASK_DISPATCHED", {
+                "role": "envoy", "action": "deterministic_local_execution", "attempt": 0, "inputs_manifest_sha256": "a"*64
+            }),
+            ("RUN_STARTED", {
+                "exec_id": "e1", "spec_sha256": "b"*64, "inputs_manifest_sha256": "a"*64, "kind": "shell"
+            }),
+            ("RUN_SUCCEEDED", {
+                "exec_id": "e1", "spec_sha256": "b"*64, "exit_code": 0,
+                "stdout_sha256": "c"*64, "stderr_sha256": "d"*64, "outputs_manifest_sha256": "e"*64
+            }),
+        ])
         
         p = Path(evidence_root) / task_id / "e1"
         p.mkdir(parents=True, exist_ok=True)
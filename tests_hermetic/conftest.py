@@ -4,3 +4,5 @@ from pathlib import Path
 root = Path(__file__).resolve().parents[1]
 src = root / "src"
 sys.path.insert(0, str(src))
+# Tests drive the CLI tools in tools/ by importing their main().
+sys.path.insert(1, str(root))
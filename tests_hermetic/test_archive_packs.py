@@ -0,0 +1,164 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from agentos.archive import archive_terminal_tasks
+from agentos.evidence import EvidenceBundle
+from agentos.execution import ExecutionSpec
+from agentos.fsm import rebuild_task_state
+from agentos.outcome import ExecutionOutcome
+from agentos.packs import PackStore
+from agentos.store_fs import FSStore
+from tools.archive_tasks import main as archive_main
+from tools.validate_evidence import main as validate_main
+
+_CONTRACT = str(Path(__file__).resolve().parents[1] / "ci" / "evidence_contract.v1.json")
+
+_RUN = {"exec_id": "e1", "spec_sha256": "b" * 64, "inputs_manifest_sha256": "a" * 64, "kind": "shell"}
+
+
+def _prefix(store, task_id):
+    store.append_events(task_id, [
+        ("TASK_CREATED", {"role": "envoy", "action": "deterministic_local_execution", "attempt": 0}),
+        ("TASK_VERIFIED", {"role": "envoy", "action": "deterministic_local_execution", "attempt": 0}),
+        ("TASK_DISPATCHED", {"role": "envoy", "action": "deterministic_local_execution", "attempt": 0}),
+        ("RUN_STARTED", dict(_RUN)),
+    ])
+
+
+def _failed_task(tmp_path, store, ev_root, task_id):
+    _prefix(store, task_id)
+    store.append_event(task_id, "RUN_FAILED", {"exec_id": "e1", "spec_sha256": "b" * 64, "exit_code": 1})
+    EvidenceBundle(str(ev_root)).write_bundle(
+        spec=ExecutionSpec(
+            exec_id="e1", task_id=task_id, role="envoy", action="deterministic_local_execution",
+            kind="shell", cmd_argv=["/bin/false"], cwd=str(tmp_path), env_allowlist=[], timeout_s=1,
+            inputs_manifest_sha256="00" * 32, paths_allowlist=[str(tmp_path)],
+        ),
+        stdout=b"", stderr=b"boom\n", outputs={}, outcome=ExecutionOutcome.FAILED, reason="nonzero_exit",
+    )
+
+
+def _setup(tmp_path):
+    store = FSStore(str(tmp_path / "store"))
+    ev_root = tmp_path / "store" / "evidence"
+    _failed_task(tmp_path, store, ev_root, "t_failed")
+    _prefix(store, "t_running")
+    return store, ev_root
+
+
+def test_archive_moves_terminal_tasks_into_packs(tmp_path):
+    store, ev_root = _setup(tmp_path)
+    before = store.list_events("t_failed")
+
+    report = archive_terminal_tasks(store)
+    assert report["task_ids"] == ["t_failed"] and report["archived"] == 1
+    assert report["events_packed"] == 5 and report["evidence_files_packed"] > 0
+    assert not (tmp_path / "store" / "events" / "t_failed").exists()
+    assert not (ev_root / "t_failed").exists()
+    assert (tmp_path / "store" / "events" / "t_running" / "HEAD").exists()
+    assert not list((tmp_path / "store" / "packs").glob("*.tmp"))
+
+    reopened = FSStore(str(tmp_path / "store"))
+    assert reopened.list_tasks() == ["t_failed", "t_running"]
+    assert reopened.list_events("t_failed") == before
+    assert reopened.read_event("t_failed", 4)["type"] == "RUN_FAILED"
+    assert reopened.verify_chain("t_failed")
+    assert rebuild_task_state(reopened, "t_failed")["state"] == "FAILED"
+    with pytest.raises(RuntimeError, match="task_archived"):
+        reopened.append_event("t_failed", "TASK_CREATED", {})
+
+    summary = json.loads(EvidenceBundle(str(ev_root)).read_bundle_file("t_failed", "e1", "run_summary.json"))
+    assert summary["outcome"] == "FAILED"
+    with pytest.raises(FileExistsError):
+        _failed_task(tmp_path, FSStore(str(tmp_path / "other")), ev_root, "t_failed")
+
+
+def test_archive_is_idempotent_and_dry_run_writes_nothing(tmp_path, capsys):
+    store, _ = _setup(tmp_path)
+    assert archive_main(["--root", str(tmp_path / "store"), "--dry-run"]) == 0
+    out = json.loads(capsys.readouterr().out)
+    assert out["task_ids"] == ["t_failed"] and out["archived"] == 0
+    assert not (tmp_path / "store" / "packs").exists()
+
+    assert archive_main(["--root", str(tmp_path / "store"), "--codec", "zlib"]) == 0
+    assert json.loads(capsys.readouterr().out)["archived"] == 1
+    assert archive_terminal_tasks(FSStore(str(tmp_path / "store")))["archived"] == 0
+
+
+def test_packed_evidence_validates(tmp_path, capsys):
+    store, ev_root = _setup(tmp_path)
+    archive_terminal_tasks(store)
+    assert validate_main(["validate_evidence.py", "--evidence-root", str(ev_root), "--contract", _CONTRACT]) == 0
+    assert "packed_tasks=1" in capsys.readouterr().out
+
+
+def test_corrupt_pack_entry_fails_closed(tmp_path):
+    store, _ = _setup(tmp_path)
+    archive_terminal_tasks(store, codec="zlib")
+    (pack,) = (tmp_path / "store" / "packs").glob("pack-*.pack")
+    data = bytearray(pack.read_bytes())
+    data[len(data) // 2] ^= 0xFF
+    pack.write_bytes(bytes(data))
+    ps = PackStore(tmp_path / "store" / "packs")
+    with pytest.raises(RuntimeError, match="pack_entry_corrupt"):
+        ps.get("t_failed")
+    with pytest.raises(RuntimeError, match="pack_entry_corrupt"):
+        FSStore(str(tmp_path / "store")).list_events("t_failed")
+
+
+def test_write_pack_streams_entries_and_cleans_up(tmp_path):
+    ps = PackStore(tmp_path / "packs")
+    assert ps.write_pack(iter(())) is None
+
+    def entries():
+        yield "a", b"x" * 1000
+        raise OSError("read failed")
+
+    with pytest.raises(OSError):
+        ps.write_pack(entries())
+    assert not list((tmp_path / "packs").glob("pack-*")) and not ps.has("a")
+
+    assert ps.write_pack((k, k.encode()) for k in ("b", "c")) is not None
+    assert ps.get("c") == b"c"
+
+
+def test_batch_shares_packs_and_rerun_counts_only_new_entries(tmp_path, monkeypatch):
+    store, ev_root = _setup(tmp_path)
+    _failed_task(tmp_path, store, ev_root, "t_failed2")
+
+    def crash(self, task_id):
+        raise OSError("interrupted")
+
+    monkeypatch.setattr(FSStore, "remove_loose_task", crash)
+    with pytest.raises(OSError):
+        archive_terminal_tasks(store)
+    monkeypatch.undo()
+    assert len(list((tmp_path / "store" / "packs").glob("pack-*.pack"))) == 1
+    assert len(list((ev_root / "packs").glob("pack-*.pack"))) == 1
+
+    # Everything was already packed, so the re-run writes no entries, only cleans up.
+    report = archive_terminal_tasks(FSStore(str(tmp_path / "store")))
+    assert report["archived"] == 2
+    assert report["events_packed"] == 0 and report["evidence_files_packed"] == 0
+    assert len(list((tmp_path / "store" / "packs").glob("pack-*.pack"))) == 1
+    assert FSStore(str(tmp_path / "store")).loose_tasks() == ["t_running"]
+
+
+def test_archived_stream_is_inflated_once_per_store(tmp_path, monkeypatch):
+    store, _ = _setup(tmp_path)
+    archive_terminal_tasks(store)
+    gets = []
+    real_get = PackStore.get
+
+    def counting_get(self, key):
+        gets.append(key)
+        return real_get(self, key)
+
+    monkeypatch.setattr(PackStore, "get", counting_get)
+    reopened = FSStore(str(tmp_path / "store"))
+    assert rebuild_task_state(reopened, "t_failed", cache=False)["state"] == "FAILED"
+    assert reopened.count_events("t_failed") == 5 and reopened.read_event("t_failed", 4)["type"] == "RUN_FAILED"
+    assert reopened.verify_chain("t_failed")
+    assert gets == ["t_failed"]
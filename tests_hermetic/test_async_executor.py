@@ -0,0 +1,122 @@
+import asyncio
+import os
+import sys
+import threading
+import time
+from uuid import uuid4
+
+import pytest
+
+from agentos.canonical import sha256_hex
+from agentos.capabilities.idempotency import IdempotencyStore
+from agentos.execution import ExecutionSpec
+from agentos.executor import AsyncLocalExecutor, LocalExecutor
+from agentos.fsm import rebuild_task_state
+from agentos.pipeline import verify_task
+from agentos.router import ExecutionRouter
+from agentos.runner import TaskRunner
+from agentos.store_fs import FSStore
+from agentos.task import Task, TaskState
+
+_PY_DIR = os.path.dirname(os.path.realpath(sys.executable))
+
+
+def _spec(tmp_path, argv, *, timeout_s=5, allow=None):
+    return ExecutionSpec(
+        exec_id="e1", task_id="t_exec", role="envoy", action="deterministic_local_execution",
+        kind="shell", cmd_argv=argv, cwd=str(tmp_path), env_allowlist=[], timeout_s=timeout_s,
+        inputs_manifest_sha256="00" * 32,
+        paths_allowlist=allow if allow is not None else [str(tmp_path), "/bin", "/usr/bin", _PY_DIR],
+    )
+
+
+def test_async_capture_is_byte_identical_to_blocking_run(tmp_path):
+    code = (
+        "import sys\n"
+        "sys.stdout.buffer.write(bytes(range(256)) * 4096)\n"
+        "sys.stderr.buffer.write(b'err\\x00\\xff' * 1000)\n"
+        "sys.exit(3)\n"
+    )
+    spec = _spec(tmp_path, [os.path.realpath(sys.executable), "-c", code])
+    sync = LocalExecutor().run(spec)
+    res = asyncio.run(AsyncLocalExecutor().run_async(spec))
+    assert (res.exit_code, res.stdout, res.stderr) == (sync.exit_code, sync.stdout, sync.stderr)
+    assert res.exit_code == 3 and len(res.stdout) == 256 * 4096
+
+
+def test_async_timeout_exits_124_with_partial_output(tmp_path):
+    spec = _spec(tmp_path, ["/bin/sh", "-c", "echo early; sleep 5"], timeout_s=1)
+    t0 = time.monotonic()
+    res = asyncio.run(AsyncLocalExecutor().run_async(spec))
+    assert time.monotonic() - t0 < 4
+    assert res.exit_code == 124 and res.stdout == b"early\n"
+
+
+def test_async_preflight_matches_blocking(tmp_path):
+    spec = _spec(tmp_path, ["/bin/echo", "x"], allow=["/bin", "/usr/bin"])
+    with pytest.raises(PermissionError, match="cwd_not_allowlisted"):
+        asyncio.run(AsyncLocalExecutor().run_async(spec))
+
+
+def _dispatch(store, tmp_path, task_id, argv):
+    payload = {
+        "exec_id": "e1",
+        "kind": "shell",
+        "cmd_argv": argv,
+        "cwd": str(tmp_path),
+        "env_allowlist": [],
+        "timeout_s": 5,
+        "inputs_manifest_sha256": sha256_hex(b"{}"),
+        "paths_allowlist": [str(tmp_path), "/bin", "/usr/bin"],
+    }
+    task = Task(task_id=task_id, state=TaskState.CREATED, role="envoy", action="deterministic_local_execution", payload=payload)
+    assert verify_task(store, task).ok
+    assert ExecutionRouter(store).route(task).ok
+
+
+def test_run_many_async_supervises_children_concurrently(tmp_path):
+    store = FSStore(str(tmp_path / "store"))
+    ids = [f"t_async_{i}_{uuid4().hex[:8]}" for i in range(16)]
+    for t in ids:
+        _dispatch(store, tmp_path, t, ["/bin/sleep", "0.3"])
+    runner = TaskRunner(store, evidence_root=str(tmp_path / "evidence"))
+    runner._idempotency_store = IdempotencyStore(str(tmp_path / "idem"))
+
+    report = asyncio.run(runner.run_many_async(ids, max_concurrency=16))
+    obj = report.to_obj()
+    assert obj["ok"] == 16 and obj["errors"] == 0
+    assert report.wall_s < 0.5 * obj["task_s_total"]
+    for t in ids:
+        assert rebuild_task_state(store, t)["state"] == "COMPLETED"
+        assert store.verify_chain(t)
+
+    # The async path goes through the same idempotency guard as run_dispatched.
+    with pytest.raises(RuntimeError, match="Duplicate execution prevented"):
+        asyncio.run(runner.run_dispatched_async(ids[0]))
+
+
+def test_async_run_keeps_blocking_io_off_the_event_loop(tmp_path, monkeypatch):
+    store = FSStore(str(tmp_path / "store"))
+    task_id = f"t_offloop_{uuid4().hex[:8]}"
+    _dispatch(store, tmp_path, task_id, ["/bin/echo", "ok"])
+    runner = TaskRunner(store, evidence_root=str(tmp_path / "evidence"))
+    runner._idempotency_store = IdempotencyStore(str(tmp_path / "idem"))
+
+    threads = []
+    for cls, name in ((FSStore, "append_events"), (type(runner.evidence), "write_bundle"), (IdempotencyStore, "acquire_lock")):
+        real = getattr(cls, name)
+
+        def spy(self, *a, _real=real, **kw):
+            threads.append(threading.current_thread())
+            return _real(self, *a, **kw)
+
+        monkeypatch.setattr(cls, name, spy)
+
+    async def main():
+        loop_thread = threading.current_thread()
+        summary = await runner.run_dispatched_async(task_id)
+        return loop_thread, summary
+
+    loop_thread, summary = asyncio.run(main())
+    assert summary.ok
+    assert len(threads) >= 4 and loop_thread not in threads
@@ -0,0 +1,108 @@
+import threading
+
+import pytest
+
+from agentos.change_feed import ChangeFeed
+from agentos.store_fs import FSStore
+
+
+def test_appends_are_published_in_commit_order(tmp_path):
+    root = str(tmp_path / "store")
+    store = FSStore(root, feed=True)
+    store.append_event("t1", "TASK_CREATED", {})
+    store.append_events("t2", [("TASK_CREATED", {}), ("TASK_VERIFIED", {})])
+    store.append_event("t1", "TASK_VERIFIED", {})
+
+    recs = ChangeFeed(root).read(0)
+    assert [(r["task_id"], r["seq"]) for r in recs] == [("t1", 0), ("t2", 0), ("t2", 1), ("t1", 1)]
+    offsets = [r["offset"] for r in recs]
+    assert offsets == sorted(offsets) and offsets[0] == 0
+    assert all(a["next_offset"] == b["offset"] for a, b in zip(recs, recs[1:]))
+    assert recs[-1]["sha256"] == store.read_event("t1", 1)["sha256"]
+
+
+def test_resume_from_persisted_cursor(tmp_path):
+    root = str(tmp_path / "store")
+    store = FSStore(root, feed=True)
+    feed = ChangeFeed(root)
+    for i in range(3):
+        store.append_event(f"t{i}", "TASK_CREATED", {})
+    first = feed.read(feed.load_cursor("radar"), limit=2)
+    feed.commit_cursor("radar", first[-1]["next_offset"])
+
+    store.append_event("t9", "TASK_CREATED", {})
+    rest = feed.read(ChangeFeed(root).load_cursor("radar"))
+    assert [r["task_id"] for r in rest] == ["t2", "t9"]
+
+
+def test_invalid_consumer_name_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        ChangeFeed(str(tmp_path)).commit_cursor("../x", 0)
+
+
+def test_subscribe_blocks_until_new_records(tmp_path):
+    root = str(tmp_path / "store")
+    store = FSStore(root, feed=True)
+    feed = ChangeFeed(root)
+    got = []
+
+    def consume():
+        for rec in feed.subscribe(0, idle_timeout_s=2.0, poll_interval_s=0.01):
+            got.append(rec)
+            if len(got) == 2:
+                return
+
+    t = threading.Thread(target=consume)
+    t.start()
+    store.append_event("t1", "TASK_CREATED", {})
+    store.append_event("t1", "TASK_VERIFIED", {})
+    t.join(5)
+    assert [r["seq"] for r in got] == [0, 1]
+    assert feed.poll(got[-1]["next_offset"], timeout_s=0.05, poll_interval_s=0.01) == []
+
+
+def test_torn_tail_is_ignored_and_repaired(tmp_path):
+    root = str(tmp_path / "store")
+    store = FSStore(root, feed=True)
+    feed = ChangeFeed(root)
+    store.append_event("t1", "TASK_CREATED", {})
+    with open(feed.journal_path, "ab") as fh:
+        fh.write(b'{"task_id":"t1","se')
+    assert len(feed.read(0)) == 1
+    store.append_event("t1", "TASK_VERIFIED", {})
+    assert [r["seq"] for r in feed.read(0)] == [0, 1]
+
+
+def test_reconcile_publishes_missing_events(tmp_path):
+    root = str(tmp_path / "store")
+    FSStore(root, feed=True).append_event("t1", "TASK_CREATED", {})
+    plain = FSStore(root)
+    plain.append_event("t1", "TASK_VERIFIED", {})
+    plain.append_event("t2", "TASK_CREATED", {})
+
+    feed = ChangeFeed(root)
+    assert feed.reconcile(plain) == 2
+    assert feed.reconcile(plain) == 0
+    assert sorted((r["task_id"], r["seq"]) for r in feed.read(0)) == [("t1", 0), ("t1", 1), ("t2", 0)]
+
+
+def test_reconcile_fills_hole_in_middle_of_stream(tmp_path, monkeypatch):
+    root = str(tmp_path / "store")
+    store = FSStore(root, feed=True)
+    store.append_event("t1", "TASK_CREATED", {})
+
+    real_publish = ChangeFeed.publish
+
+    def failing_publish(self, events):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(ChangeFeed, "publish", failing_publish)
+    store.append_event("t1", "TASK_VERIFIED", {})  # committed; its feed publish is lost
+    monkeypatch.setattr(ChangeFeed, "publish", real_publish)
+    store.append_event("t1", "TASK_DISPATCHED", {})
+
+    feed = ChangeFeed(root)
+    assert [r["seq"] for r in feed.read(0)] == [0, 2]
+    assert feed.reconcile(store) == 1
+    assert feed.reconcile(store) == 0
+    assert sorted(r["seq"] for r in feed.read(0)) == [0, 1, 2]
@@ -0,0 +1,152 @@
+import threading
+
+import pytest
+
+import agentos.durability as durability_mod
+from agentos.durability import Durability, DurabilityMode, resolve_durability
+from agentos.evidence import EvidenceBundle
+from agentos.execution import ExecutionSpec
+from agentos.outcome import ExecutionOutcome
+from agentos.store_fs import FSStore
+
+
+@pytest.fixture
+def synced(monkeypatch):
+    calls = []
+    real = durability_mod._fsync_path
+
+    def record(path, *, directory):
+        calls.append((str(path), directory))
+        real(path, directory=directory)
+
+    monkeypatch.setattr(durability_mod, "_fsync_path", record)
+    return calls
+
+
+def test_unknown_mode_rejected():
+    with pytest.raises(ValueError):
+        Durability("sometimes")
+
+
+def test_mode_names_share_one_instance():
+    assert resolve_durability("group") is resolve_durability(DurabilityMode.GROUP)
+    d = Durability("fsync")
+    assert resolve_durability(d) is d
+
+
+def test_none_mode_never_syncs(tmp_path, synced):
+    FSStore(str(tmp_path / "store")).append_event("t1", "TASK_CREATED", {})
+    assert synced == []
+
+
+def test_fsync_mode_syncs_events_before_head(tmp_path, synced):
+    store = FSStore(str(tmp_path / "store"), durability="fsync")
+    store.append_events("t1", [("TASK_CREATED", {}), ("TASK_VERIFIED", {})])
+    paths = [p for p, _ in synced]
+    td = tmp_path / "store" / "events" / "t1"
+    head_i = paths.index(str(td / "HEAD"))
+    assert paths.index(str(store._event_path("t1", 0))) < head_i
+    assert paths.index(str(store._event_path("t1", 1))) < head_i
+    # The new task directory entry is persisted in events/ on first append.
+    assert (str(td.parent), True) in synced
+    assert paths[-1] == str(td)
+
+
+def test_group_mode_coalesces_concurrent_commits(tmp_path):
+    d = Durability("group", group_delay_s=0.02)
+    files = []
+    for i in range(8):
+        p = tmp_path / f"f{i}"
+        p.write_text("x")
+        files.append(p)
+    barrier = threading.Barrier(len(files))
+
+    def commit(p):
+        barrier.wait()
+        d.commit(files=[p], dirs=[tmp_path])
+
+    threads = [threading.Thread(target=commit, args=(p,)) for p in files]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert 1 <= d.flushes < len(files)
+
+
+def test_group_mode_error_reaches_every_waiter(tmp_path):
+    d = Durability("group", group_delay_s=0.02)
+    errors = []
+    barrier = threading.Barrier(4)
+
+    def commit():
+        barrier.wait()
+        try:
+            d.commit(files=[tmp_path / "missing"])
+        except FileNotFoundError as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=commit) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(errors) == 4
+    # Consumed by the last waiter, so failed generations do not accumulate.
+    assert d._errors == {} and d._waiting == {}
+
+
+class _HeadBarrierFails(Durability):
+    def commit(self, *, files=(), dirs=()):
+        if any(p.name == "HEAD" for p in files):
+            raise OSError("fsync HEAD")
+        super().commit(files=files, dirs=dirs)
+
+
+def test_failed_head_barrier_still_updates_index_and_feed(tmp_path):
+    store = FSStore(str(tmp_path / "store"), index=True, feed=True, durability=_HeadBarrierFails("fsync"))
+    with pytest.raises(OSError):
+        store.append_event("t1", "TASK_CREATED", {})
+    # HEAD is already published, so the event is visible and derived views must follow.
+    assert len(store.list_events("t1")) == 1
+    assert store.index.get("t1") is not None
+    assert [r["task_id"] for r in store.feed.read()] == ["t1"]
+
+
+def test_group_mode_store_appends_stay_valid(tmp_path):
+    store = FSStore(str(tmp_path / "store"), durability=Durability("group", group_delay_s=0.001))
+    threads = [
+        threading.Thread(target=lambda i=i: [store.append_event(f"t{i}", "X", {"n": n}) for n in range(10)])
+        for i in range(4)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    for i in range(4):
+        assert len(store.list_events(f"t{i}")) == 10
+        assert store.verify_chain(f"t{i}")
+
+
+def test_evidence_bundle_syncs_files_and_dirs(tmp_path, synced):
+    spec = ExecutionSpec(
+        exec_id="e1",
+        task_id="t1",
+        role="envoy",
+        action="deterministic_local_execution",
+        kind="shell",
+        cmd_argv=["/bin/echo", "hi"],
+        cwd=str(tmp_path),
+        env_allowlist=[],
+        timeout_s=1,
+        inputs_manifest_sha256="00" * 32,
+        paths_allowlist=[str(tmp_path)],
+    )
+    out = EvidenceBundle(str(tmp_path / "ev"), durability="fsync").write_bundle(
+        spec=spec, stdout=b"hi\n", stderr=b"", outputs={"a.txt": b"a"}, outcome=ExecutionOutcome.SUCCEEDED, reason="ok"
+    )
+    bundle_dir = out["bundle_dir"]
+    paths = {p for p, _ in synced}
+    assert f"{bundle_dir}/run_summary.json" in paths
+    assert f"{bundle_dir}/outputs/a.txt" in paths
+    assert (bundle_dir, True) in synced
+    assert (str(tmp_path / "ev" / "t1"), True) in synced
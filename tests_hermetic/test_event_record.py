@@ -0,0 +1,55 @@
+import pickle
+
+import pytest
+
+from agentos.canonical import canonical_json
+from agentos.event import Event
+from agentos.fsm import rebuild_task_state
+from agentos.store_fs import FSStore, build_event, verify_event_chain
+from agentos.store_segment import SegmentStore
+from agentos.store_sqlite import SQLiteStore
+
+
+def _sealed(body):
+    return build_event("t1", 0, "TASK_CREATED", body, None, ts_utc="2026-01-01T00:00:00Z")
+
+
+def test_round_trips_canonical_json_without_decoding_body():
+    ev = _sealed({"payload": {"note": 'has ,"prev_sha256": inside'}, "nested": {"prev_sha256": "x"}})
+    rec = Event.from_json(canonical_json(ev))
+    assert rec.type == "TASK_CREATED" and rec.seq == 0 and rec.sha256 == ev["sha256"]
+    assert rec._body_json is not None
+    assert rec == ev and rec.to_dict() == ev
+    assert verify_event_chain([rec])
+
+
+def test_immutable_and_body_copies_are_independent():
+    rec = Event.from_json(canonical_json(_sealed({"a": [1]})))
+    with pytest.raises(AttributeError):
+        rec.type = "X"
+    body = rec["body"]
+    body["a"].append(2)
+    assert rec["body"] == {"a": [1]}
+    assert not hasattr(rec, "__dict__")
+
+
+def test_non_canonical_and_extra_keys_fall_back_to_full_parse():
+    rec = Event.from_json('{"type": "X", "task_id": "t", "extra": 1}')
+    assert rec.get("type") == "X" and rec["extra"] == 1
+    assert "body" not in rec and "seq" not in rec
+    assert not verify_event_chain([rec])
+    assert pickle.loads(pickle.dumps(rec)) == rec
+
+
+@pytest.mark.parametrize("factory", [FSStore, SegmentStore, SQLiteStore])
+def test_stores_yield_records_and_list_dicts(tmp_path, factory):
+    store = factory(str(tmp_path / "store"))
+    store.append_events("t1", [("TASK_CREATED", {"p": 1}), ("TASK_VERIFIED", {})])
+    recs = list(store.iter_task_events("t1"))
+    assert all(isinstance(r, Event) for r in recs)
+    listed = store.list_events("t1")
+    assert all(type(e) is dict for e in listed)
+    assert [r.to_dict() for r in recs] == list(listed)
+    snap = rebuild_task_state(store, "t1")
+    assert snap["state"] == "VERIFIED"
+    assert snap["events"][0]["body"] == {"p": 1}
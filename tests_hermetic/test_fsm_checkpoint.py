@@ -0,0 +1,74 @@
+import json
+
+import pytest
+
+from agentos.fsm import FSMViolationError, rebuild_task_state
+from agentos.store_fs import FSStore
+
+_LIFECYCLE = ["TASK_CREATED", "TASK_VERIFIED", "TASK_DISPATCHED", "RUN_STARTED"]
+
+
+def _store(tmp_path):
+    store = FSStore(str(tmp_path / "store"))
+    store.append_events("t1", [(t, {}) for t in _LIFECYCLE])
+    return store
+
+
+def test_rebuild_writes_and_resumes_from_checkpoint(tmp_path):
+    store = _store(tmp_path)
+
+    snap = rebuild_task_state(store, "t1", checkpoint_every=3, persist=True)
+    assert snap["state"] == "RUNNING"
+    cp = store.load_checkpoint("t1")
+    assert (cp["seq"], cp["state"]) == (3, "RUNNING")
+
+    store.append_event("t1", "RUN_SUCCEEDED", {})
+    snap = rebuild_task_state(store, "t1", checkpoint_every=3, persist=True)
+    assert snap["state"] == "COMPLETED"
+    assert [e["type"] for e in snap["events"]] == ["RUN_SUCCEEDED"]
+
+
+def test_tampered_checkpoint_falls_back_to_full_replay(tmp_path):
+    store = _store(tmp_path)
+    rebuild_task_state(store, "t1", checkpoint_every=3, persist=True)
+
+    p = store._task_dir("t1") / "CHECKPOINT"
+    cp = json.loads(p.read_text(encoding="utf-8"))
+    cp["state"] = "COMPLETED"
+    p.write_text(json.dumps(cp), encoding="utf-8")
+
+    snap = rebuild_task_state(store, "t1", checkpoint_every=100)
+    assert snap["state"] == "RUNNING"
+    assert len(snap["events"]) == 4
+
+
+def test_checkpoint_anchor_must_match_chain(tmp_path):
+    store = _store(tmp_path)
+    rebuild_task_state(store, "t1", checkpoint_every=3, persist=True)
+
+    # Rewrite the anchor event: the checkpoint no longer matches the stored chain.
+    ev = store.read_event("t1", 3)
+    ev["body"] = {"forged": True}
+    store._event_path("t1", 3).write_text(json.dumps(ev), encoding="utf-8")
+
+    snap = rebuild_task_state(store, "t1", checkpoint_every=100)
+    assert len(snap["events"]) == 4
+
+
+def test_checkpoint_keeps_post_terminal_fail_closed(tmp_path):
+    store = _store(tmp_path)
+    store.append_events("t1", [("RUN_FAILED", {})])
+    assert rebuild_task_state(store, "t1", checkpoint_every=1, persist=True)["state"] == "FAILED"
+
+    store.append_event("t1", "TASK_EVALUATED", {})
+    with pytest.raises(FSMViolationError):
+        rebuild_task_state(store, "t1")
+
+
+def test_read_only_rebuild_writes_no_checkpoint(tmp_path):
+    store = _store(tmp_path)
+    rebuild_task_state(store, "t1", checkpoint_every=1)
+    assert store.load_checkpoint("t1") is None
+
+    store.write_checkpoint("t_missing", store.load_checkpoint("t1") or {"seq": 0})
+    assert not (tmp_path / "store" / "events" / "t_missing").exists()
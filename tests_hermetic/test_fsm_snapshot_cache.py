@@ -0,0 +1,79 @@
+import json
+
+from agentos.fsm import SNAPSHOT_CACHE, SnapshotCache, rebuild_task_state
+from agentos.store_fs import FSStore
+from agentos.store_mem import MemStore
+
+_LIFECYCLE = ["TASK_CREATED", "TASK_VERIFIED", "TASK_DISPATCHED"]
+
+
+def _store(tmp_path):
+    store = FSStore(str(tmp_path / "store"))
+    store.append_events("t1", [(t, {}) for t in _LIFECYCLE])
+    SNAPSHOT_CACHE.clear()
+    return store
+
+
+def test_repeat_rebuilds_hit_until_the_tail_moves(tmp_path):
+    store = _store(tmp_path)
+    first = rebuild_task_state(store, "t1")
+    hits = SNAPSHOT_CACHE.hits
+    second = rebuild_task_state(store, "t1")
+    assert SNAPSHOT_CACHE.hits == hits + 1
+    assert second == first and second["events"] is not first["events"]
+    second["events"].clear()
+    assert len(rebuild_task_state(store, "t1")["events"]) == 3
+
+    store.append_event("t1", "RUN_STARTED", {})
+    assert rebuild_task_state(store, "t1")["state"] == "RUNNING"
+    assert rebuild_task_state(store, "t1", cache=False)["state"] == "RUNNING"
+
+
+def test_forged_tail_is_never_served_from_cache(tmp_path):
+    store = _store(tmp_path)
+    rebuild_task_state(store, "t1")
+    ev = store.read_event("t1", 2)
+    ev["type"] = "TASK_REJECTED"
+    store._event_path("t1", 2).write_text(json.dumps(ev), encoding="utf-8")
+
+    hits = SNAPSHOT_CACHE.hits
+    assert rebuild_task_state(store, "t1")["state"] == "FAILED"
+    assert SNAPSHOT_CACHE.hits == hits
+
+
+def test_cache_is_bounded_lru():
+    cache = SnapshotCache(maxsize=2)
+    for i in range(3):
+        cache.put(("t", i, "s"), {"state": "CREATED", "events": []})
+    assert len(cache) == 2
+    assert cache.get(("t", 0, "s")) is None
+    assert cache.get(("t", 2, "s"))["state"] == "CREATED"
+
+
+def test_mutating_dict_events_does_not_corrupt_the_cache(tmp_path):
+    SNAPSHOT_CACHE.clear()
+    store = MemStore(str(tmp_path / "store"))
+    store.append_events("t1", [(t, {"k": [1]}) for t in _LIFECYCLE])
+
+    class DictStore:
+        # Yields plain dict events, as SQLiteStore and MemStore.list_events do.
+        def list_events(self, task_id):
+            return store.list_events(task_id)
+
+        def count_events(self, task_id):
+            return store.count_events(task_id)
+
+        def read_event(self, task_id, seq):
+            return store.read_event(task_id, seq)
+
+    dict_store = DictStore()
+    first = rebuild_task_state(dict_store, "t1")
+    first["events"][0]["type"] = "MUTATED"
+    first["events"][0]["body"]["k"].append(2)
+    hits = SNAPSHOT_CACHE.hits
+    hit = rebuild_task_state(dict_store, "t1")
+    assert SNAPSHOT_CACHE.hits == hits + 1
+    hit["events"][1]["body"]["k"].append(3)
+    again = rebuild_task_state(dict_store, "t1")
+    assert [e["type"] for e in again["events"]] == _LIFECYCLE
+    assert all(e["body"] == {"k": [1]} for e in again["events"])
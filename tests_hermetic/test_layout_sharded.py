@@ -0,0 +1,100 @@
+from pathlib import Path
+
+import pytest
+
+from agentos.evidence import EvidenceBundle
+from agentos.execution import ExecutionSpec
+from agentos.layout import SHARDED, load_layout, shard_parts, sharded_path
+from agentos.outcome import ExecutionOutcome
+from agentos.store_fs import FSStore
+from tools.migrate_layout import migrate
+from tools.validate_evidence import main as validate_main
+
+_CONTRACT = str(Path(__file__).resolve().parents[1] / "ci" / "evidence_contract.v1.json")
+
+
+def _spec(tmp_path, task_id, exec_id):
+    return ExecutionSpec(
+        exec_id=exec_id,
+        task_id=task_id,
+        role="envoy",
+        action="deterministic_local_execution",
+        kind="shell",
+        cmd_argv=["/bin/echo", "ok"],
+        cwd=str(tmp_path),
+        env_allowlist=[],
+        timeout_s=1,
+        inputs_manifest_sha256="00" * 32,
+        paths_allowlist=[str(tmp_path)],
+    )
+
+
+def _write_evidence(eb, tmp_path, task_id):
+    eb.write_bundle(
+        spec=_spec(tmp_path, task_id, "e1"), stdout=b"ok\n", stderr=b"", outputs={},
+        outcome=ExecutionOutcome.SUCCEEDED, reason="ok",
+    )
+    eb.write_rejection(task_id, reason="not_dispatched")
+    eb.write_verification_bundle(spec_sha256="ab" * 32, decisions={"0": "allow"}, reason="plan_verification")
+
+
+def test_sharded_store_layout_is_recorded_and_used(tmp_path):
+    root = tmp_path / "store"
+    store = FSStore(str(root), layout=SHARDED)
+    store.append_events("task-1", [("TASK_CREATED", {}), ("TASK_VERIFIED", {})])
+    a, b = shard_parts("task-1")
+    assert (root / "events" / a / b / "task-1" / "HEAD").exists()
+    assert load_layout(root) == SHARDED
+
+    reopened = FSStore(str(root))
+    assert reopened.layout == SHARDED
+    assert reopened.list_tasks() == ["task-1"]
+    assert reopened.verify_chain("task-1")
+
+
+def test_readers_resolve_mixed_layouts(tmp_path):
+    root = str(tmp_path / "store")
+    FSStore(root).append_event("old", "TASK_CREATED", {})
+    sharded = FSStore(root, layout=SHARDED)
+    sharded.append_event("new", "TASK_CREATED", {})
+    # Existing flat tasks keep their location; appends still land there.
+    sharded.append_event("old", "TASK_VERIFIED", {})
+    assert (tmp_path / "store" / "events" / "old" / "HEAD").exists()
+    assert FSStore(root).list_tasks() == ["new", "old"]
+    assert [e["seq"] for e in FSStore(root).list_events("old")] == [0, 1]
+
+
+def test_migrate_store_and_evidence_round_trip(tmp_path):
+    store_root, ev_root = tmp_path / "store", tmp_path / "evidence"
+    store = FSStore(str(store_root))
+    for t in ("t1", "t2"):
+        store.append_events(t, [("TASK_CREATED", {}), ("TASK_VERIFIED", {})])
+    _write_evidence(EvidenceBundle(str(ev_root)), tmp_path, "t1")
+
+    out = migrate(to=SHARDED, store_root=str(store_root), evidence_root=str(ev_root))
+    assert out["events_moved"] == 2 and out["evidence_tasks_moved"] == 1 and out["verification_moved"] == 1
+    assert not (store_root / "events" / "t1").exists()
+    assert sharded_path(store_root / "events", "t1").is_dir()
+    assert sharded_path(ev_root, "t1").joinpath("e1", "run_summary.json").is_file()
+    assert sharded_path(ev_root / "verify", "ab" * 32).is_dir()
+    assert FSStore(str(store_root)).list_tasks() == ["t1", "t2"]
+    assert EvidenceBundle(str(ev_root)).bundle_dir("t1", "e1") == sharded_path(ev_root, "t1") / "e1"
+    assert validate_main(["validate_evidence.py", "--evidence-root", str(ev_root), "--contract", _CONTRACT]) == 0
+
+    again = migrate(to=SHARDED, store_root=str(store_root), evidence_root=str(ev_root))
+    assert again["events_moved"] == 0
+
+    back = migrate(to="flat", store_root=str(store_root), evidence_root=str(ev_root))
+    assert back["events_moved"] == 2
+    assert (store_root / "events" / "t1" / "HEAD").exists()
+    assert sorted(p.name for p in (store_root / "events").iterdir()) == ["t1", "t2"]
+
+
+def test_sharded_evidence_writes_validate(tmp_path, capsys):
+    ev_root = tmp_path / "evidence"
+    eb = EvidenceBundle(str(ev_root), layout=SHARDED)
+    _write_evidence(eb, tmp_path, "t9")
+    assert validate_main(["validate_evidence.py", "--evidence-root", str(ev_root), "--contract", _CONTRACT]) == 0
+    assert "execution=1 verification=1 rejection=1" in capsys.readouterr().out
+    with pytest.raises(FileExistsError):
+        _write_evidence(EvidenceBundle(str(ev_root)), tmp_path, "t9")
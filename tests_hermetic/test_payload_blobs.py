@@ -0,0 +1,50 @@
+import pytest
+
+from agentos.blobs import PAYLOAD_INLINE_MAX, blob_store_for, resolve_payload
+from agentos.pipeline import verify_task
+from agentos.runner import TaskRunner
+from agentos.store_fs import FSStore
+from agentos.task import Task, TaskState
+
+_IMS = "0" * 64
+
+
+def _verify(store, task_id, payload):
+    task = Task(
+        task_id=task_id, state=TaskState.CREATED, role="morpheus", action="architecture",
+        payload=dict(payload, inputs_manifest_sha256=_IMS), attempt=0,
+    )
+    assert verify_task(store, task).ok
+    return store.list_events(task_id)[0]["body"]
+
+
+def test_small_payload_stays_inline(tmp_path):
+    store = FSStore(str(tmp_path / "store"))
+    body = _verify(store, "t_small", {"note": "x"})
+    assert body["payload"] == {"note": "x", "inputs_manifest_sha256": _IMS}
+    assert "payload_ref" not in body
+    assert not (tmp_path / "store" / "blobs").exists()
+
+
+def test_large_payload_is_stored_once_and_resolved_lazily(tmp_path):
+    store = FSStore(str(tmp_path / "store"))
+    big = {"blob": "y" * (2 * PAYLOAD_INLINE_MAX)}
+    body = _verify(store, "t_big", big)
+    assert "payload" not in body
+    ref = body["payload_ref"]
+    assert blob_store_for(store).has(ref["sha256"])
+    assert store.verify_chain("t_big")
+
+    assert _verify(store, "t_big2", big)["payload_ref"] == ref
+    assert len(list((tmp_path / "store" / "blobs").rglob("*"))) == 2  # one shard dir + one blob
+
+    assert resolve_payload(store, body) == dict(big, inputs_manifest_sha256=_IMS)
+    assert TaskRunner(store)._load_created_payload("t_big")["blob"] == big["blob"]
+
+
+def test_tampered_blob_fails_closed(tmp_path):
+    store = FSStore(str(tmp_path / "store"))
+    body = _verify(store, "t_big", {"blob": "z" * (2 * PAYLOAD_INLINE_MAX)})
+    blob_store_for(store).path(body["payload_ref"]["sha256"]).write_bytes(b"{}")
+    with pytest.raises(RuntimeError, match="blob_corrupt"):
+        resolve_payload(store, body)
@@ -0,0 +1,67 @@
+from uuid import uuid4
+
+from agentos.canonical import sha256_hex
+from agentos.capabilities.idempotency import IdempotencyStore
+from agentos.fsm import rebuild_task_state
+from agentos.pipeline import verify_task
+from agentos.router import ExecutionRouter
+from agentos.runner import TaskRunner
+from agentos.store_fs import FSStore
+from agentos.task import Task, TaskState
+
+
+def _dispatch(store, tmp_path, task_id, argv, *, route=True):
+    payload = {
+        "exec_id": "e1",
+        "kind": "shell",
+        "cmd_argv": argv,
+        "cwd": str(tmp_path),
+        "env_allowlist": [],
+        "timeout_s": 5,
+        "inputs_manifest_sha256": sha256_hex(b"{}"),
+        "paths_allowlist": [str(tmp_path), "/bin", "/usr/bin"],
+    }
+    task = Task(task_id=task_id, state=TaskState.CREATED, role="envoy", action="deterministic_local_execution", payload=payload)
+    assert verify_task(store, task).ok
+    if route:
+        assert ExecutionRouter(store).route(task).ok
+
+
+def _runner(store, tmp_path):
+    runner = TaskRunner(store, evidence_root=str(tmp_path / "evidence"))
+    runner._idempotency_store = IdempotencyStore(str(tmp_path / "idem"))
+    return runner
+
+
+def test_run_many_runs_concurrently_in_input_order(tmp_path):
+    store = FSStore(str(tmp_path / "store"))
+    ids = [f"t_many_{i}_{uuid4().hex[:8]}" for i in range(6)]
+    for t in ids:
+        _dispatch(store, tmp_path, t, ["/bin/sleep", "0.3"])
+
+    report = _runner(store, tmp_path).run_many(ids, max_workers=6)
+    assert [s.task_id for s in report.summaries] == ids
+    assert all(s.ok for s in report.summaries) and report.errors == (None,) * 6
+    obj = report.to_obj()
+    assert obj["ok"] == 6 and obj["errors"] == 0
+    # Six 0.3 s sleeps on six workers overlap instead of adding up.
+    assert report.wall_s < 0.6 * obj["task_s_total"]
+    for t in ids:
+        assert rebuild_task_state(store, t)["state"] == "COMPLETED"
+        assert store.verify_chain(t)
+
+
+def test_run_many_reports_rejections_per_task(tmp_path):
+    store = FSStore(str(tmp_path / "store"))
+    good = f"t_good_{uuid4().hex[:8]}"
+    idle = f"t_idle_{uuid4().hex[:8]}"
+    _dispatch(store, tmp_path, good, ["/bin/echo", "ok"])
+    _dispatch(store, tmp_path, idle, ["/bin/echo", "ok"], route=False)
+
+    report = _runner(store, tmp_path).run_many([idle, good, good], max_workers=3)
+    assert report.summaries[0] is None and "invalid_state:VERIFIED" in report.errors[0]
+    # The same task listed twice runs once; the idempotency guards reject the other.
+    assert sum(s is not None for s in report.summaries[1:]) == 1
+    assert sum(e is not None for e in report.errors[1:]) == 1
+    events = [e["type"] for e in store.list_events(good)]
+    assert events.count("RUN_STARTED") == 1 and events[-1] == "RUN_SUCCEEDED"
@@ -0,0 +1,84 @@
+import json
+
+import pytest
+
+from agentos.archive import archive_terminal_tasks
+from agentos.fsm import FSMViolationError, rebuild_task_state
+from agentos.store_fs import FSStore
+
+_LIFECYCLE = ["TASK_CREATED", "TASK_VERIFIED", "TASK_DISPATCHED", "RUN_STARTED"]
+
+
+def _store(tmp_path, **kw):
+    return FSStore(str(tmp_path / "store"), state_sidecar=True, **kw)
+
+
+def test_sidecar_tracks_appends_and_answers_without_replay(tmp_path):
+    store = _store(tmp_path)
+    store.append_events("t1", [(t, {}) for t in _LIFECYCLE[:2]])
+    store.append_events("t1", [(t, {}) for t in _LIFECYCLE[2:]])
+    sc = store.load_state_sidecar("t1")
+    assert (sc["seq"], sc["state"], sc["sha256"]) == (3, "RUNNING", store.read_event("t1", 3)["sha256"])
+
+    # A fresh process answers from the sidecar: early events are never read.
+    store._event_path("t1", 0).write_text("{not json", encoding="utf-8")
+    snap = rebuild_task_state(FSStore(str(tmp_path / "store")), "t1")
+    assert (snap["state"], snap["events"]) == ("RUNNING", [])
+
+
+def test_tampered_sidecar_falls_back_to_replay(tmp_path):
+    store = _store(tmp_path)
+    store.append_events("t1", [(t, {}) for t in _LIFECYCLE])
+    p = store._task_dir("t1") / "STATE"
+    sc = json.loads(p.read_text(encoding="utf-8"))
+    sc["state"] = "COMPLETED"
+    p.write_text(json.dumps(sc), encoding="utf-8")
+
+    snap = rebuild_task_state(store, "t1", checkpoint_every=100, persist=True)
+    assert snap["state"] == "RUNNING" and len(snap["events"]) == 4
+    assert store.load_state_sidecar("t1")["state"] == "RUNNING"
+
+
+def test_stale_sidecar_is_ignored_then_refreshed(tmp_path):
+    store = _store(tmp_path)
+    store.append_events("t1", [(t, {}) for t in _LIFECYCLE])
+    # A writer without the sidecar enabled moves HEAD past it.
+    FSStore(str(tmp_path / "store")).append_event("t1", "RUN_SUCCEEDED", {})
+    store.append_event("t1", "TASK_EVALUATED", {})
+    assert store.load_state_sidecar("t1")["seq"] == 3
+
+    snap = rebuild_task_state(store, "t1", checkpoint_every=100, persist=True)
+    assert snap["state"] == "EVALUATED" and len(snap["events"]) == 6
+    assert store.load_state_sidecar("t1")["seq"] == 5
+    assert rebuild_task_state(store, "t1")["events"] == []
+
+
+def test_read_only_rebuild_leaves_the_tree_untouched(tmp_path):
+    store = _store(tmp_path)
+    store.append_events("t1", [(t, {}) for t in _LIFECYCLE])
+    FSStore(str(tmp_path / "store")).append_event("t1", "RUN_SUCCEEDED", {})  # sidecar now stale
+    tree = {p: p.read_bytes() for p in (tmp_path / "store").rglob("*") if p.is_file()}
+
+    snap = rebuild_task_state(store, "t1", checkpoint_every=1, cache=False)
+    assert snap["state"] == "COMPLETED"
+    assert {p: p.read_bytes() for p in (tmp_path / "store").rglob("*") if p.is_file()} == tree
+
+
+def test_illegal_append_never_reaches_the_sidecar(tmp_path):
+    store = _store(tmp_path)
+    store.append_events("t1", [(t, {}) for t in _LIFECYCLE] + [("RUN_FAILED", {})])
+    store.append_event("t1", "TASK_EVALUATED", {})
+    assert store.load_state_sidecar("t1")["state"] == "FAILED"
+    with pytest.raises(FSMViolationError):
+        rebuild_task_state(store, "t1")
+
+
+def test_rebuild_of_archived_task_does_not_recreate_its_directory(tmp_path):
+    store = _store(tmp_path)
+    store.append_events("t1", [(t, {}) for t in _LIFECYCLE] + [("RUN_FAILED", {})])
+    assert archive_terminal_tasks(store)["archived"] == 1
+
+    reopened = _store(tmp_path)
+    assert rebuild_task_state(reopened, "t1", cache=False, persist=True)["state"] == "FAILED"
+    assert not (tmp_path / "store" / "events" / "t1").exists()
+    assert reopened.loose_tasks() == []
@@ -0,0 +1,53 @@
+import pytest
+
+from agentos.store_fs import FSStore
+from agentos.store_mem import MemStore
+from agentos.store_segment import SegmentStore
+
+
+@pytest.mark.parametrize("store_cls", [FSStore, SegmentStore, MemStore])
+def test_append_events_chains_batch(tmp_path, store_cls):
+    store = store_cls(str(tmp_path / "store"))
+    store.append_event("t1", "TASK_CREATED", {})
+
+    refs = store.append_events("t1", [("TASK_VERIFIED", {"a": 1}), ("TASK_DISPATCHED", {"b": 2})])
+
+    assert [r.seq for r in refs] == [1, 2]
+    events = store.list_events("t1")
+    assert [e["type"] for e in events] == ["TASK_CREATED", "TASK_VERIFIED", "TASK_DISPATCHED"]
+    assert events[2]["prev_sha256"] == refs[0].sha256
+    assert store.verify_chain("t1")
+
+
+def test_append_events_failure_leaves_nothing_behind(tmp_path, monkeypatch):
+    store = FSStore(str(tmp_path / "store"))
+    store.append_event("t1", "TASK_CREATED", {})
+    before = sorted(p.name for p in store._task_dir("t1").iterdir())
+
+    def boom(self, task_id, seq):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(FSStore, "_write_head_atomic", boom)
+    with pytest.raises(OSError):
+        store.append_events("t1", [("TASK_VERIFIED", {}), ("TASK_DISPATCHED", {})])
+    monkeypatch.undo()
+
+    assert sorted(p.name for p in store._task_dir("t1").iterdir()) == before
+    ref = store.append_event("t1", "TASK_VERIFIED", {})
+    assert ref.seq == 1
+    assert store.verify_chain("t1")
+
+
+def test_append_repairs_orphans_past_head_after_crash(tmp_path):
+    store = FSStore(str(tmp_path / "store"))
+    store.append_event("t1", "TASK_CREATED", {})
+    # A crash between renaming batch files and writing HEAD leaves these behind.
+    store._event_path("t1", 1).write_text("{}", encoding="utf-8")
+    store._event_path("t1", 2).with_suffix(".json.tmp").write_text("{}", encoding="utf-8")
+
+    reopened = FSStore(str(tmp_path / "store"))
+    assert reopened.count_events("t1") == 1
+    refs = reopened.append_events("t1", [("TASK_VERIFIED", {}), ("TASK_DISPATCHED", {})])
+    assert [r.seq for r in refs] == [1, 2]
+    assert not list(reopened._task_dir("t1").glob("*.tmp"))
+    assert reopened.verify_chain("t1")
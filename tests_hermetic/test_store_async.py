@@ -0,0 +1,78 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from agentos.store_async import AsyncFSStore
+from agentos.store_fs import FSStore, SequenceConflictError
+
+
+def test_concurrent_appends_keep_per_task_order(tmp_path):
+    async def main():
+        async with AsyncFSStore(str(tmp_path / "store"), max_workers=4) as store:
+            refs = await asyncio.gather(
+                *[store.append_event(f"t{i % 10}", "X", {"n": i // 10}) for i in range(200)]
+            )
+            assert all(r.task_id == f"t{i % 10}" for i, r in enumerate(refs))
+            for t in range(10):
+                events = await store.list_events(f"t{t}")
+                assert [e["body"]["n"] for e in events] == list(range(20))
+                assert await store.verify_chain(f"t{t}")
+
+    asyncio.run(main())
+    assert FSStore(str(tmp_path / "store")).verify_chain("t3")
+
+
+def test_list_after_append_sees_write_without_awaiting_in_between(tmp_path):
+    async def main():
+        async with AsyncFSStore(str(tmp_path / "store")) as store:
+            append = store.append_event("t1", "TASK_CREATED", {})
+            listing = store.list_events("t1")
+            await append
+            assert len(await listing) == 1
+
+    asyncio.run(main())
+
+
+def test_async_iteration_and_errors(tmp_path):
+    async def main():
+        async with AsyncFSStore(str(tmp_path / "store")) as store:
+            await store.append_events("t1", [("A", {}), ("B", {}), ("A", {})])
+            seqs = [e["seq"] async for e in store.iter_task_events("t1", batch_size=2)]
+            assert seqs == [0, 1, 2]
+            rev = [e["seq"] async for e in store.iter_task_events("t1", reverse=True, types=("A",))]
+            assert rev == [2, 0]
+            with pytest.raises(SequenceConflictError):
+                await store.append_event("t1", "C", {}, expected_seq=0)
+            # A failed op does not stall later ops on the same task.
+            ref = await store.append_event("t1", "C", {}, expected_seq=2)
+            assert ref.seq == 3
+            assert await store.list_tasks() == ["t1"]
+
+    asyncio.run(main())
+
+
+def test_slow_task_does_not_block_others(tmp_path):
+    inner = FSStore(str(tmp_path / "store"))
+    gate = threading.Event()
+    real = inner.append_event
+
+    def slow_append(task_id, type_, body, **kw):
+        if task_id == "slow":
+            gate.wait(5)
+        return real(task_id, type_, body, **kw)
+
+    inner.append_event = slow_append
+
+    async def main():
+        store = AsyncFSStore(store=inner, max_workers=2)
+        slow = store.append_event("slow", "X", {})
+        t0 = time.perf_counter()
+        await asyncio.gather(*[store.append_event("fast", "X", {}) for _ in range(5)])
+        assert time.perf_counter() - t0 < 2
+        gate.set()
+        await slow
+        await store.aclose()
+
+    asyncio.run(main())
@@ -0,0 +1,54 @@
+import multiprocessing
+import threading
+
+import pytest
+
+from agentos.store_fs import FSStore, SequenceConflictError
+from agentos.store_mem import MemStore
+from agentos.store_segment import SegmentStore
+from agentos.store_sqlite import SQLiteStore
+
+
+def _append_many(root: str, n: int) -> None:
+    store = FSStore(root)
+    for i in range(n):
+        store.append_event("shared", "TASK_CREATED", {"i": i})
+
+
+def test_multiprocess_appends_share_one_task_stream(tmp_path):
+    root = str(tmp_path / "store")
+    ctx = multiprocessing.get_context("fork")
+    procs = [ctx.Process(target=_append_many, args=(root, 25)) for _ in range(4)]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join()
+        assert p.exitcode == 0
+
+    store = FSStore(root)
+    events = store.list_events("shared")
+    assert [e["seq"] for e in events] == list(range(100))
+    assert store.verify_chain("shared")
+
+
+def test_threaded_appends_on_one_instance(tmp_path):
+    store = FSStore(str(tmp_path / "store"))
+    threads = [threading.Thread(target=lambda: [store.append_event("t", "X", {}) for _ in range(20)]) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(store.list_events("t")) == 80
+    assert store.verify_chain("t")
+
+
+@pytest.mark.parametrize("store_cls", [FSStore, SegmentStore, SQLiteStore, MemStore])
+def test_expected_seq_compare_and_append(tmp_path, store_cls):
+    store = store_cls(str(tmp_path / "store"))
+    store.append_event("t1", "TASK_CREATED", {}, expected_seq=-1)
+    store.append_event("t1", "TASK_VERIFIED", {}, expected_seq=0)
+
+    with pytest.raises(SequenceConflictError) as ei:
+        store.append_event("t1", "TASK_DISPATCHED", {}, expected_seq=0)
+    assert ei.value.actual_seq == 1
+    assert len(store.list_events("t1")) == 2
@@ -0,0 +1,80 @@
+import pytest
+
+from agentos.store_fs import FSStore
+from agentos.store_mem import MemStore
+from agentos.store_segment import SegmentStore
+from agentos.store_sqlite import SQLiteStore
+from tools.weekly_proof_verify import _latest_task_evaluated_body
+
+_TYPES = ["TASK_CREATED", "TASK_VERIFIED", "TASK_DISPATCHED", "RUN_STARTED", "RUN_SUCCEEDED"]
+
+
+@pytest.mark.parametrize("store_cls", [FSStore, SegmentStore, SQLiteStore, MemStore])
+def test_iter_task_events_filters(tmp_path, store_cls):
+    store = store_cls(str(tmp_path / "store"))
+    store.append_events("t1", [(t, {"i": i}) for i, t in enumerate(_TYPES)])
+
+    assert [e["seq"] for e in store.iter_task_events("t1")] == [0, 1, 2, 3, 4]
+    assert [e["seq"] for e in store.iter_task_events("t1", from_seq=3)] == [3, 4]
+    assert [e["seq"] for e in store.iter_task_events("t1", reverse=True)] == [4, 3, 2, 1, 0]
+    assert [e["type"] for e in store.iter_task_events("t1", types=("TASK_VERIFIED", "RUN_STARTED"))] == [
+        "TASK_VERIFIED",
+        "RUN_STARTED",
+    ]
+    assert list(store.iter_task_events("missing")) == []
+
+
+def test_iter_task_events_is_lazy(tmp_path):
+    store = FSStore(str(tmp_path / "store"))
+    store.append_events("t1", [(t, {}) for t in _TYPES])
+
+    # A corrupt event late in the stream is never parsed when the scan stops early.
+    store._event_path("t1", 4).write_text("{not json", encoding="utf-8")
+    first = next(store.iter_task_events("t1", types=("TASK_CREATED",)))
+    assert first["seq"] == 0
+
+    store._event_path("t1", 0).write_text("{not json", encoding="utf-8")
+    store._event_path("t1", 4).unlink()
+    with pytest.raises(FileNotFoundError):
+        next(store.iter_task_events("t1", reverse=True))
+
+
+@pytest.mark.parametrize("store_cls", [FSStore, SegmentStore, SQLiteStore, MemStore])
+def test_list_events_pages(tmp_path, store_cls):
+    store = store_cls(str(tmp_path / "store"))
+    store.append_events("t1", [("TASK_CREATED", {"i": i}) for i in range(10)])
+
+    assert store.count_events("t1") == 10
+    assert store.count_events("missing") == 0
+    assert [e["seq"] for e in store.list_events("t1", limit=3)] == [0, 1, 2]
+    assert [e["seq"] for e in store.list_events("t1", from_seq=8, limit=3)] == [8, 9]
+    assert [e["seq"] for e in store.list_events("t1", reverse=True, limit=3)] == [9, 8, 7]
+    assert [e["seq"] for e in store.list_events("t1", to_seq=1, reverse=True, limit=3)] == [1, 0]
+    assert [e["seq"] for e in store.iter_task_events("t1", from_seq=2, to_seq=4)] == [2, 3, 4]
+    assert store.list_events("t1") == store.list_events("t1", limit=None)
+
+    pages, to_seq = [], None
+    while True:
+        page = store.list_events("t1", to_seq=to_seq, limit=4, reverse=True)
+        if not page:
+            break
+        pages.append([e["seq"] for e in page])
+        to_seq = page[-1]["seq"] - 1
+    assert pages == [[9, 8, 7, 6], [5, 4, 3, 2], [1, 0]]
+
+
+def test_paged_reads_touch_only_the_page(tmp_path):
+    store = FSStore(str(tmp_path / "store"))
+    store.append_events("t1", [(t, {}) for t in _TYPES])
+    store._event_path("t1", 0).write_text("{not json", encoding="utf-8")
+
+    # count_events reads HEAD only; the newest page never reaches the corrupt event.
+    assert store.count_events("t1") == 5
+    assert [e["type"] for e in store.list_events("t1", reverse=True, limit=2)] == ["RUN_SUCCEEDED", "RUN_STARTED"]
+
+
+def test_weekly_proof_verify_reads_sharded_store(tmp_path):
+    store = FSStore(str(tmp_path / "store"), layout="sharded")
+    store.append_events("weekly_envoy", [("TASK_CREATED", {}), ("TASK_EVALUATED", {"decision": "accept"})])
+    assert not (tmp_path / "store" / "events" / "weekly_envoy").exists()
+    assert _latest_task_evaluated_body(tmp_path / "store", "weekly_envoy") == {"decision": "accept"}
@@ -0,0 +1,80 @@
+import pytest
+
+from agentos.blobs import PAYLOAD_INLINE_MAX, resolve_payload
+from agentos.fsm import rebuild_task_state
+from agentos.pipeline import verify_task
+from agentos.store_fs import FSStore
+from agentos.store_mem import MemStore
+from agentos.task import Task, TaskState
+
+_LIFECYCLE = [
+    ("TASK_CREATED", {"role": "envoy", "action": "deterministic_local_execution"}),
+    ("TASK_VERIFIED", {"inputs_manifest_sha256": "0" * 64}),
+    ("TASK_DISPATCHED", {}),
+]
+
+
+def test_mem_store_replays_like_fs_and_flushes_verbatim(tmp_path):
+    mem = MemStore(str(tmp_path / "store"))
+    mem.append_events("t1", _LIFECYCLE)
+    assert mem.verify_chain("t1")
+    assert rebuild_task_state(mem, "t1")["state"] == "DISPATCHED"
+    assert not (tmp_path / "store" / "events").exists()
+
+    fs = FSStore(str(tmp_path / "store"))
+    assert mem.flush_to(fs) == {"tasks": 1, "events": 3, "blobs": 0}
+    assert fs.list_events("t1") == mem.list_events("t1")
+    assert fs.verify_chain("t1")
+    assert rebuild_task_state(fs, "t1")["state"] == "DISPATCHED"
+
+    # Incremental: only the new tail is written, and FS appends chain onto it.
+    mem.append_event("t1", "RUN_STARTED", {"exec_id": "e1"})
+    assert mem.flush_to(fs) == {"tasks": 1, "events": 1, "blobs": 0}
+    assert mem.flush_to(fs)["events"] == 0
+    fs.append_event("t1", "RUN_SUCCEEDED", {"exec_id": "e1"})
+    assert fs.verify_chain("t1")
+
+
+def test_flush_refuses_diverged_target(tmp_path):
+    fs = FSStore(str(tmp_path / "store"))
+    fs.append_event("t1", "TASK_CREATED", {})
+    mem = MemStore()
+    mem.append_events("t1", [("TASK_CREATED", {}), ("TASK_VERIFIED", {})])
+    with pytest.raises(RuntimeError, match="flush_diverged"):
+        mem.flush_to(fs)
+    assert fs.count_events("t1") == 1
+
+
+def test_periodic_snapshot(tmp_path):
+    fs = FSStore(str(tmp_path / "store"))
+    mem = MemStore(snapshot_to=fs, snapshot_every=3)
+    mem.append_events("t1", _LIFECYCLE[:2])
+    assert fs.count_events("t1") == 0
+    mem.append_event("t2", "TASK_CREATED", {})
+    assert fs.list_tasks() == ["t1", "t2"]
+    assert fs.count_events("t1") == 2
+
+
+def test_failed_periodic_snapshot_does_not_fail_append(tmp_path):
+    fs = FSStore(str(tmp_path / "store"))
+    fs.append_events("t1", [("TASK_CREATED", {}), ("TASK_VERIFIED", {})])
+    mem = MemStore(snapshot_to=fs, snapshot_every=1)
+    ref = mem.append_event("t1", "TASK_CREATED", {})
+    assert ref.seq == 0 and mem.count_events("t1") == 1
+    assert mem.last_snapshot_error.startswith("RuntimeError:flush_diverged")
+
+    mem.append_event("t2", "TASK_CREATED", {})  # retried on the next append, still diverged
+    assert "flush_diverged" in mem.last_snapshot_error
+    assert fs.count_events("t2") == 0
+
+
+def test_flush_carries_payload_blobs(tmp_path):
+    mem = MemStore(str(tmp_path / "store"))
+    payload = {"inputs_manifest_sha256": "0" * 64, "blob": "x" * (2 * PAYLOAD_INLINE_MAX)}
+    task = Task(task_id="t_big", state=TaskState.CREATED, role="morpheus", action="architecture", payload=payload, attempt=0)
+    assert verify_task(mem, task).ok
+
+    fs = FSStore(str(tmp_path / "store"))
+    assert mem.flush_to(fs)["blobs"] == 1
+    body = fs.list_events("t_big")[0]["body"]
+    assert resolve_payload(fs, body) == payload
@@ -0,0 +1,54 @@
+import pytest
+
+from agentos.store_fs import FSStore
+from agentos.store_segment import SegmentStore
+from tools.migrate_store_to_segments import migrate
+
+
+def test_segment_store_matches_fs_contract(tmp_path):
+    store = SegmentStore(str(tmp_path / "store"))
+
+    r0 = store.append_event("t1", "TASK_CREATED", {"x": 1})
+    r1 = store.append_event("t1", "TASK_VERIFIED", {"ok": True})
+
+    events = store.list_events("t1")
+    assert [e["seq"] for e in events] == [0, 1]
+    assert events[1]["prev_sha256"] == r0.sha256
+    assert store.read_event("t1", 1)["sha256"] == r1.sha256
+    assert store.verify_chain("t1")
+    assert store.list_events("missing") == tuple()
+    with pytest.raises(FileNotFoundError):
+        store.read_event("t1", 2)
+
+
+def test_segment_store_truncates_torn_tail(tmp_path):
+    store = SegmentStore(str(tmp_path / "store"))
+    store.append_event("t1", "TASK_CREATED", {})
+
+    # Simulate a crash after the log write but before the index entry.
+    with open(store._log_path("t1"), "ab") as fh:
+        fh.write(b"\x00\x00\x00\x10garbage")
+    with open(store._idx_path("t1"), "ab") as fh:
+        fh.write(b"\x00\x01")
+
+    store.append_event("t1", "TASK_VERIFIED", {})
+    assert [e["type"] for e in store.list_events("t1")] == ["TASK_CREATED", "TASK_VERIFIED"]
+    assert store.verify_chain("t1")
+
+
+def test_migrate_fs_store_preserves_hash_chain(tmp_path):
+    src = FSStore(str(tmp_path / "src"))
+    for t in ("a", "b"):
+        src.append_event(t, "TASK_CREATED", {"t": t})
+        src.append_event(t, "TASK_VERIFIED", {"t": t})
+
+    out = migrate(str(tmp_path / "src"), str(tmp_path / "dst"))
+    assert out["ok"] is True
+
+    dst = SegmentStore(str(tmp_path / "dst"))
+    for t in ("a", "b"):
+        assert dst.list_events(t) == src.list_events(t)
+        assert dst.verify_chain(t)
+
+    with pytest.raises(RuntimeError):
+        migrate(str(tmp_path / "src"), str(tmp_path / "dst"))
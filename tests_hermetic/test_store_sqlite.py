@@ -0,0 +1,57 @@
+import sqlite3
+
+import pytest
+
+import agentos.store_fs as store_fs_mod
+from agentos.fsm import rebuild_task_state
+from agentos.store_fs import FSStore
+from agentos.store_sqlite import SQLiteStore
+from tools.bench_store import bench_backend
+
+
+def test_sqlite_store_hash_chain_and_replay(tmp_path):
+    store = SQLiteStore(str(tmp_path / "store"))
+    refs = store.append_events("t1", [("TASK_CREATED", {"role": "envoy"}), ("TASK_VERIFIED", {})])
+    store.append_event("t1", "TASK_DISPATCHED", {})
+
+    events = store.list_events("t1")
+    assert [e["seq"] for e in events] == [0, 1, 2]
+    assert events[1]["prev_sha256"] == refs[0].sha256
+    assert store.read_event("t1", 1)["sha256"] == refs[1].sha256
+    assert store.verify_chain("t1")
+    assert rebuild_task_state(store, "t1")["state"] == "DISPATCHED"
+    with pytest.raises(FileNotFoundError):
+        store.read_event("t1", 9)
+
+
+def test_sqlite_store_is_append_only_and_indexed(tmp_path):
+    store = SQLiteStore(str(tmp_path / "store"))
+    store.append_event("a", "TASK_CREATED", {})
+    store.append_event("b", "TASK_CREATED", {})
+    store.append_event("b", "TASK_VERIFIED", {})
+
+    assert [e["task_id"] for e in store.query_events(type_="TASK_VERIFIED")] == ["b"]
+    assert store.list_tasks() == ["a", "b"]
+
+    conn = sqlite3.connect(str(store.db_path))
+    with pytest.raises(sqlite3.DatabaseError):
+        conn.execute("UPDATE events SET type = 'X' WHERE task_id = 'a'")
+    with pytest.raises(sqlite3.IntegrityError):
+        conn.execute(
+            "INSERT INTO events (task_id, seq, ts_utc, type, prev_sha256, sha256, event_json) VALUES ('a', 0, '', '', NULL, '', '{}')"
+        )
+    conn.close()
+
+
+def test_sqlite_event_hashes_match_fs_store(tmp_path, monkeypatch):
+    monkeypatch.setattr(store_fs_mod, "utc_now_iso", lambda: "2026-01-01T00:00:00Z")
+    fs = FSStore(str(tmp_path / "fs"))
+    sq = SQLiteStore(str(tmp_path / "sq"))
+    for s in (fs, sq):
+        s.append_events("t1", [("TASK_CREATED", {"x": 1}), ("TASK_VERIFIED", {"y": [1, 2]})])
+    assert fs.list_events("t1") == sq.list_events("t1")
+
+
+def test_bench_store_smoke(tmp_path):
+    out = bench_backend("sqlite", str(tmp_path / "bench"), tasks=3, body_bytes=8)
+    assert out["events"] == 15
@@ -0,0 +1,32 @@
+from agentos.store_fs import FSStore
+
+
+def test_append_uses_tail_cache_without_rereading_prev_event(tmp_path, monkeypatch):
+    store = FSStore(str(tmp_path / "store"))
+    store.append_event("t1", "TASK_CREATED", {"blob": "x" * 4096})
+
+    calls = []
+    orig = FSStore._read_head
+
+    def counting_read_head(self, task_id):
+        calls.append(task_id)
+        return orig(self, task_id)
+
+    monkeypatch.setattr(FSStore, "_read_head", counting_read_head)
+    store.append_event("t1", "TASK_VERIFIED", {})
+    store.append_event("t1", "TASK_DISPATCHED", {})
+
+    assert calls == []
+    assert store.verify_chain("t1")
+
+
+def test_tail_cache_invalidated_by_other_writer(tmp_path):
+    a = FSStore(str(tmp_path / "store"))
+    b = FSStore(str(tmp_path / "store"))
+
+    a.append_event("t1", "TASK_CREATED", {})
+    b.append_event("t1", "TASK_VERIFIED", {})
+    ref = a.append_event("t1", "TASK_DISPATCHED", {})
+
+    assert ref.seq == 2
+    assert a.verify_chain("t1")
@@ -0,0 +1,50 @@
+import json
+
+from agentos.store_fs import FSStore
+from agentos.store_verify import load_marks, verify_store
+from tools.verify_store import main as verify_store_main
+
+
+def _populate(root, n=4):
+    store = FSStore(root)
+    for i in range(n):
+        store.append_events(f"t{i}", [("TASK_CREATED", {"i": i}), ("TASK_VERIFIED", {})])
+    return store
+
+
+def test_verify_store_is_incremental(tmp_path):
+    root = str(tmp_path / "store")
+    store = _populate(root)
+
+    first = verify_store(root)
+    assert first["ok"] and first["tasks"] == 4 and first["events_hashed"] == 8
+    assert load_marks(root)["t0"]["seq"] == 1
+
+    store.append_event("t0", "TASK_DISPATCHED", {})
+    second = verify_store(root)
+    assert second["ok"] and second["events_hashed"] == 1
+
+    assert verify_store(root, full=True)["events_hashed"] == 9
+
+
+def test_verify_store_reports_tamper_in_parallel(tmp_path):
+    root = str(tmp_path / "store")
+    store = _populate(root)
+    verify_store(root)
+
+    ev = store.read_event("t2", 1)
+    ev["body"] = {"forged": True}
+    store._event_path("t2", 1).write_text(json.dumps(ev), encoding="utf-8")
+
+    report = verify_store(root, jobs=2)
+    assert report["ok"] is False
+    assert report["failed"] == [{"task_id": "t2", "reason": "mark_anchor_mismatch"}]
+    assert "t2" not in load_marks(root)
+
+
+def test_verify_store_cli_writes_report(tmp_path, capsys):
+    root = str(tmp_path / "store")
+    _populate(root, n=1)
+    out = tmp_path / "report.json"
+    assert verify_store_main(["--root", root, "--jobs", "1", "--report", str(out)]) == 0
+    assert json.loads(out.read_text(encoding="utf-8"))["tasks_ok"] == 1
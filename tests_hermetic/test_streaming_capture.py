@@ -0,0 +1,110 @@
+import asyncio
+import hashlib
+import json
+import tracemalloc
+from pathlib import Path
+from uuid import uuid4
+
+from agentos.canonical import sha256_hex
+from agentos.capabilities.idempotency import IdempotencyStore
+from agentos.execution import ExecutionSpec
+from agentos.executor import AsyncLocalExecutor, LocalExecutor
+from agentos.pipeline import verify_task
+from agentos.router import ExecutionRouter
+from agentos.runner import TaskRunner
+from agentos.store_fs import FSStore
+from agentos.task import Task, TaskState
+from tools.validate_evidence import main as validate_main
+
+_CONTRACT = str(Path(__file__).resolve().parents[1] / "ci" / "evidence_contract.v1.json")
+_BIG = 16 * 1024 * 1024
+
+
+def _spec(tmp_path, script, *, timeout_s=10):
+    return ExecutionSpec(
+        exec_id="e1", task_id="t_stream", role="envoy", action="deterministic_local_execution",
+        kind="shell", cmd_argv=["/bin/sh", "-c", script], cwd=str(tmp_path), env_allowlist=[],
+        timeout_s=timeout_s, inputs_manifest_sha256="00" * 32, paths_allowlist=[str(tmp_path), "/bin", "/usr/bin"],
+    )
+
+
+def _file_sha(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def test_streamed_capture_matches_buffered_bytes(tmp_path):
+    spec = _spec(tmp_path, "i=0; while [ $i -lt 2000 ]; do echo out$i; echo err$i >&2; i=$((i+1)); done; exit 2")
+    buffered = LocalExecutor().run(spec)
+    for name, run in (
+        ("sync", lambda d: LocalExecutor().run(spec, capture_dir=d)),
+        ("async", lambda d: asyncio.run(AsyncLocalExecutor().run_async(spec, capture_dir=d))),
+    ):
+        d = tmp_path / name
+        d.mkdir()
+        res = run(d)
+        assert res.exit_code == 2 and res.stdout == b"" and res.stderr == b""
+        assert Path(res.stdout_capture.path).read_bytes() == buffered.stdout
+        assert Path(res.stderr_capture.path).read_bytes() == buffered.stderr
+        assert res.stdout_sha256 == sha256_hex(buffered.stdout) == _file_sha(res.stdout_capture.path)
+        assert res.stderr_capture.size == len(buffered.stderr)
+
+
+def test_streamed_timeout_keeps_partial_output(tmp_path):
+    res = LocalExecutor().run(_spec(tmp_path, "echo early; sleep 5", timeout_s=1), capture_dir=tmp_path)
+    assert res.exit_code == 124
+    assert Path(res.stdout_capture.path).read_bytes() == b"early\n"
+
+
+def _dispatch(store, tmp_path, task_id, script):
+    payload = {
+        "exec_id": "e1",
+        "kind": "shell",
+        "cmd_argv": ["/bin/sh", "-c", script],
+        "cwd": str(tmp_path),
+        "env_allowlist": [],
+        "timeout_s": 30,
+        "inputs_manifest_sha256": sha256_hex(b"{}"),
+        "paths_allowlist": [str(tmp_path), "/bin", "/usr/bin"],
+    }
+    task = Task(task_id=task_id, state=TaskState.CREATED, role="envoy", action="deterministic_local_execution", payload=payload)
+    assert verify_task(store, task).ok
+    assert ExecutionRouter(store).route(task).ok
+
+
+def test_runner_streams_large_output_into_bundle_with_flat_memory(tmp_path, capsys):
+    store = FSStore(str(tmp_path / "store"))
+    task_id = f"t_big_{uuid4().hex[:8]}"
+    _dispatch(store, tmp_path, task_id, f"head -c {_BIG} /dev/zero")
+    runner = TaskRunner(store, evidence_root=str(tmp_path / "evidence"))
+    runner._idempotency_store = IdempotencyStore(str(tmp_path / "idem"))
+
+    tracemalloc.start()
+    try:
+        summary = runner.run_dispatched(task_id)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert summary.ok
+    assert peak < _BIG // 4
+
+    bundle = Path(summary.evidence_bundle_dir)
+    assert (bundle / "stdout.txt").stat().st_size == _BIG
+    manifest = json.loads((bundle / "manifest.sha256.json").read_text())["files"]
+    assert manifest["stdout.txt"] == _file_sha(bundle / "stdout.txt") == summary.stdout_sha256
+    assert store.list_events(task_id)[-1]["body"]["stdout_sha256"] == summary.stdout_sha256
+    assert not list(bundle.parent.glob(".*"))  # staging directory removed
+
+    assert validate_main(["validate_evidence.py", "--evidence-root", str(tmp_path / "evidence"), "--contract", _CONTRACT]) == 0
+    assert "execution=1" in capsys.readouterr().out
+
+
+def test_validator_skips_in_flight_capture(tmp_path, capsys):
+    store = FSStore(str(tmp_path / "store"))
+    runner = TaskRunner(store, evidence_root=str(tmp_path / "evidence"))
+    (runner.evidence.new_capture_dir("t_inflight", "e1") / "stdout.txt").write_bytes(b"partial")
+    assert validate_main(["validate_evidence.py", "--evidence-root", str(tmp_path / "evidence"), "--contract", _CONTRACT]) == 0
+    assert "execution=0" in capsys.readouterr().out
@@ -0,0 +1,81 @@
+from uuid import uuid4
+
+from agentos.canonical import sha256_hex
+from agentos.capabilities.idempotency import IdempotencyStore
+from agentos.pipeline import verify_task
+from agentos.router import ExecutionRouter
+from agentos.runner import TaskRunner
+from agentos.store_fs import FSStore
+from agentos.task import Task, TaskState
+from agentos.task_context import TaskContext
+
+
+def _task(tmp_path, task_id, state=TaskState.CREATED):
+    payload = {
+        "exec_id": "e1",
+        "kind": "shell",
+        "cmd_argv": ["/bin/echo", "ok"],
+        "cwd": str(tmp_path),
+        "env_allowlist": [],
+        "timeout_s": 5,
+        "inputs_manifest_sha256": sha256_hex(b"{}"),
+        "paths_allowlist": [str(tmp_path), "/bin/echo", "/usr/bin/echo"],
+    }
+    return Task(task_id=task_id, state=state, role="envoy", action="deterministic_local_execution", payload=payload)
+
+
+class _CountingStore(FSStore):
+    scans = 0  # unfiltered reads of the whole stream
+
+    def iter_task_events(self, task_id, **kw):
+        if kw.get("types") is None and not kw.get("from_seq"):
+            type(self).scans += 1
+        return super().iter_task_events(task_id, **kw)
+
+
+def test_route_and_run_scan_the_stream_once_each(tmp_path):
+    store = _CountingStore(str(tmp_path / "store"))
+    task_id = f"t_ctx_{uuid4().hex}"
+    assert verify_task(store, _task(tmp_path, task_id)).ok
+
+    _CountingStore.scans = 0
+    assert ExecutionRouter(store).route(_task(tmp_path, task_id, TaskState.VERIFIED)).ok
+    assert _CountingStore.scans == 1
+
+    runner = TaskRunner(store, evidence_root=str(tmp_path / "evidence"))
+    runner._idempotency_store = IdempotencyStore(str(tmp_path / "idem"))
+    _CountingStore.scans = 0
+    assert runner.run_dispatched(task_id).ok
+    assert _CountingStore.scans == 1
+    assert not hasattr(runner, "_current_task_context")
+
+
+def test_context_carries_state_bodies_and_spec(tmp_path):
+    store = FSStore(str(tmp_path / "store"))
+    assert verify_task(store, _task(tmp_path, "t1")).ok
+    ctx = TaskContext.load(store, "t1")
+    assert ctx.state is TaskState.VERIFIED and ctx.head_seq == 1
+    assert ctx.body("TASK_CREATED")["role"] == "envoy"
+    assert ctx.verified_inputs_manifest_sha256() == sha256_hex(b"{}")
+
+    runner = TaskRunner(store, evidence_root=str(tmp_path / "evidence"))
+    spec = runner._spec_for(ctx)
+    with_spec = ctx.with_spec(spec)
+    assert with_spec.spec_sha256 == spec.spec_sha256() and runner._spec_for(with_spec) is spec
+
+    assert ctx.is_current(store)
+    store.append_event("t1", "TASK_DISPATCHED", {})
+    assert not ctx.is_current(store)
+
+
+def test_load_uses_sidecar_state_and_reads_only_the_body_events(tmp_path):
+    store = _CountingStore(str(tmp_path / "store"), state_sidecar=True)
+    assert verify_task(store, _task(tmp_path, "t1")).ok
+    store.append_event("t1", "TASK_DISPATCHED", {})
+
+    _CountingStore.scans = 0
+    ctx = TaskContext.load(store, "t1")
+    assert _CountingStore.scans == 0
+    assert ctx.state is TaskState.DISPATCHED and ctx.head_seq == 2
+    assert ctx.body("TASK_CREATED")["role"] == "envoy"
+    assert ctx.verified_inputs_manifest_sha256() == sha256_hex(b"{}")
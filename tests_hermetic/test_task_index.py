@@ -0,0 +1,95 @@
+from agentos.store_fs import FSStore
+from agentos.task_index import FSM_VIOLATION, TaskIndex
+from tools.task_index import main as task_index_main
+
+
+def test_index_tracks_state_on_append(tmp_path):
+    store = FSStore(str(tmp_path / "store"), index=True)
+    store.append_events("t1", [("TASK_CREATED", {"role": "envoy", "action": "a"}), ("TASK_VERIFIED", {})])
+    store.append_event("t1", "TASK_DISPATCHED", {})
+    store.append_events("t2", [("TASK_CREATED", {}), ("TASK_VERIFIED", {}), ("TASK_REJECTED", {})])
+
+    row = store.index.get("t1")
+    assert row["state"] == "DISPATCHED"
+    assert row["last_type"] == "TASK_DISPATCHED"
+    assert row["last_seq"] == 2
+    assert (row["role"], row["action"]) == ("envoy", "a")
+    assert store.index.tasks_in_state("DISPATCHED") == ["t1"]
+    assert store.index.count_by_state() == {"DISPATCHED": 1, "FAILED": 1}
+    assert store.index.count_by_state(since="9999") == {}
+
+
+def test_index_resyncs_and_rebuilds_from_log(tmp_path):
+    root = str(tmp_path / "store")
+    plain = FSStore(root)
+    plain.append_events("t1", [("TASK_CREATED", {}), ("TASK_VERIFIED", {})])
+    plain.append_events("t3", [("TASK_CREATED", {}), ("RUN_STARTED", {})])
+
+    indexed = FSStore(root, index=True)
+    # Row is missing for t1: the append recomputes it from the log.
+    indexed.append_event("t1", "TASK_DISPATCHED", {})
+    assert indexed.index.get("t1")["state"] == "DISPATCHED"
+    assert indexed.index.get("t3") is None
+
+    assert TaskIndex(root).rebuild(plain) == 2
+    assert indexed.index.get("t3")["state"] == FSM_VIOLATION
+
+
+def test_task_index_cli(tmp_path, capsys):
+    root = str(tmp_path / "store")
+    FSStore(root).append_events("t1", [("TASK_CREATED", {}), ("TASK_VERIFIED", {})])
+
+    assert task_index_main(["--root", root, "rebuild"]) == 0
+    assert task_index_main(["--root", root, "state", "VERIFIED"]) == 0
+    out = capsys.readouterr().out.strip().splitlines()
+    assert out[-1] == '{"ok":true,"state":"VERIFIED","task_ids":["t1"]}'
+
+
+def test_failed_index_update_is_marked_dirty_and_resynced(tmp_path, monkeypatch):
+    root = str(tmp_path / "store")
+    store = FSStore(root, index=True)
+    store.append_events("t1", [("TASK_CREATED", {}), ("TASK_VERIFIED", {})])
+
+    def boom(self, task_id, events, *, history):
+        raise OSError("index unavailable")
+
+    monkeypatch.setattr(TaskIndex, "apply", boom)
+    store.append_events("t1", [("TASK_DISPATCHED", {}), ("RUN_STARTED", {})])  # committed regardless
+    store.append_event("t2", "TASK_CREATED", {})
+    monkeypatch.undo()
+
+    assert store.index.is_dirty()
+    assert store.index.get("t1")["state"] == "VERIFIED" and store.index.get("t2") is None
+
+    # A terminal task never appends again; reopening the store repairs its row.
+    reopened = FSStore(root, index=True)
+    assert not reopened.index.is_dirty()
+    assert reopened.index.get("t1")["state"] == "RUNNING"
+    assert reopened.index.get("t1")["last_seq"] == 3
+    assert reopened.index.get("t2")["state"] == "CREATED"
+    assert store.index.resync(store) == 0
+
+
+def test_concurrent_resyncs_share_dirty_work_files(tmp_path):
+    root = str(tmp_path / "store")
+    store = FSStore(root)
+    store.append_events("t1", [("TASK_CREATED", {}), ("TASK_VERIFIED", {})])
+    store.append_event("t2", "TASK_CREATED", {})
+    first, second = TaskIndex(root), TaskIndex(root)
+    first.mark_dirty("t1")
+    first.mark_dirty("t2")
+
+    class InterleavedStore:
+        # The second resync runs while the first is between claiming and unlinking.
+        def __init__(self):
+            self.raced = False
+
+        def iter_task_events(self, task_id):
+            if not self.raced:
+                self.raced = True
+                assert second.resync(store) == 2
+            return store.iter_task_events(task_id)
+
+    assert first.resync(InterleavedStore()) == 2
+    assert not first.is_dirty() and not second.is_dirty()
+    assert first.get("t1")["state"] == "VERIFIED" and first.get("t2")["state"] == "CREATED"
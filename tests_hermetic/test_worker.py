@@ -0,0 +1,165 @@
+import json
+import threading
+import time
+from uuid import uuid4
+
+from agentos.canonical import sha256_hex
+from agentos.capabilities.idempotency import IdempotencyStore
+from agentos.fsm import rebuild_task_state
+from agentos.pipeline import verify_task
+from agentos.router import ExecutionRouter
+from agentos.runner import TaskRunner
+from agentos.store_fs import FSStore
+from agentos.task import Task, TaskState
+from agentos.worker import LeaseStore, Worker
+from tools.run_worker import main as worker_main
+
+
+def _dispatch(store, tmp_path, task_id, argv):
+    payload = {
+        "exec_id": "e1",
+        "kind": "shell",
+        "cmd_argv": argv,
+        "cwd": str(tmp_path),
+        "env_allowlist": [],
+        "timeout_s": 5,
+        "inputs_manifest_sha256": sha256_hex(b"{}"),
+        "paths_allowlist": [str(tmp_path), "/bin", "/usr/bin"],
+    }
+    task = Task(task_id=task_id, state=TaskState.CREATED, role="envoy", action="deterministic_local_execution", payload=payload)
+    assert verify_task(store, task).ok
+    assert ExecutionRouter(store).route(task).ok
+
+
+def _worker(store, tmp_path, **kw):
+    runner = TaskRunner(store, evidence_root=str(tmp_path / "evidence"))
+    runner._idempotency_store = IdempotencyStore(str(tmp_path / "idem"))
+    return Worker(runner, poll_s=0.05, **kw)
+
+
+def test_lease_is_exclusive_until_it_expires(tmp_path):
+    now = [1000.0]
+    leases = LeaseStore(str(tmp_path), clock=lambda: now[0])
+    a = leases.claim("t1", "a", 10)
+    assert a is not None and leases.is_held("t1")
+    assert leases.claim("t1", "b", 10) is None
+
+    now[0] += 8
+    a = leases.renew(a, 10)
+    now[0] += 8
+    assert leases.claim("t1", "b", 10) is None  # renewed past the original expiry
+
+    now[0] += 3
+    b = leases.claim("t1", "b", 10)
+    assert b is not None and leases.get("t1")["owner"] == "b"
+    assert leases.renew(a, 10) is None and not leases.release(a)
+    assert leases.release(b) and leases.get("t1") is None
+
+
+def test_worker_drains_dispatched_tasks_and_skips_leased_ones(tmp_path):
+    store = FSStore(str(tmp_path / "store"))
+    ids = [f"t_w_{i}_{uuid4().hex[:8]}" for i in range(3)]
+    for t in ids:
+        _dispatch(store, tmp_path, t, ["/bin/echo", "ok"])
+    foreign = LeaseStore(str(tmp_path / "store")).claim(ids[0], "other-host:1", 60)
+
+    report = _worker(store, tmp_path, workers=2).run(idle_exit=True)
+    obj = report.to_obj()
+    assert obj["runs"] == 2 and obj["ok"] == 2 and obj["errors"] == {} and not obj["stopped"]
+    assert rebuild_task_state(store, ids[0])["state"] == "DISPATCHED"
+    for t in ids[1:]:
+        assert rebuild_task_state(store, t)["state"] == "COMPLETED"
+    assert [p.name for p in (tmp_path / "store" / "leases").glob("*.json")] == [f"{ids[0]}.json"]
+
+    LeaseStore(str(tmp_path / "store")).release(foreign)
+    assert _worker(store, tmp_path).run(idle_exit=True).to_obj()["ok"] == 1
+    assert rebuild_task_state(store, ids[0])["state"] == "COMPLETED"
+
+
+def test_stop_drains_in_flight_runs_and_heartbeats_the_lease(tmp_path):
+    store = FSStore(str(tmp_path / "store"))
+    slow = f"t_slow_{uuid4().hex[:8]}"
+    later = f"t_later_{uuid4().hex[:8]}"
+    _dispatch(store, tmp_path, slow, ["/bin/sleep", "0.6"])
+
+    worker = _worker(store, tmp_path, workers=1, lease_s=0.3, heartbeat_s=0.05)
+    out = {}
+    th = threading.Thread(target=lambda: out.setdefault("report", worker.run()))
+    th.start()
+    leases = LeaseStore(str(tmp_path / "store"))
+    deadline = time.time() + 5
+    while not leases.is_held(slow) and time.time() < deadline:
+        time.sleep(0.01)
+    assert leases.is_held(slow)
+    _dispatch(store, tmp_path, later, ["/bin/echo", "ok"])
+    worker.request_stop()
+    time.sleep(0.4)
+    assert leases.is_held(slow)  # renewed past lease_s while still running
+    th.join(timeout=10)
+
+    report = out["report"].to_obj()
+    assert report["stopped"] and report["ok"] == 1 and report["lease_lost"] == []
+    assert rebuild_task_state(store, slow)["state"] == "COMPLETED"
+    assert rebuild_task_state(store, later)["state"] == "DISPATCHED"
+    assert not leases.is_held(slow)
+
+
+def test_run_worker_cli_uses_the_task_index(tmp_path, capsys):
+    store = FSStore(str(tmp_path / "store"), index=True)
+    t = f"t_cli_{uuid4().hex[:8]}"
+    _dispatch(store, tmp_path, t, ["/bin/echo", "ok"])
+    assert worker_main(["--root", str(tmp_path / "store"), "--index", "--idle-exit", "--poll-s", "0.05", "--workers", "2"]) == 0
+    out = json.loads(capsys.readouterr().out)
+    assert out["ok"] == 1 and out["workers"] == 2
+    assert rebuild_task_state(FSStore(str(tmp_path / "store")), t)["state"] == "COMPLETED"
+
+
+def test_indexed_worker_runs_tasks_dispatched_without_the_index(tmp_path):
+    root = str(tmp_path / "store")
+    indexed = FSStore(root, index=True)
+    plain = FSStore(root)
+    no_row = f"t_norow_{uuid4().hex[:8]}"
+    _dispatch(plain, tmp_path, no_row, ["/bin/echo", "ok"])
+    stale = f"t_stale_{uuid4().hex[:8]}"
+    indexed.append_event(stale, "TASK_CREATED", {})
+    assert indexed.index.get(stale)["state"] == "CREATED"
+    plain.append_events(stale, [("TASK_VERIFIED", {}), ("TASK_DISPATCHED", {})])
+
+    worker = _worker(indexed, tmp_path, sweep_s=3600)
+    assert worker.dispatched_tasks() == sorted([no_row, stale])
+    assert indexed.index.get(stale)["last_seq"] == 2
+    assert indexed.index.catch_up(indexed) == 0
+
+    # Between sweeps only the index is read; the next sweep picks up unindexed appends.
+    late = f"t_late_{uuid4().hex[:8]}"
+    _dispatch(plain, tmp_path, late, ["/bin/echo", "ok"])
+    assert late not in worker.dispatched_tasks()
+    worker.sweep_s = 0
+    worker._next_sweep = 0.0
+    assert late in worker.dispatched_tasks()
+
+    report = worker.run(idle_exit=True).to_obj()
+    assert report["ok"] == 2 and set(report["errors"]) == {stale}
+    assert rebuild_task_state(indexed, no_row)["state"] == "COMPLETED"
+
+
+def test_scan_replays_only_tasks_whose_head_moved(tmp_path, monkeypatch):
+    store = FSStore(str(tmp_path / "store"))
+    t = f"t_scan_{uuid4().hex[:8]}"
+    _dispatch(store, tmp_path, t, ["/bin/echo", "ok"])
+    store.append_event("t_done", "TASK_CREATED", {})
+    store.append_events("t_done", [("TASK_VERIFIED", {}), ("TASK_REJECTED", {})])
+    worker = _worker(store, tmp_path)
+    assert worker.dispatched_tasks() == [t]
+
+    replays = []
+
+    def counting_rebuild(s, task_id, **kw):
+        replays.append(task_id)
+        return rebuild_task_state(s, task_id, **kw)
+
+    monkeypatch.setattr("agentos.worker.rebuild_task_state", counting_rebuild)
+    assert worker.dispatched_tasks() == [t] and replays == []
+    store.append_event(t, "RUN_STARTED", {})
+    assert worker.dispatched_tasks() == [] and replays == [t]
+    assert worker.dispatched_tasks() == [] and replays == [t]
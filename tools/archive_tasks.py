@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+import argparse
+import sys
+
+from agentos.archive import archive_terminal_tasks
+from agentos.canonical import canonical_json
+from agentos.packs import CODECS
+from agentos.store_fs import FSStore
+
+
+def main(argv: list[str]) -> int:
+    ap = argparse.ArgumentParser(description="Pack event streams and evidence of terminal tasks into archive packs.")
+    ap.add_argument("--root", default="store")
+    ap.add_argument("--evidence-root", default=None, help="defaults to <root>/evidence")
+    ap.add_argument("--codec", choices=sorted(CODECS), default="lzma")
+    ap.add_argument("--batch", type=int, default=256, help="tasks per pack")
+    ap.add_argument("--dry-run", action="store_true", help="only list the tasks that would be archived")
+    args = ap.parse_args(argv)
+
+    report = archive_terminal_tasks(
+        FSStore(root=args.root),
+        evidence_root=args.evidence_root,
+        codec=args.codec,
+        batch=args.batch,
+        dry_run=args.dry_run,
+    )
+    print(canonical_json(report))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
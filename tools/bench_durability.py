@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import argparse
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List
+
+from agentos.canonical import canonical_json
+from agentos.durability import Durability, DurabilityMode
+from agentos.store_fs import FSStore
+
+
+def _percentile(sorted_vals: List[float], q: float) -> float:
+    if not sorted_vals:
+        return 0.0
+    i = min(len(sorted_vals) - 1, int(round(q * (len(sorted_vals) - 1))))
+    return sorted_vals[i]
+
+
+def bench_mode(mode: str, root: str, *, writers: int, appends: int, group_delay_s: float) -> Dict[str, Any]:
+    durability = Durability(mode, group_delay_s=group_delay_s)
+    store = FSStore(root, durability=durability)
+    body = {"pad": "x" * 128}
+
+    def writer(w: int) -> List[float]:
+        lat = []
+        task_id = f"bench_w{w:03d}"
+        for _ in range(appends):
+            t0 = time.perf_counter()
+            store.append_event(task_id, "TASK_CREATED", body)
+            lat.append(time.perf_counter() - t0)
+        return lat
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=writers) as pool:
+        lats = sorted(x for part in pool.map(writer, range(writers)) for x in part)
+    elapsed = time.perf_counter() - t0
+    n = writers * appends
+    return {
+        "mode": mode,
+        "writers": writers,
+        "appends": n,
+        "elapsed_s": round(elapsed, 6),
+        "appends_per_s": round(n / elapsed, 1) if elapsed else None,
+        "p50_ms": round(_percentile(lats, 0.50) * 1000, 3),
+        "p99_ms": round(_percentile(lats, 0.99) * 1000, 3),
+        "flushes": durability.flushes,
+    }
+
+
+def main(argv: list[str]) -> int:
+    ap = argparse.ArgumentParser(description="Benchmark FSStore append latency/throughput per durability mode.")
+    ap.add_argument("--writers", type=int, default=8)
+    ap.add_argument("--appends", type=int, default=200, help="appends per writer thread")
+    ap.add_argument("--modes", default=",".join(m.value for m in DurabilityMode))
+    ap.add_argument("--group-delay-ms", type=float, default=2.0)
+    args = ap.parse_args(argv)
+
+    results = []
+    for mode in [m.strip() for m in args.modes.split(",") if m.strip()]:
+        if mode not in {m.value for m in DurabilityMode}:
+            raise SystemExit(f"unknown_mode:{mode}")
+        tmp = tempfile.mkdtemp(prefix=f"agentos_bench_durability_{mode}_")
+        try:
+            results.append(
+                bench_mode(mode, tmp, writers=args.writers, appends=args.appends, group_delay_s=args.group_delay_ms / 1000.0)
+            )
+        finally:
+            shutil.rmtree(tmp, ignore_errors=True)
+
+    print(canonical_json({"ok": True, "results": results}))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from agentos.canonical import canonical_json
+from agentos.fsm import rebuild_task_state
+from agentos.store_fs import FSStore
+
+_LIFECYCLE = ("TASK_CREATED", "TASK_VERIFIED", "TASK_DISPATCHED", "RUN_STARTED", "RUN_SUCCEEDED", "TASK_EVALUATED")
+
+
+class _DictRecordStore:
+    """
+    Replays the same files but yields fully decoded dicts (the pre-Event behaviour).
+    """
+
+    def __init__(self, store: FSStore) -> None:
+        self._store = store
+
+    def iter_task_events(self, task_id: str, *, from_seq: int = 0, reverse: bool = False, types: Optional[Iterable[str]] = None) -> Iterator[Dict[str, Any]]:
+        for raw in self._store._iter_raw(task_id, from_seq, reverse):
+            yield json.loads(raw)
+
+
+class _GCTimer:
+    def __init__(self) -> None:
+        self.total_s = 0.0
+        self.collections = 0
+        self._t0 = 0.0
+
+    def __call__(self, phase: str, info: Dict[str, Any]) -> None:
+        if phase == "start":
+            self._t0 = time.perf_counter()
+        else:
+            self.total_s += time.perf_counter() - self._t0
+            self.collections += 1
+
+
+def _populate(root: str, *, tasks: int, body_bytes: int) -> List[str]:
+    store = FSStore(root)
+    task_ids = [f"bench_{i:06d}" for i in range(tasks)]
+    body = {"pad": "x" * body_bytes, "items": [{"k": i, "v": "y" * 16} for i in range(16)]}
+    for t in task_ids:
+        store.append_events(t, [(type_, body) for type_ in _LIFECYCLE])
+    return task_ids
+
+
+def bench_records(records: str, root: str, task_ids: List[str]) -> Dict[str, Any]:
+    fs = FSStore(root)
+    store: Any = fs if records == "event" else _DictRecordStore(fs)
+    timer = _GCTimer()
+    gc.collect()
+    gc.callbacks.append(timer)
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    try:
+        # Keep snapshots alive, like a router holding many tasks' state.
+        snaps = [rebuild_task_state(store, t) for t in task_ids]
+        elapsed = time.perf_counter() - t0
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+        gc.callbacks.remove(timer)
+    if any(s["state"] != "EVALUATED" for s in snaps):
+        raise RuntimeError("replay_state_mismatch")
+    return {
+        "records": records,
+        "tasks": len(task_ids),
+        "replay_s": round(elapsed, 6),
+        "peak_kib": round(peak / 1024, 1),
+        "gc_s": round(timer.total_s, 6),
+        "gc_collections": timer.collections,
+    }
+
+
+def main(argv: list[str]) -> int:
+    ap = argparse.ArgumentParser(description="Compare replay memory/GC cost of dict vs Event records.")
+    ap.add_argument("--tasks", type=int, default=2000)
+    ap.add_argument("--body-bytes", type=int, default=512)
+    args = ap.parse_args(argv)
+
+    tmp = tempfile.mkdtemp(prefix="agentos_bench_replay_")
+    try:
+        task_ids = _populate(tmp, tasks=args.tasks, body_bytes=args.body_bytes)
+        results = [bench_records(r, tmp, task_ids) for r in ("dict", "event")]
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+    print(canonical_json({"ok": True, "results": results}))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import argparse
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict
+
+from agentos.canonical import canonical_json
+from agentos.fsm import rebuild_task_state
+from agentos.store_fs import FSStore
+from agentos.store_segment import SegmentStore
+from agentos.store_sqlite import SQLiteStore
+
+_LIFECYCLE = ("TASK_CREATED", "TASK_VERIFIED", "TASK_DISPATCHED", "RUN_STARTED", "RUN_SUCCEEDED")
+
+BACKENDS: Dict[str, Callable[[str], Any]] = {
+    "fs": FSStore,
+    "segment": SegmentStore,
+    "sqlite": SQLiteStore,
+}
+
+
+def _timed(fn: Callable[[], Any]) -> float:
+    t0 = time.perf_counter()
+    fn()
+    return time.perf_counter() - t0
+
+
+def bench_backend(name: str, root: str, *, tasks: int, body_bytes: int) -> Dict[str, Any]:
+    store = BACKENDS[name](root)
+    task_ids = [f"bench_{i:06d}" for i in range(tasks)]
+    body = {"pad": "x" * body_bytes}
+
+    def append_all() -> None:
+        for t in task_ids:
+            for type_ in _LIFECYCLE:
+                store.append_event(t, type_, body)
+
+    def list_all() -> None:
+        for t in task_ids:
+            store.list_events(t)
+
+    def replay_all() -> None:
+        for t in task_ids:
+            rebuild_task_state(store, t)
+
+    def verify_all() -> None:
+        for t in task_ids:
+            if not store.verify_chain(t):
+                raise RuntimeError(f"chain_invalid:{name}:{t}")
+
+    n_events = tasks * len(_LIFECYCLE)
+    append_s = _timed(append_all)
+    out = {
+        "backend": name,
+        "tasks": tasks,
+        "events": n_events,
+        "append_s": round(append_s, 6),
+        "append_events_per_s": round(n_events / append_s, 1) if append_s else None,
+        "list_s": round(_timed(list_all), 6),
+        "replay_s": round(_timed(replay_all), 6),
+        "verify_s": round(_timed(verify_all), 6),
+        "files": sum(1 for p in Path(root).rglob("*") if p.is_file()),
+    }
+    if hasattr(store, "close"):
+        store.close()
+    return out
+
+
+def main(argv: list[str]) -> int:
+    ap = argparse.ArgumentParser(description="Benchmark event store backends on the task lifecycle.")
+    ap.add_argument("--tasks", type=int, default=1000)
+    ap.add_argument("--body-bytes", type=int, default=256)
+    ap.add_argument("--backends", default=",".join(BACKENDS))
+    args = ap.parse_args(argv)
+
+    results = []
+    for name in [b.strip() for b in args.backends.split(",") if b.strip()]:
+        if name not in BACKENDS:
+            raise SystemExit(f"unknown_backend:{name}")
+        tmp = tempfile.mkdtemp(prefix=f"agentos_bench_{name}_")
+        try:
+            results.append(bench_backend(name, tmp, tasks=args.tasks, body_bytes=args.body_bytes))
+        finally:
+            shutil.rmtree(tmp, ignore_errors=True)
+
+    print(canonical_json({"ok": True, "results": results}))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
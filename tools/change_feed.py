@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import argparse
+import sys
+
+from agentos.canonical import canonical_json
+from agentos.change_feed import ChangeFeed
+from agentos.store_fs import FSStore
+
+
+def main(argv: list[str]) -> int:
+    ap = argparse.ArgumentParser(description="Read the store-wide change feed or repair it after a crash.")
+    ap.add_argument("--root", default="store")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    p_tail = sub.add_parser("tail", help="print records as JSON lines, resuming from a consumer cursor")
+    p_tail.add_argument("--consumer", default=None, help="persist the resume offset under this name")
+    p_tail.add_argument("--from-offset", type=int, default=None, help="override the stored cursor")
+    p_tail.add_argument("--idle-timeout", type=float, default=0.0, help="seconds to wait for new records (<0 blocks forever)")
+    p_tail.add_argument("--limit", type=int, default=None)
+    sub.add_parser("end", help="print the current end offset")
+    sub.add_parser("reconcile", help="publish committed events missing from the journal")
+    args = ap.parse_args(argv)
+
+    feed = ChangeFeed(args.root)
+    if args.cmd == "end":
+        print(canonical_json({"ok": True, "end_offset": feed.end_offset()}))
+        return 0
+    if args.cmd == "reconcile":
+        print(canonical_json({"ok": True, "published": feed.reconcile(FSStore(root=args.root))}))
+        return 0
+
+    offset = args.from_offset
+    if offset is None:
+        offset = feed.load_cursor(args.consumer) if args.consumer else 0
+    idle = None if args.idle_timeout < 0 else args.idle_timeout
+    n = 0
+    for rec in feed.subscribe(offset, idle_timeout_s=idle):
+        print(canonical_json(rec), flush=True)
+        offset = rec["next_offset"]
+        n += 1
+        if args.consumer:
+            feed.commit_cursor(args.consumer, offset)
+        if args.limit is not None and n >= args.limit:
+            break
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, Optional
+
+from agentos.canonical import canonical_json
+from agentos.layout import LAYOUTS, SHARDED, is_shard_dir, iter_keyed_dirs, save_layout, sharded_path
+
+# Top-level evidence directories that are not task directories.
+_EVIDENCE_RESERVED: FrozenSet[str] = frozenset({"verify", "plan", "packs"})
+
+
+def _prune_empty_shards(base: Path) -> None:
+    if not base.is_dir():
+        return
+    for p in base.iterdir():
+        if not is_shard_dir(p):
+            continue
+        for q in p.iterdir():
+            if is_shard_dir(q):
+                try:
+                    q.rmdir()
+                except OSError:
+                    pass
+        try:
+            p.rmdir()
+        except OSError:
+            pass
+
+
+def migrate_tree(base: Path, to: str, *, skip: FrozenSet[str] = frozenset()) -> int:
+    """
+    Move every keyed directory under base into the target layout with one rename each.
+    Returns the number of directories moved; already-converted entries are left alone.
+    """
+    moved = 0
+    for key, d in list(iter_keyed_dirs(base)):
+        if key in skip:
+            continue
+        target = sharded_path(base, key) if to == SHARDED else base / key
+        if d == target:
+            continue
+        if target.exists():
+            raise RuntimeError(f"migrate_target_exists:{target}")
+        target.parent.mkdir(parents=True, exist_ok=True)
+        os.rename(d, target)
+        moved += 1
+    _prune_empty_shards(base)
+    return moved
+
+
+def migrate(*, to: str, store_root: Optional[str] = None, evidence_root: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Convert an event store and/or evidence tree to the target layout and record it.
+
+    Offline only: no writer may hold the trees open while directories move.
+    """
+    if to not in LAYOUTS:
+        raise ValueError(f"unknown layout: {to!r}")
+    out: Dict[str, Any] = {"ok": True, "to": to}
+    if store_root is not None:
+        root = Path(store_root)
+        out["events_moved"] = migrate_tree(root / "events", to)
+        save_layout(root, to)
+    if evidence_root is not None:
+        root = Path(evidence_root)
+        out["evidence_tasks_moved"] = migrate_tree(root, to, skip=_EVIDENCE_RESERVED)
+        out["verification_moved"] = migrate_tree(root / "verify", to)
+        save_layout(root, to)
+    return out
+
+
+def main(argv: list[str]) -> int:
+    ap = argparse.ArgumentParser(description="Convert store events and evidence between flat and sharded layouts.")
+    ap.add_argument("--store", default=None, help="store root (contains events/)")
+    ap.add_argument("--evidence", default=None, help="evidence root")
+    ap.add_argument("--to", choices=LAYOUTS, default=SHARDED)
+    args = ap.parse_args(argv)
+    if args.store is None and args.evidence is None:
+        ap.error("nothing to migrate: pass --store and/or --evidence")
+    print(canonical_json(migrate(to=args.to, store_root=args.store, evidence_root=args.evidence)))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
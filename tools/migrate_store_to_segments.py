@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import argparse
+import sys
+
+from agentos.canonical import canonical_json
+from agentos.store_fs import FSStore
+from agentos.store_segment import SegmentStore
+
+
+def migrate(src_root: str, dst_root: str) -> dict:
+    """
+    Copy every FSStore task stream into a SegmentStore, verbatim.
+
+    Fail-closed: source chains must verify before copy, destination chains after.
+    """
+    src = FSStore(root=src_root)
+    dst = SegmentStore(root=dst_root)
+
+    migrated = []
+    for task_id in src.list_tasks():
+        if not src.verify_chain(task_id):
+            raise RuntimeError(f"source_chain_invalid:{task_id}")
+        if dst.list_events(task_id):
+            raise RuntimeError(f"destination_task_exists:{task_id}")
+        events = src.list_events(task_id)
+        for ev in events:
+            dst.import_event(ev)
+        if not dst.verify_chain(task_id):
+            raise RuntimeError(f"destination_chain_invalid:{task_id}")
+        migrated.append({"task_id": task_id, "event_count": len(events)})
+
+    return {"ok": True, "src": src_root, "dst": dst_root, "tasks": migrated}
+
+
+def main(argv: list[str]) -> int:
+    ap = argparse.ArgumentParser(description="Migrate FSStore per-event files into segmented logs.")
+    ap.add_argument("--src", default="store")
+    ap.add_argument("--dst", required=True)
+    args = ap.parse_args(argv)
+    print(canonical_json(migrate(args.src, args.dst)))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
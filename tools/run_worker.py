@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import argparse
+import signal
+import sys
+from pathlib import Path
+
+from agentos.canonical import canonical_json
+from agentos.capabilities.idempotency import IdempotencyStore
+from agentos.runner import TaskRunner
+from agentos.store_fs import FSStore
+from agentos.worker import Worker
+
+
+def main(argv: list[str]) -> int:
+    ap = argparse.ArgumentParser(description="Claim DISPATCHED tasks through leases and run them until SIGTERM.")
+    ap.add_argument("--root", default="store")
+    ap.add_argument("--evidence-root", default=None, help="defaults to <root>/evidence")
+    ap.add_argument("--workers", type=int, default=1, help="concurrent runs in this process")
+    ap.add_argument("--lease-s", type=float, default=60.0, help="lease period; renewed every lease/3 while running")
+    ap.add_argument("--poll-s", type=float, default=1.0, help="seconds between polls for new DISPATCHED tasks")
+    ap.add_argument("--owner", default=None, help="lease owner id; defaults to <hostname>:<pid>")
+    ap.add_argument("--index", action="store_true", help="open the store with its task index (poll the index, not a replay scan)")
+    ap.add_argument("--sweep-s", type=float, default=60.0, help="with --index: seconds between sweeps for appends made without the index")
+    ap.add_argument("--idle-exit", action="store_true", help="exit once nothing is running and nothing can be claimed")
+    args = ap.parse_args(argv)
+
+    store = FSStore(root=args.root, index=args.index)
+    evidence_root = args.evidence_root if args.evidence_root is not None else str(Path(args.root) / "evidence")
+    runner = TaskRunner(store, evidence_root=evidence_root)
+    runner._idempotency_store = IdempotencyStore(str(Path(args.root) / "idempotency"))
+    worker = Worker(
+        runner,
+        workers=args.workers,
+        lease_s=args.lease_s,
+        poll_s=args.poll_s,
+        owner=args.owner,
+        sweep_s=args.sweep_s,
+    )
+
+    def _stop(signum: int, frame: object) -> None:
+        worker.request_stop()
+
+    previous = {sig: signal.signal(sig, _stop) for sig in (signal.SIGTERM, signal.SIGINT)}
+    try:
+        report = worker.run(idle_exit=args.idle_exit)
+    finally:
+        for sig, handler in previous.items():
+            signal.signal(sig, handler)
+    print(canonical_json(report.to_obj()))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
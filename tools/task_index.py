@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import argparse
+import sys
+
+from agentos.canonical import canonical_json
+from agentos.store_fs import FSStore
+from agentos.task_index import TaskIndex
+
+
+def main(argv: list[str]) -> int:
+    ap = argparse.ArgumentParser(description="Query or rebuild the derived task state index.")
+    ap.add_argument("--root", default="store")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    sub.add_parser("rebuild", help="recompute the index from the event log")
+    p_state = sub.add_parser("state", help="list task_ids currently in STATE")
+    p_state.add_argument("state")
+    p_state.add_argument("--limit", type=int, default=None)
+    p_count = sub.add_parser("count", help="count tasks per current state")
+    p_count.add_argument("--since", default=None, help="only tasks whose last event ts_utc >= SINCE")
+    p_show = sub.add_parser("show", help="show the index row for one task")
+    p_show.add_argument("task_id")
+    args = ap.parse_args(argv)
+
+    index = TaskIndex(args.root)
+    if args.cmd == "rebuild":
+        out = {"ok": True, "tasks": index.rebuild(FSStore(root=args.root))}
+    elif args.cmd == "state":
+        out = {"ok": True, "state": args.state, "task_ids": index.tasks_in_state(args.state, limit=args.limit)}
+    elif args.cmd == "count":
+        out = {"ok": True, "since": args.since, "counts": index.count_by_state(since=args.since)}
+    else:
+        row = index.get(args.task_id)
+        out = {"ok": row is not None, "task": row}
+    print(canonical_json(out))
+    return 0 if out["ok"] else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
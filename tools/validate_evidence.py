@@ -2,10 +2,13 @@ from __future__ import annotations
 
 import json
 import sys
+import tempfile
 from pathlib import Path
 from typing import Any, Dict, Iterable, Tuple
 
 from agentos.canonical import canonical_json, sha256_hex
+from agentos.layout import iter_keyed_dirs
+from agentos.packs import PackStore
 
 
 def _die(msg: str) -> None:
@@ -24,12 +27,8 @@ def _require(cond: bool, msg: str) -> None:
         _die(msg)
 
 
-def _iter_dirs(root: Path) -> Iterable[Path]:
-    if not root.exists():
-        return []
-    for p in root.rglob("*"):
-        if p.is_dir():
-            yield p
+def _subdirs(root: Path) -> Iterable[Path]:
+    return sorted(p for p in root.iterdir() if p.is_dir())
 
 
 def _compute_manifest_sha256_json(files_map: Dict[str, str]) -> str:
@@ -141,35 +140,61 @@ def main(argv: list[str]) -> int:
         _die(f"missing_evidence_root:{evidence_root}")
 
     verify_root = evidence_root / "verify"
+    packs_root = evidence_root / "packs"
     rejections_marker = "rejections"
 
     n_exec = 0
     n_ver = 0
     n_rej = 0
-
-    for d in _iter_dirs(evidence_root):
-        if d == evidence_root:
-            continue
-        rel = d.relative_to(evidence_root)
-        parts = rel.parts
-
-        if parts[0] == "verify":
-            if len(parts) == 2:
-                _validate_verification_bundle(d, ver_c)
-                n_ver += 1
-            continue
-
-        if rejections_marker in parts:
-            if len(parts) >= 3 and parts[-2] == rejections_marker:
-                _validate_rejection_bundle(d, rej_c)
-                n_rej += 1
-            continue
-
-        if len(parts) == 2:
+    n_packed = 0
+
+    # Both the flat and the sharded (<ab>/<cd>/<key>) layouts are accepted.
+    for _, d in iter_keyed_dirs(verify_root):
+        _validate_verification_bundle(d, ver_c)
+        n_ver += 1
+
+    def validate_task_dir(task_dir: Path) -> None:
+        nonlocal n_exec, n_rej
+        for d in _subdirs(task_dir):
+            if d.name.startswith("."):
+                # Output capture of a run still in flight (EvidenceBundle.new_capture_dir).
+                continue
+            if d.name == rejections_marker:
+                for r in _subdirs(d):
+                    _validate_rejection_bundle(r, rej_c)
+                    n_rej += 1
+                continue
             _validate_execution_bundle(d, exec_c)
             n_exec += 1
 
-    print(f"evidence_ok execution={n_exec} verification={n_ver} rejection={n_rej} root={evidence_root} contract={contract_path}")
+    for _, task_dir in iter_keyed_dirs(evidence_root):
+        if task_dir in (verify_root, packs_root):
+            continue
+        validate_task_dir(task_dir)
+
+    # Archived tasks: unpack each task's files (sha256-checked by PackStore.get) into a
+    # scratch directory and run the same bundle checks on it.
+    packs = PackStore.open_existing(packs_root)
+    if packs is not None:
+        by_task: Dict[str, list] = {}
+        for key in packs.keys():
+            task_id, _, rel = key.partition("/")
+            by_task.setdefault(task_id, []).append((rel, key))
+        with tempfile.TemporaryDirectory(prefix="agentos_packed_evidence_") as tmp:
+            for task_id, files in sorted(by_task.items()):
+                task_dir = Path(tmp) / task_id
+                for rel, key in files:
+                    p = task_dir / rel
+                    if rel.endswith("/"):
+                        p.mkdir(parents=True, exist_ok=True)
+                        continue
+                    p.parent.mkdir(parents=True, exist_ok=True)
+                    p.write_bytes(packs.get(key))
+                validate_task_dir(task_dir)
+                n_packed += 1
+        packs.close()
+
+    print(f"evidence_ok execution={n_exec} verification={n_ver} rejection={n_rej} packed_tasks={n_packed} root={evidence_root} contract={contract_path}")
     return 0
 
 
@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+from agentos.canonical import canonical_json
+from agentos.store_verify import verify_store
+
+
+def main(argv: list[str]) -> int:
+    ap = argparse.ArgumentParser(description="Verify every task hash chain in an FSStore.")
+    ap.add_argument("--root", default="store")
+    ap.add_argument("--jobs", type=int, default=os.cpu_count() or 1)
+    ap.add_argument("--full", action="store_true", help="ignore verified marks and re-hash every event")
+    ap.add_argument("--report", default=None, help="also write the JSON report to this path")
+    args = ap.parse_args(argv)
+
+    report = verify_store(args.root, jobs=max(1, args.jobs), full=args.full)
+    out = canonical_json(report)
+    if args.report:
+        Path(args.report).write_text(out, encoding="utf-8")
+    print(out)
+    return 0 if report["ok"] else 2
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
@@ -54,7 +54,7 @@ def _make_spec(*, role: str, task_id: str, cmd_argv: list[str], env_allowlist: l
     )
 
 def _write_run_summary(evidence_root: Path, task_id: str, exec_id: str, manifest_sha256: str) -> None:
-    d = evidence_root / task_id / exec_id
+    d = EvidenceBundle(root=str(evidence_root)).bundle_dir(task_id, exec_id)
     d.mkdir(parents=True, exist_ok=True)
     p = d / "run_summary.json"
     p.write_text(canonical_json({"manifest_sha256": manifest_sha256}), encoding="utf-8")
@@ -72,8 +72,7 @@ def _emit_minimal_task_events(store: FSStore, spec: ExecutionSpec, ok: bool, exi
         "paths_allowlist": list(spec.paths_allowlist),
         "note": spec.note,
     }
-    store.append_event(
-        task_id,
+    events = [(
         "TASK_CREATED",
         {
             "role": spec.role,
@@ -81,10 +80,9 @@ def _emit_minimal_task_events(store: FSStore, spec: ExecutionSpec, ok: bool, exi
             "payload": created_payload,
             "attempt": 0,
         },
-    )
+    )]
     d = decide(spec.role, spec.action)
-    store.append_event(
-        task_id,
+    events.append((
         "TASK_VERIFIED",
         {
             "role": spec.role,
@@ -94,9 +92,8 @@ def _emit_minimal_task_events(store: FSStore, spec: ExecutionSpec, ok: bool, exi
             "adapter_role_contract_sha256": contract_sha256(),
             "attempt": 0,
         },
-    )
-    store.append_event(
-        task_id,
+    ))
+    events.append((
         "TASK_DISPATCHED",
         {
             "role": spec.role,
@@ -104,9 +101,8 @@ def _emit_minimal_task_events(store: FSStore, spec: ExecutionSpec, ok: bool, exi
             "attempt": 0,
             "inputs_manifest_sha256": spec.inputs_manifest_sha256,
         },
-    )
-    store.append_event(
-        task_id,
+    ))
+    events.append((
         "RUN_STARTED",
         {
             "role": spec.role,
@@ -114,10 +110,9 @@ def _emit_minimal_task_events(store: FSStore, spec: ExecutionSpec, ok: bool, exi
             "exec_id": spec.exec_id,
             "spec_sha256": sha256_hex(spec.to_canonical_json().encode("utf-8")),
         },
-    )
+    ))
     if ok:
-        store.append_event(
-            task_id,
+        events.append((
             "RUN_SUCCEEDED",
             {
                 "role": spec.role,
@@ -127,10 +122,9 @@ def _emit_minimal_task_events(store: FSStore, spec: ExecutionSpec, ok: bool, exi
                 "exit_code": int(exit_code),
                 "manifest_sha256": manifest_sha256,
             },
-        )
+        ))
     else:
-        store.append_event(
-            task_id,
+        events.append((
             "RUN_FAILED",
             {
                 "role": spec.role,
@@ -140,7 +134,8 @@ def _emit_minimal_task_events(store: FSStore, spec: ExecutionSpec, ok: bool, exi
                 "exit_code": int(exit_code),
                 "manifest_sha256": manifest_sha256,
             },
-        )
+        ))
+    store.append_events(task_id, events)
 
 def _run_role(*, intent_name: str, intent_spec_obj: dict, role: str, store_root: Path, cwd: str, require_env: bool) -> Dict[str, Any]:
     adapter = ADAPTERS.get(role)
@@ -176,11 +171,10 @@ def _run_role(*, intent_name: str, intent_spec_obj: dict, role: str, store_root:
             snap = rebuild_task_state(ev_store, task_id)
             if str(snap.get("state")) != "EVALUATED":
                 raise RuntimeError(f"weekly_proof_fsm_not_evaluated:{snap.get('state')}")
-            evs = list(ev_store.list_events(task_id))
-            te = [e for e in evs if str(e.get("type")) == "TASK_EVALUATED"]
-            if not te:
+            te = next(ev_store.iter_task_events(task_id, reverse=True, types=("TASK_EVALUATED",)), None)
+            if te is None:
                 raise RuntimeError("weekly_proof_missing_TASK_EVALUATED")
-            body = dict(te[-1].get('body') or {})
+            body = dict(te.get('body') or {})
             if str(body.get('evaluation_manifest_sha256')) != str(ev.get('evaluation_manifest_sha256')):
                 raise RuntimeError("weekly_proof_evaluation_manifest_mismatch")
             return {
@@ -239,11 +233,10 @@ def _run_role(*, intent_name: str, intent_spec_obj: dict, role: str, store_root:
         if str(snap.get("state")) != "EVALUATED":
             raise RuntimeError(f"weekly_proof_fsm_not_evaluated:{snap.get('state')}")
 
-        evs = list(ev_store.list_events(task_id))
-        te = [e for e in evs if str(e.get("type")) == "TASK_EVALUATED"]
-        if not te:
+        te = next(ev_store.iter_task_events(task_id, reverse=True, types=("TASK_EVALUATED",)), None)
+        if te is None:
             raise RuntimeError("weekly_proof_missing_TASK_EVALUATED")
-        body = dict(te[-1].get("body") or {})
+        body = dict(te.get("body") or {})
         if str(body.get("evaluation_manifest_sha256")) != str(ev.get("evaluation_manifest_sha256")):
             raise RuntimeError("weekly_proof_evaluation_manifest_mismatch")
 
@@ -253,9 +246,8 @@ def _run_role(*, intent_name: str, intent_spec_obj: dict, role: str, store_root:
         snap = rebuild_task_state(ev_store, task_id)
         if str(snap.get("state")) != "FAILED":
             raise RuntimeError(f"weekly_proof_fsm_not_failed:{snap.get('state')}")
-        evs = list(ev_store.list_events(task_id))
-        rf = [e for e in evs if str(e.get("type")) == "RUN_FAILED"]
-        if not rf:
+        rf = next(ev_store.iter_task_events(task_id, reverse=True, types=("RUN_FAILED",)), None)
+        if rf is None:
             raise RuntimeError("weekly_proof_missing_RUN_FAILED")
 
 
@@ -13,6 +13,9 @@ from agentos.roles import roles
 from agentos.policy import KNOWN_ACTIONS
 from agentos.canonical import canonical_json, sha256_hex
 from agentos.evidence_schema import bundle_schema_sha256
+from agentos.store_fs import FSStore
+
+_EVENT_PAGE = 64
 
 
 def _load_json(p: Path) -> Dict[str, Any]:
@@ -24,26 +27,27 @@ def _fail(msg: str) -> int:
     return 2
 
 
-def _event_dir_for_intent(intent: str, role: str) -> Path:
-    # store/weekly_proof/<intent>/deterministic/events/events/weekly_<role>/
-    return Path("store") / "weekly_proof" / intent / "deterministic" / "events" / "events" / f"weekly_{role}"
+def _event_store_for_intent(intent: str, role: str) -> Tuple[Path, str]:
+    # (store root, task_id): the stream is store/weekly_proof/<intent>/deterministic/events,
+    # task weekly_<role>; FSStore resolves its directory (flat or sharded layout).
+    return Path("store") / "weekly_proof" / intent / "deterministic" / "events", f"weekly_{role}"
 
 
-def _latest_task_evaluated_body(evdir: Path) -> Dict[str, Any]:
-    if not evdir.exists():
-        raise FileNotFoundError(str(evdir))
-    files = sorted([p for p in evdir.glob("*.json") if p.name != "HEAD"])
-    if not files:
+def _latest_task_evaluated_body(store_root: Path, task_id: str) -> Dict[str, Any]:
+    # Page backwards from HEAD so only the tail of a long stream is ever read.
+    store = FSStore(root=str(store_root))
+    if store.count_events(task_id) == 0:
         raise RuntimeError("no_events")
-    # Find last TASK_EVALUATED in order; fail-closed if missing.
-    last_te: Dict[str, Any] | None = None
-    for p in files:
-        e = _load_json(p)
-        if str(e.get("type")) == "TASK_EVALUATED":
-            last_te = dict(e.get("body") or {})
-    if last_te is None:
-        raise RuntimeError("missing_TASK_EVALUATED")
-    return last_te
+    to_seq = None
+    while True:
+        page = store.list_events(task_id, to_seq=to_seq, limit=_EVENT_PAGE, reverse=True)
+        for e in page:
+            if str(e.get("type")) == "TASK_EVALUATED":
+                return dict(e.get("body") or {})
+        if len(page) < _EVENT_PAGE:
+            # Fail-closed: no TASK_EVALUATED anywhere in the committed stream.
+            raise RuntimeError("missing_TASK_EVALUATED")
+        to_seq = int(page[-1]["seq"]) - 1
 
 
 def verify_weekly_proof_artifact(artifact_path: Path) -> Tuple[bool, str]:
@@ -138,9 +142,9 @@ def verify_weekly_proof_artifact(artifact_path: Path) -> Tuple[bool, str]:
                 return False, f"unexpected_refinement_task_id:{role}"
 
         # 3) Cross-check artifact evaluation hashes against authoritative TASK_EVALUATED event
-        evdir = _event_dir_for_intent(intent, role)
+        store_root, task_id = _event_store_for_intent(intent, role)
         try:
-            body = _latest_task_evaluated_body(evdir)
+            body = _latest_task_evaluated_body(store_root, task_id)
         except Exception as e:
             return False, f"event_stream_error:{role}:{type(e).__name__}:{e}"
 